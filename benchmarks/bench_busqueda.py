@@ -0,0 +1,115 @@
+"""
+Compara buscar_tareas (índice FTS5) con un escaneo LIKE '%texto%' sobre
+título y descripción, para términos frecuentes, raros y ausentes.
+
+Uso:
+    python -m benchmarks.bench_busqueda [N ...] [--repeticiones R] [--salida archivo.json]
+
+Por defecto mide 1000000 tareas.
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import insert, or_, select
+
+from benchmarks.comun import (
+    PRIORIDADES, TAMANO_LOTE_SIEMBRA, entorno, guardar_json, medir, preparar_task_manager
+)
+from src.model.modelo import Materia, Tarea
+
+TAMANOS = (1_000_000,)
+
+VOCABULARIO = (
+    "informe laboratorio ensayo parcial repaso lectura capitulo ejercicios "
+    "problemas resumen exposicion proyecto practica guia entrega final "
+    "cinematica optica algebra calculo historia literatura quimica biologia"
+).split()
+
+# (etiqueta, término): el raro aparece en ~1 de cada 10000 tareas
+TERMINOS = (
+    ("frecuente", "informe"),
+    ("raro", "termodinamica"),
+    ("ausente", "inexistente"),
+)
+
+
+def sembrar_textos(engine, usuario_id: int, n_tareas: int, n_materias: int = 20):
+    """Inserta tareas con títulos y descripciones variados (semilla fija)."""
+    aleatorio = random.Random(42)
+    hoy = date.today()
+    with engine.begin() as conn:
+        ids_materia = conn.execute(
+            insert(Materia).returning(Materia.idMateria, sort_by_parameter_order=True),
+            [
+                {"nombre": f"Materia {i}", "color": "#3498DB", "usuario_id": usuario_id}
+                for i in range(n_materias)
+            ]
+        ).scalars().all()
+
+    for inicio in range(0, n_tareas, TAMANO_LOTE_SIEMBRA):
+        filas = []
+        for i in range(inicio, min(inicio + TAMANO_LOTE_SIEMBRA, n_tareas)):
+            descripcion = " ".join(aleatorio.choices(VOCABULARIO, k=8))
+            if i % 10_000 == 0:
+                descripcion += " termodinamica"
+            filas.append({
+                "titulo": " ".join(aleatorio.choices(VOCABULARIO, k=3)),
+                "descripcion": descripcion,
+                "prioridad": PRIORIDADES[i % 3],
+                "fechaEntrega": hoy + timedelta(days=i % 120),
+                "materia_id": ids_materia[i % n_materias],
+                "usuario_id": usuario_id,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Tarea), filas)
+
+
+def buscar_like(engine, usuario_id: int, texto: str, limite: int = 20) -> list:
+    patron = f"%{texto}%"
+    consulta = (
+        select(Tarea.idTarea)
+        .where(
+            Tarea.usuario_id == usuario_id,
+            or_(Tarea.titulo.like(patron), Tarea.descripcion.like(patron))
+        )
+        .limit(limite)
+    )
+    with engine.connect() as conn:
+        return conn.execute(consulta).scalars().all()
+
+
+def medir_tamano(n: int, repeticiones: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, tm = preparar_task_manager(os.path.join(tmp, "bench.sqlite"))
+        usuario_id = tm.usuario_activo.idUsuario
+        sembrar_textos(engine, usuario_id, n)
+
+        resultado = {}
+        for etiqueta, termino in TERMINOS:
+            resultado[etiqueta] = {
+                "termino": termino,
+                "fts5": medir(lambda i: tm.buscar_tareas(termino), repeticiones),
+                "like": medir(lambda i: buscar_like(engine, usuario_id, termino), repeticiones),
+            }
+        engine.dispose()
+        return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tamanos", nargs="*", type=int, default=list(TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--salida", help="archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    datos = {"entorno": entorno(), "resultados": {}}
+    for n in args.tamanos:
+        datos["resultados"][str(n)] = medir_tamano(n, args.repeticiones)
+    guardar_json(datos, args.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compara crear_tarea (una transacción por tarea), crear_tarea dentro de
+tm.transaccion() (un solo commit) y crear_tareas_lote (una sola
+transacción e INSERT masivo) sobre una BD temporal.
+
+Uso:
+    python -m benchmarks.bench_crear_tareas_lote [N ...]
+
+Por defecto mide 1000, 10000 y 100000 filas.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.comun import preparar_task_manager
+from src.model.modelo import Prioridad
+
+TAMANOS = (1_000, 10_000, 100_000)
+
+
+def filas(n: int, materia_id: int):
+    entrega = date.today() + timedelta(days=7)
+    for i in range(n):
+        yield {
+            "titulo": f"Tarea de prueba {i}",
+            "descripcion": "Generada por el benchmark",
+            "prioridad": Prioridad.Media,
+            "fecha_entrega": entrega,
+            "materia_id": materia_id
+        }
+
+
+def medir(n: int, modo: str) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, tm = preparar_task_manager(os.path.join(tmp, "bench.sqlite"))
+        materia = tm.crear_materia("Materia Benchmark", "#3498DB")
+        inicio = time.perf_counter()
+        if modo == "lote":
+            tm.crear_tareas_lote(filas(n, materia.idMateria))
+        elif modo == "transaccion":
+            with tm.transaccion():
+                for fila in filas(n, materia.idMateria):
+                    tm.crear_tarea(**fila)
+        else:
+            for fila in filas(n, materia.idMateria):
+                tm.crear_tarea(**fila)
+        transcurrido = time.perf_counter() - inicio
+        engine.dispose()
+        return transcurrido
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tamanos", metavar="N", type=int, nargs="*", default=list(TAMANOS))
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'filas':>8} {'por llamada (s)':>16} {'transaccion (s)':>16} "
+        f"{'lote (s)':>10} {'speedup lote':>13}"
+    )
+    for n in args.tamanos:
+        t_llamada = medir(n, "llamada")
+        t_transaccion = medir(n, "transaccion")
+        t_lote = medir(n, "lote")
+        print(
+            f"{n:>8} {t_llamada:>16.3f} {t_transaccion:>16.3f} "
+            f"{t_lote:>10.3f} {t_llamada / t_lote:>12.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Latencias (p50/p95/p99) y throughput de las operaciones calientes de
+TaskManager sobre BDs sembradas con 10k, 100k y 1M tareas.
+
+Uso:
+    python -m benchmarks.bench_hot_paths [--tamanos N ...] [--repeticiones R]
+                                         [--perfil PERFIL] [--salida archivo.json]
+
+El resultado es JSON (a stdout o a --salida) para comparar corridas.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from benchmarks.comun import entorno, guardar_json, medir, preparar_task_manager, sembrar
+from src.model.modelo import Prioridad
+
+TAMANOS = (10_000, 100_000, 1_000_000)
+MATERIAS = 50
+
+
+def correr(n_tareas: int, repeticiones: int, perfil: str = None) -> dict:
+    import main
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, tm = preparar_task_manager(os.path.join(tmp, "bench.sqlite"), perfil)
+        ids_materia = sembrar(engine, tm.usuario_activo.idUsuario, n_tareas, MATERIAS)
+        # El listado de main.py usa su TaskManager global
+        main.tm = tm
+
+        rng = random.Random(n_tareas)
+        entrega = date.today() + timedelta(days=30)
+        creadas = []
+        resultados = {}
+
+        resultados["crear_tarea"] = medir(
+            lambda i: creadas.append(tm.crear_tarea(
+                f"Tarea nueva {i}", "", Prioridad.Alta, entrega, rng.choice(ids_materia[1:])
+            ).idTarea),
+            repeticiones
+        )
+        resultados["marcar_tarea"] = medir(lambda i: tm.marcar_tarea(creadas[i]), repeticiones)
+        resultados["desmarcar_tarea"] = medir(lambda i: tm.desmarcar_tarea(creadas[i]), repeticiones)
+        resultados["editar_tarea"] = medir(
+            lambda i: tm.editar_tarea(
+                rng.randint(1, n_tareas), nuevo_titulo=f"Editada {i}", nueva_prioridad=Prioridad.Baja
+            ),
+            repeticiones
+        )
+        resultados["listar_tareas_pagina"] = medir(
+            lambda i: tm.listar_tareas(limite=50), repeticiones
+        )
+        resultados["proximas_entregas"] = medir(
+            lambda i: tm.proximas_entregas(dias=7, limite=20), repeticiones
+        )
+        resultados["entregas_vencidas"] = medir(
+            lambda i: tm.entregas_vencidas(limite=20), repeticiones
+        )
+        resultados["listar_mis_tareas_main"] = medir(
+            lambda i: main.listar_mis_tareas(), max(1, min(repeticiones, 20))
+        )
+        # Cada materia tiene ~n_tareas / MATERIAS tareas que se borran en cascada
+        resultados["eliminar_materia"] = medir(
+            lambda i: tm.eliminar_materia(ids_materia[i]), min(5, MATERIAS)
+        )
+        engine.dispose()
+        return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--perfil", default=None)
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args(argv)
+
+    datos = {"entorno": entorno(args.perfil), "resultados": {}}
+    for n in args.tamanos:
+        print(f"… {n} tareas", file=sys.stderr)
+        datos["resultados"][str(n)] = correr(n, args.repeticiones, args.perfil)
+    guardar_json(datos, args.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Throughput de lectura mientras un escritor satura la BD.
+
+Los lectores son hilos de este proceso que llaman a listar_tareas,
+resumen y proximas_entregas (que van por el engine de solo lectura); el
+escritor es otro proceso que crea y marca tareas sin pausa. Se miden
+tres escenarios de la misma duración: solo lectores, solo escritor y
+ambos a la vez, y se reportan lecturas/s con sus latencias y
+escrituras/s.
+
+Uso:
+    python -m benchmarks.bench_lectura_concurrente [--tareas N] [--lectores L]
+                                                   [--segundos S] [--perfil P]
+                                                   [--salida archivo.json]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.comun import entorno, guardar_json, preparar_task_manager, resumir, sembrar
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import crear_engine
+from src.model.modelo import Prioridad
+
+
+def escritor(ruta, perfil, usuario_id, materia_id, listo, detener, cola):
+    """Proceso escritor: crea y marca tareas hasta que se le pide parar."""
+    tm = TaskManager(cache=False, engine=crear_engine(ruta, perfil=perfil))
+    tm.seleccionar_usuario(usuario_id)
+    entrega = date.today() + timedelta(days=3)
+    escrituras = 0
+    listo.set()
+    inicio = time.perf_counter()
+    while not detener.is_set():
+        tarea = tm.crear_tarea(f"Escritura {escrituras}", "", Prioridad.Media, entrega, materia_id)
+        tm.marcar_tarea(tarea.idTarea)
+        escrituras += 2
+    cola.put((escrituras, time.perf_counter() - inicio, tm.estadisticas_reintentos()["reintentos"]))
+
+
+def lector(tm, usuario_id, hasta, latencias):
+    operaciones = (
+        lambda: tm.listar_tareas(limite=20),
+        lambda: tm.resumen(),
+        lambda: tm.proximas_entregas(),
+    )
+    i = 0
+    with tm.como_usuario(usuario_id):
+        while time.monotonic() < hasta:
+            inicio = time.perf_counter()
+            operaciones[i % len(operaciones)]()
+            latencias.append(time.perf_counter() - inicio)
+            i += 1
+
+
+def escenario(tm, ruta, perfil, usuario_id, materia_id, lectores: int, con_escritor: bool, segundos: float) -> dict:
+    resultado = {}
+    contexto = multiprocessing.get_context("spawn")
+    if con_escritor:
+        listo, detener, cola = contexto.Event(), contexto.Event(), contexto.Queue()
+        proceso = contexto.Process(
+            target=escritor, args=(ruta, perfil, usuario_id, materia_id, listo, detener, cola)
+        )
+        proceso.start()
+        listo.wait()
+
+    hasta = time.monotonic() + segundos
+    latencias = [[] for _ in range(lectores)]
+    hilos = [threading.Thread(target=lector, args=(tm, usuario_id, hasta, latencias[i])) for i in range(lectores)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    if not hilos:
+        time.sleep(segundos)
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+
+    if con_escritor:
+        detener.set()
+        escrituras, duracion, reintentos = cola.get()
+        proceso.join()
+        resultado["escrituras_por_s"] = escrituras / duracion
+        resultado["reintentos_escritor"] = reintentos
+
+    todas = [l for por_hilo in latencias for l in por_hilo]
+    if todas:
+        lecturas = resumir(todas)
+        lecturas["lecturas_por_s"] = len(todas) / transcurrido
+        resultado["lecturas"] = lecturas
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tareas", type=int, default=100_000)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--perfil", default=None)
+    parser.add_argument("--salida", help="archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "bench.sqlite")
+        engine, tm = preparar_task_manager(ruta, args.perfil)
+        usuario_id = tm.usuario_activo.idUsuario
+        ids_materia = sembrar(engine, usuario_id, args.tareas, 20)
+
+        comunes = (tm, ruta, args.perfil, usuario_id, ids_materia[0])
+        datos = {
+            "entorno": entorno(args.perfil),
+            "parametros": {"tareas": args.tareas, "lectores": args.lectores, "segundos": args.segundos},
+            "resultados": {
+                "solo_lectores": escenario(*comunes, args.lectores, False, args.segundos),
+                "solo_escritor": escenario(*comunes, 0, True, args.segundos),
+                "lectores_y_escritor": escenario(*comunes, args.lectores, True, args.segundos),
+            },
+        }
+        engine.dispose()
+    guardar_json(datos, args.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Comandos por segundo del modo por lotes (main.py --batch) según cuántos
+comandos se confirman juntos, frente a un proceso por comando con los
+subcomandos de main.py.
+
+Cada corrida ejecuta N comandos sobre una BD temporal: la mitad crea
+tareas y la otra mitad las marca. El costo por proceso se estima con
+unas pocas llamadas a `main.py tareas marcar`.
+
+Uso:
+    python -m benchmarks.bench_lote [--comandos N] [--lotes 1 10 100 1000]
+                                    [--procesos P] [--perfil PERFIL]
+                                    [--salida archivo.json]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.comun import entorno, guardar_json, preparar_task_manager
+from src.cli import lote
+from src.model.modelo import Prioridad
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def comandos(n: int, usuario_id: int, materia_id: int, primera_tarea: int) -> str:
+    entrega = (date.today() + timedelta(days=7)).isoformat()
+    lineas = []
+    for i in range(n // 2):
+        lineas.append({"comando": "tareas crear", "usuario": usuario_id, "datos": {
+            "titulo": f"Tarea {i}", "prioridad": "Media", "fechaEntrega": entrega, "materia_id": materia_id
+        }})
+    for i in range(n // 2):
+        lineas.append({"comando": "tareas marcar", "usuario": usuario_id, "id": primera_tarea + i})
+    return "".join(json.dumps(l) + "\n" for l in lineas)
+
+
+def por_lotes(n: int, tamano: int, perfil: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, tm = preparar_task_manager(os.path.join(tmp, "bench.sqlite"), perfil)
+        materia = tm.crear_materia("Materia Benchmark", "#3498DB")
+        entrada = io.StringIO(comandos(n, tm.usuario_activo.idUsuario, materia.idMateria, 1))
+        inicio = time.perf_counter()
+        fallidos = lote.procesar(tm, entrada, io.StringIO(), tamano)
+        duracion = time.perf_counter() - inicio
+        engine.dispose()
+    return {"lote": tamano, "segundos": duracion, "comandos_por_s": n / duracion, "fallidos": fallidos}
+
+
+def por_proceso(procesos: int, perfil: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "bench.sqlite")
+        engine, tm = preparar_task_manager(ruta, perfil)
+        materia = tm.crear_materia("Materia Benchmark", "#3498DB")
+        usuario_id = str(tm.usuario_activo.idUsuario)
+        for i in range(procesos):
+            tm.crear_tarea(f"Tarea {i}", "", Prioridad.Media, date.today() + timedelta(days=7), materia.idMateria)
+        engine.dispose()
+        opciones = ["--bd", ruta] + (["--perfil", perfil] if perfil else [])
+        inicio = time.perf_counter()
+        for i in range(procesos):
+            subprocess.run(
+                [sys.executable, "main.py", "tareas", "marcar", str(i + 1), "--usuario", usuario_id, *opciones],
+                cwd=RAIZ, check=True, capture_output=True
+            )
+        duracion = time.perf_counter() - inicio
+    return {"procesos": procesos, "ms_por_comando": duracion / procesos * 1000, "comandos_por_s": procesos / duracion}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--comandos", type=int, default=10_000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--procesos", type=int, default=10)
+    parser.add_argument("--perfil", default=None)
+    parser.add_argument("--salida", help="archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    guardar_json({
+        "entorno": entorno(args.perfil),
+        "parametros": {"comandos": args.comandos},
+        "por_lotes": [por_lotes(args.comandos, tamano, args.perfil) for tamano in args.lotes],
+        "un_proceso_por_comando": por_proceso(args.procesos, args.perfil),
+    }, args.salida)
+
+
+if __name__ == "__main__":
+    main()
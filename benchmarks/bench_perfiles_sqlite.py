@@ -0,0 +1,59 @@
+"""
+Mide el throughput de escritura y lectura de TaskManager con cada perfil
+de SQLite definido en src/model/declarative_base.py.
+
+Uso:
+    python -m benchmarks.bench_perfiles_sqlite [ESCRITURAS] [LECTURAS]
+
+Escritura: crear_tarea en bucle (un commit por tarea).
+Lectura: seleccionar_tarea por ID aleatorio más una página de listar_tareas.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.comun import preparar_task_manager
+from src.model.declarative_base import PERFILES_SQLITE
+from src.model.modelo import Prioridad
+
+
+def medir(perfil: str, escrituras: int, lecturas: int) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, tm = preparar_task_manager(os.path.join(tmp, "bench.sqlite"), perfil)
+        materia = tm.crear_materia("Materia Benchmark", "#3498DB")
+        entrega = date.today() + timedelta(days=7)
+
+        inicio = time.perf_counter()
+        ids = [
+            tm.crear_tarea(f"Tarea de prueba {i}", "", Prioridad.Media, entrega, materia.idMateria).idTarea
+            for i in range(escrituras)
+        ]
+        t_escritura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(lecturas):
+            tm.seleccionar_tarea(random.choice(ids))
+            tm.listar_tareas(limite=20)
+        t_lectura = time.perf_counter() - inicio
+
+        engine.dispose()
+        return escrituras / t_escritura, lecturas / t_lectura
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("escrituras", type=int, nargs="?", default=2000)
+    parser.add_argument("lecturas", type=int, nargs="?", default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'perfil':>10} {'escrituras/s':>14} {'lecturas/s':>12}")
+    for perfil in PERFILES_SQLITE:
+        escritura, lectura = medir(perfil, args.escrituras, args.lecturas)
+        print(f"{perfil:>10} {escritura:>14.0f} {lectura:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
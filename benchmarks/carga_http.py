@@ -0,0 +1,176 @@
+"""
+Prueba de carga del servicio HTTP (src.api.servidor) en localhost.
+
+Siembra una BD temporal, levanta el servidor en otro proceso y lanza
+clientes con conexiones keep-alive durante un tiempo fijo, con una
+mezcla de lecturas (listar, ver, próximas entregas, resumen) y
+escrituras (crear y marcar tareas). Reporta peticiones/s y las
+latencias p50/p95/p99 totales y por operación.
+
+Uso:
+    python -m benchmarks.carga_http [--clientes 8] [--hilos 8] [--segundos 10]
+                                    [--tareas 10000] [--escrituras 0.1]
+                                    [--perfil PERFIL] [--salida archivo.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.comun import entorno, guardar_json, preparar_task_manager, resumir, sembrar
+from src.api.servidor import CABECERA_USUARIO
+
+LECTURAS = ("listar", "ver", "proximas", "resumen")
+ESCRITURAS = ("crear", "marcar")
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(puerto: int, proceso, limite: float = 30.0):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        if proceso.poll() is not None:
+            raise RuntimeError("El servidor terminó antes de aceptar conexiones")
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("El servidor no aceptó conexiones a tiempo")
+
+
+def cliente(puerto, usuario_id, ids_materia, ids_tarea, hasta, proporcion_escrituras, semilla, resultado):
+    aleatorio = random.Random(semilla)
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+    cabeceras = {CABECERA_USUARIO: str(usuario_id), "Content-Type": "application/json"}
+    entrega = (date.today() + timedelta(days=10)).isoformat()
+    n = 0
+    try:
+        while time.monotonic() < hasta:
+            if aleatorio.random() < proporcion_escrituras:
+                operacion = aleatorio.choice(ESCRITURAS)
+            else:
+                operacion = aleatorio.choice(LECTURAS)
+
+            cuerpo = None
+            if operacion == "listar":
+                metodo, ruta = "GET", "/tareas?limite=20&estado=Pendiente"
+            elif operacion == "ver":
+                metodo, ruta = "GET", f"/tareas/{aleatorio.choice(ids_tarea)}"
+            elif operacion == "proximas":
+                metodo, ruta = "GET", "/entregas/proximas?dias=7"
+            elif operacion == "resumen":
+                metodo, ruta = "GET", "/resumen"
+            elif operacion == "crear":
+                metodo, ruta = "POST", "/tareas"
+                n += 1
+                cuerpo = json.dumps({
+                    "titulo": f"Carga {semilla} {n}", "descripcion": "", "prioridad": "Media",
+                    "fechaEntrega": entrega, "materia_id": aleatorio.choice(ids_materia),
+                })
+            else:
+                metodo, ruta = "POST", f"/tareas/{aleatorio.choice(ids_tarea)}/marcar"
+
+            inicio = time.perf_counter()
+            conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            duracion = time.perf_counter() - inicio
+
+            # marcar una tarea ya completada responde 400; cuenta como respuesta válida
+            if respuesta.status >= 500:
+                resultado["errores"] += 1
+            resultado["latencias"].setdefault(operacion, []).append(duracion)
+    finally:
+        conexion.close()
+
+
+def correr(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "carga.sqlite")
+        engine, tm = preparar_task_manager(ruta, args.perfil)
+        usuario_id = tm.usuario_activo.idUsuario
+        ids_materia = sembrar(engine, usuario_id, args.tareas, 20)
+        with engine.connect() as conn:
+            ids_tarea = [fila[0] for fila in conn.exec_driver_sql("SELECT idTarea FROM tareas")]
+        engine.dispose()
+
+        puerto = puerto_libre()
+        comando = [
+            sys.executable, "-m", "src.api.servidor", "--puerto", str(puerto),
+            "--hilos", str(args.hilos), "--bd", ruta, "--silencioso",
+        ]
+        if args.perfil:
+            comando += ["--perfil", args.perfil]
+        proceso = subprocess.Popen(comando, stderr=subprocess.DEVNULL)
+        try:
+            esperar_servidor(puerto, proceso)
+            hasta = time.monotonic() + args.segundos
+            resultados = [{"latencias": {}, "errores": 0} for _ in range(args.clientes)]
+            hilos = [
+                threading.Thread(target=cliente, args=(
+                    puerto, usuario_id, ids_materia, ids_tarea, hasta, args.escrituras, i, resultados[i]
+                ))
+                for i in range(args.clientes)
+            ]
+            inicio = time.perf_counter()
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            transcurrido = time.perf_counter() - inicio
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+    por_operacion = {}
+    for r in resultados:
+        for operacion, latencias in r["latencias"].items():
+            por_operacion.setdefault(operacion, []).extend(latencias)
+    todas = [l for latencias in por_operacion.values() for l in latencias]
+    total = resumir(todas)
+    # ops_por_s de resumir es secuencial; con clientes concurrentes vale el reloj de pared
+    total["peticiones_por_s"] = len(todas) / transcurrido
+    return {
+        "total": total,
+        "errores": sum(r["errores"] for r in resultados),
+        "operaciones": {op: resumir(lat) for op, lat in sorted(por_operacion.items())},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clientes", type=int, default=8, help="conexiones concurrentes")
+    parser.add_argument("--hilos", type=int, default=8, help="trabajadores del servidor")
+    parser.add_argument("--segundos", type=float, default=10.0)
+    parser.add_argument("--tareas", type=int, default=10_000, help="tareas sembradas")
+    parser.add_argument("--escrituras", type=float, default=0.1, help="proporción de escrituras (0-1)")
+    parser.add_argument("--perfil", default=None, help="perfil de SQLite del servidor")
+    parser.add_argument("--salida", help="archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    datos = {
+        "entorno": entorno(args.perfil),
+        "parametros": {
+            "clientes": args.clientes, "hilos": args.hilos, "segundos": args.segundos,
+            "tareas": args.tareas, "escrituras": args.escrituras,
+        },
+        "resultados": correr(args),
+    }
+    guardar_json(datos, args.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Utilidades compartidas por los benchmarks: BD temporal, siembra y medición."""
+import json
+import platform
+import sqlite3
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable
+
+from sqlalchemy import insert
+
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import crear_engine, resolver_perfil
+from src.model.esquema import inicializar_bd
+from src.model.modelo import EstadoTarea, Materia, Prioridad, Tarea
+
+TAMANO_LOTE_SIEMBRA = 10_000
+PRIORIDADES = (Prioridad.Baja, Prioridad.Media, Prioridad.Alta)
+
+
+def preparar_task_manager(ruta: str, perfil: str = None):
+    """
+    Crea la BD en `ruta` y un TaskManager sobre ella; retorna (engine, tm)
+    con un usuario ya seleccionado.
+    """
+    engine = crear_engine(ruta, perfil=perfil)
+    inicializar_bd(engine)
+    tm = TaskManager(engine=engine)
+    usuario = tm.crear_usuario("Usuario Benchmark", "bench@mail.com")
+    tm.seleccionar_usuario(usuario.idUsuario)
+    return engine, tm
+
+
+def sembrar(engine, usuario_id: int, n_tareas: int, n_materias: int) -> list:
+    """
+    Inserta n_materias materias y n_tareas tareas repartidas entre ellas
+    con INSERT masivos. Retorna los IDs de las materias.
+    """
+    hoy = date.today()
+    with engine.begin() as conn:
+        ids_materia = conn.execute(
+            insert(Materia).returning(Materia.idMateria, sort_by_parameter_order=True),
+            [
+                {"nombre": f"Materia {i}", "color": "#3498DB", "usuario_id": usuario_id}
+                for i in range(n_materias)
+            ]
+        ).scalars().all()
+
+    for inicio in range(0, n_tareas, TAMANO_LOTE_SIEMBRA):
+        filas = [
+            {
+                "titulo": f"Tarea sembrada {i}",
+                "descripcion": "Generada por el benchmark",
+                "prioridad": PRIORIDADES[i % 3],
+                "fechaEntrega": hoy + timedelta(days=i % 120),
+                "estado": EstadoTarea.Completada if i % 4 == 0 else EstadoTarea.Pendiente,
+                "materia_id": ids_materia[i % n_materias],
+                "usuario_id": usuario_id,
+            }
+            for i in range(inicio, min(inicio + TAMANO_LOTE_SIEMBRA, n_tareas))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(Tarea), filas)
+    return list(ids_materia)
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil p (0-100) por interpolación lineal sobre valores ordenados."""
+    ordenados = sorted(valores)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    k = (len(ordenados) - 1) * p / 100
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (k - inferior)
+
+
+def resumir(latencias: Iterable[float]) -> dict:
+    """Resume latencias en segundos como milisegundos y operaciones/s."""
+    latencias = list(latencias)
+    total = sum(latencias)
+    return {
+        "n": len(latencias),
+        "media_ms": statistics.fmean(latencias) * 1000,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p95_ms": percentil(latencias, 95) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+        "max_ms": max(latencias) * 1000,
+        "ops_por_s": len(latencias) / total if total else None,
+    }
+
+
+def medir(operacion: Callable[[int], object], repeticiones: int) -> dict:
+    """Ejecuta operacion(i) `repeticiones` veces y resume sus latencias."""
+    latencias = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        operacion(i)
+        latencias.append(time.perf_counter() - inicio)
+    return resumir(latencias)
+
+
+def entorno(perfil: str = None) -> dict:
+    """Metadatos del entorno para poder comparar corridas."""
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "perfil": resolver_perfil(perfil),
+    }
+
+
+def guardar_json(datos: dict, ruta: str = None):
+    """Escribe el resultado en `ruta`, o en la salida estándar si es None."""
+    texto = json.dumps(datos, indent=2, ensure_ascii=False)
+    if ruta:
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
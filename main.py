@@ -1,13 +1,31 @@
-import src.model.modelo
-from src.logic.task_manager import TaskManager
-from src.model.declarative_base import engine, Base
-from src.model.modelo import Prioridad, EstadoTarea
+import sys
+from src.model.enums import Prioridad, EstadoTarea
 from datetime import date, timedelta, datetime
 
-# ── Inicializar BD ─────────────────────────────────────────────────
-Base.metadata.create_all(engine)
 
-tm = TaskManager()
+class _TaskManagerPerezoso:
+    """
+    Crea el TaskManager en el primer uso. Así importar main.py y mostrar
+    el primer menú no carga SQLAlchemy ni verifica el esquema de la BD.
+    """
+
+    def __init__(self):
+        self._tm = None
+
+    def _cargar(self):
+        from src.logic.task_manager import TaskManager
+        from src.model.esquema import inicializar_bd
+
+        tm = TaskManager()
+        inicializar_bd(tm.engine)
+        self._tm = tm
+        return self._tm
+
+    def __getattr__(self, nombre):
+        return getattr(self._tm or self._cargar(), nombre)
+
+
+tm = _TaskManagerPerezoso()
 
 # ══════════════════════════════════════════════════════════
 # UTILIDADES
@@ -174,13 +192,7 @@ def flujo_crear_materia():
 
 def flujo_editar_materia():
     titulo("✏️  EDITAR MATERIA")
-    materias = tm.listar_usuarios()  # usamos seleccionar_materia via ID
-    # Listar materias del usuario activo
-    from src.model.modelo import Materia
-    from src.model.declarative_base import Session
-    session = Session()
-    mis_materias = session.query(Materia).filter_by(usuario_id=tm.usuario_activo.idUsuario).all()
-    session.close()
+    mis_materias = tm.listar_materias()
 
     if not mis_materias:
         print("\n  ⚠️  No tienes materias creadas.")
@@ -213,11 +225,7 @@ def flujo_editar_materia():
 
 def flujo_eliminar_materia():
     titulo("🗑️  ELIMINAR MATERIA")
-    from src.model.modelo import Materia
-    from src.model.declarative_base import Session
-    session = Session()
-    mis_materias = session.query(Materia).filter_by(usuario_id=tm.usuario_activo.idUsuario).all()
-    session.close()
+    mis_materias = tm.listar_materias()
 
     if not mis_materias:
         print("\n  ⚠️  No tienes materias.")
@@ -246,21 +254,10 @@ def flujo_eliminar_materia():
 # ══════════════════════════════════════════════════════════
 
 def listar_mis_materias():
-    from src.model.modelo import Materia
-    from src.model.declarative_base import Session
-    session = Session()
-    materias = session.query(Materia).filter_by(usuario_id=tm.usuario_activo.idUsuario).all()
-    session.close()
-    return materias
-
-def listar_mis_tareas():
-    from src.model.modelo import Tarea, Materia
-    from src.model.declarative_base import Session
-    session = Session()
-    tareas = session.query(Tarea).join(Materia).filter(
-        Materia.usuario_id == tm.usuario_activo.idUsuario
-    ).all()
-    session.close()
+    return tm.listar_materias()
+
+def listar_mis_tareas(estado=None):
+    tareas, _ = tm.listar_tareas(estado=estado, limite=None)
     return tareas
 
 def flujo_crear_tarea():
@@ -325,15 +322,16 @@ def flujo_crear_tarea():
 
 def flujo_ver_tareas():
     titulo("📋 MIS TAREAS")
-    tareas = listar_mis_tareas()
-
-    if not tareas:
+    resumen = tm.resumen()
+    if not resumen["total"]:
         print("\n  ⚠️  No tienes tareas creadas.")
         pausa()
         return
 
-    pendientes = [t for t in tareas if t.estado == EstadoTarea.Pendiente]
-    completadas = [t for t in tareas if t.estado == EstadoTarea.Completada]
+    por_estado = resumen["por_estado"]
+    print(f"  Pendientes: {por_estado['Pendiente']} | Completadas: {por_estado['Completada']}")
+    pendientes = listar_mis_tareas(EstadoTarea.Pendiente)
+    completadas = listar_mis_tareas(EstadoTarea.Completada)
 
     if pendientes:
         subtitulo("🔴 Pendientes")
@@ -347,6 +345,42 @@ def flujo_ver_tareas():
 
     pausa()
 
+def flujo_proximas_entregas():
+    titulo("⏰ PRÓXIMAS ENTREGAS")
+    vencidas = tm.entregas_vencidas()
+    proximas = tm.proximas_entregas(dias=7)
+
+    if not vencidas and not proximas:
+        print("\n  ✅ No tienes entregas pendientes esta semana.")
+        pausa()
+        return
+
+    if vencidas:
+        subtitulo("⚠️  Vencidas")
+        for t in vencidas:
+            print(f"     [{t.idTarea}] {t.titulo} | {t.prioridad.value} | Entrega: {t.fechaEntrega}")
+
+    if proximas:
+        subtitulo("📅 Próximos 7 días")
+        for t in proximas:
+            print(f"     [{t.idTarea}] {t.titulo} | {t.prioridad.value} | Entrega: {t.fechaEntrega}")
+
+    pausa()
+
+def flujo_buscar_tareas():
+    titulo("🔍 BUSCAR TAREAS")
+    try:
+        texto = pedir("Texto a buscar")
+        tareas = tm.buscar_tareas(texto)
+        if not tareas:
+            print("\n  ⚠️  No se encontraron tareas.")
+        for t in tareas:
+            estado_icono = "✅" if t.estado == EstadoTarea.Completada else "🔴"
+            print(f"     [{t.idTarea}] {estado_icono} {t.titulo} | {t.prioridad.value} | Entrega: {t.fechaEntrega}")
+    except ValueError as e:
+        print(f"\n  ❌ Error: {e}")
+    pausa()
+
 def flujo_marcar_tarea():
     titulo("✅ MARCAR / DESMARCAR TAREA")
     tareas = listar_mis_tareas()
@@ -429,6 +463,8 @@ def menu_tareas():
         titulo("📝 GESTIÓN DE TAREAS")
         op = menu([
             "Ver mis tareas",
+            "Próximas entregas",
+            "Buscar tareas",
             "Crear tarea",
             "Marcar / Desmarcar tarea",
             "Eliminar tarea",
@@ -437,12 +473,16 @@ def menu_tareas():
         if op == 1:
             flujo_ver_tareas()
         elif op == 2:
-            flujo_crear_tarea()
+            flujo_proximas_entregas()
         elif op == 3:
-            flujo_marcar_tarea()
+            flujo_buscar_tareas()
         elif op == 4:
-            flujo_eliminar_tarea()
+            flujo_crear_tarea()
         elif op == 5:
+            flujo_marcar_tarea()
+        elif op == 6:
+            flujo_eliminar_tarea()
+        elif op == 7:
             break
 
 def menu_usuario():
@@ -518,4 +558,14 @@ def main():
         menu_principal()
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--batch"]:
+        # Comandos JSON por stdin, uno por línea (ver src/cli/lote.py)
+        from src.cli.lote import main as main_lote
+
+        sys.exit(main_lote(sys.argv[2:]))
+    if len(sys.argv) > 1:
+        # Con argumentos, modo no interactivo (ver src/cli/comandos.py)
+        from src.cli.comandos import main as main_cli
+
+        sys.exit(main_cli(sys.argv[1:]))
     main()
\ No newline at end of file
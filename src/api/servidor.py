@@ -0,0 +1,504 @@
+"""
+Servicio HTTP/JSON sobre TaskManager (solo biblioteca estándar).
+
+Las peticiones se atienden en un pool de hilos de tamaño configurable
+que comparte una única instancia de TaskManager; cada petición actúa
+como el usuario de la cabecera X-Usuario-Id (tm.como_usuario). Las
+escrituras pasan de a una por un lock (un solo escritor, como SQLite),
+mientras que las lecturas corren en paralelo gracias a WAL.
+
+Uso:
+    python -m src.api.servidor [--host 127.0.0.1] [--puerto 8000]
+                               [--hilos 8] [--bd RUTA] [--perfil PERFIL]
+
+Rutas (las marcadas con * requieren X-Usuario-Id):
+    GET    /usuarios                  POST   /usuarios
+    PATCH  /usuarios/{id} *           DELETE /usuarios/{id} *
+    GET    /materias *                POST   /materias *
+    GET    /materias/{id} *           PATCH  /materias/{id} *
+    DELETE /materias/{id} *
+    GET    /tareas * (filtros de listar_tareas como query string)
+    POST   /tareas *                  GET    /tareas/{id} *
+    PATCH  /tareas/{id} *             DELETE /tareas/{id} *
+    POST   /tareas/{id}/marcar *      POST   /tareas/{id}/desmarcar *
+    GET    /tareas/buscar?q=... *     GET    /resumen *
+    GET    /entregas/proximas?dias=7 *
+    GET    /entregas/vencidas *
+"""
+import argparse
+import enum
+import json
+import re
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import VARIABLE_BD, crear_engine, db_path
+from src.model.esquema import inicializar_bd
+from src.model.modelo import EstadoTarea, Prioridad
+
+CABECERA_USUARIO = "X-Usuario-Id"
+
+# Tamaño máximo aceptado para el cuerpo de una petición
+MAX_CUERPO = 1024 * 1024
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: HTTPStatus, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ──────────────────────────────────────────────────────────────────
+# Conversión entre JSON y los tipos de TaskManager
+# ──────────────────────────────────────────────────────────────────
+
+def a_json(objeto):
+    """Convierte modelos, enums y fechas a valores serializables."""
+    if isinstance(objeto, (list, tuple)):
+        return [a_json(o) for o in objeto]
+    if isinstance(objeto, dict):
+        return {str(k): a_json(v) for k, v in objeto.items()}
+    if isinstance(objeto, enum.Enum):
+        return objeto.value
+    if isinstance(objeto, date):
+        return objeto.isoformat()
+    if hasattr(objeto, "__table__"):
+        return {c.key: a_json(getattr(objeto, c.key)) for c in objeto.__table__.columns}
+    return objeto
+
+
+def _texto(datos: dict, campo: str, defecto=None):
+    """Campo de texto del cuerpo o la consulta; 400 si viene con otro tipo."""
+    valor = datos.get(campo)
+    if valor is None:
+        return defecto
+    if not isinstance(valor, str):
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser texto")
+    return valor
+
+
+def _entero(valor, campo: str) -> int:
+    # int() aceptaría true y 2.5 de un cuerpo JSON
+    if isinstance(valor, (bool, float)):
+        valor = None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser un número entero")
+
+
+def _fecha(valor, campo: str = "fechaEntrega"):
+    if valor is None:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, f"'{campo}' debe tener formato AAAA-MM-DD")
+
+
+def _enum(tipo, valor, campo: str):
+    if valor is None:
+        return None
+    try:
+        return tipo(valor)
+    except (TypeError, ValueError):
+        opciones = ", ".join(e.value for e in tipo)
+        raise ErrorHTTP(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser uno de: {opciones}")
+
+
+def _propia(objeto, tm: TaskManager):
+    """404 si el objeto no existe o es de otro usuario."""
+    if objeto is None or objeto.usuario_id != tm.usuario_activo.idUsuario:
+        raise ErrorHTTP(HTTPStatus.NOT_FOUND, "No encontrado")
+    return objeto
+
+
+# ──────────────────────────────────────────────────────────────────
+# Operaciones: (tm, parámetros de ruta, query, cuerpo) -> (estado, datos)
+# ──────────────────────────────────────────────────────────────────
+
+def listar_usuarios(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.listar_usuarios()
+
+
+def crear_usuario(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.CREATED, tm.crear_usuario(_texto(cuerpo, "nombre", ""), _texto(cuerpo, "correo", ""))
+
+
+def editar_usuario(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.editar_usuario(
+        ruta["id"], nuevo_nombre=_texto(cuerpo, "nombre"), nuevo_correo=_texto(cuerpo, "correo")
+    )
+
+
+def eliminar_usuario(tm, ruta, consulta, cuerpo):
+    tm.eliminar_usuario(ruta["id"])
+    return HTTPStatus.NO_CONTENT, None
+
+
+def listar_materias(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.listar_materias()
+
+
+def crear_materia(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.CREATED, tm.crear_materia(_texto(cuerpo, "nombre", ""), _texto(cuerpo, "color", ""))
+
+
+def ver_materia(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, _propia(tm.seleccionar_materia(ruta["id"]), tm)
+
+
+def editar_materia(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.editar_materia(
+        ruta["id"], nuevo_nombre=_texto(cuerpo, "nombre"), nuevo_color=_texto(cuerpo, "color")
+    )
+
+
+def eliminar_materia(tm, ruta, consulta, cuerpo):
+    tm.eliminar_materia(ruta["id"])
+    return HTTPStatus.NO_CONTENT, None
+
+
+def listar_tareas(tm, ruta, consulta, cuerpo):
+    limite = consulta.get("limite", "50")
+    tareas, siguiente = tm.listar_tareas(
+        estado=_enum(EstadoTarea, consulta.get("estado"), "estado"),
+        prioridad=_enum(Prioridad, consulta.get("prioridad"), "prioridad"),
+        materia_id=_entero(consulta["materia_id"], "materia_id") if "materia_id" in consulta else None,
+        desde=_fecha(consulta.get("desde"), "desde"),
+        hasta=_fecha(consulta.get("hasta"), "hasta"),
+        orden=_texto(consulta, "orden", "fechaEntrega"),
+        limite=_entero(limite, "limite"),
+        cursor=_texto(consulta, "cursor"),
+    )
+    return HTTPStatus.OK, {"tareas": tareas, "siguiente": siguiente}
+
+
+def crear_tarea(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.CREATED, tm.crear_tarea(
+        titulo=_texto(cuerpo, "titulo", ""),
+        descripcion=_texto(cuerpo, "descripcion", ""),
+        prioridad=_enum(Prioridad, cuerpo.get("prioridad"), "prioridad"),
+        fecha_entrega=_fecha(cuerpo.get("fechaEntrega")),
+        materia_id=_entero(cuerpo.get("materia_id"), "materia_id"),
+    )
+
+
+def ver_tarea(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, _propia(tm.seleccionar_tarea(ruta["id"]), tm)
+
+
+def editar_tarea(tm, ruta, consulta, cuerpo):
+    materia_id = cuerpo.get("materia_id")
+    return HTTPStatus.OK, tm.editar_tarea(
+        ruta["id"],
+        nuevo_titulo=_texto(cuerpo, "titulo"),
+        nueva_descripcion=_texto(cuerpo, "descripcion"),
+        nueva_prioridad=_enum(Prioridad, cuerpo.get("prioridad"), "prioridad"),
+        nueva_fecha_entrega=_fecha(cuerpo.get("fechaEntrega")),
+        nueva_materia_id=None if materia_id is None else _entero(materia_id, "materia_id"),
+    )
+
+
+def eliminar_tarea(tm, ruta, consulta, cuerpo):
+    tm.eliminar_tarea(ruta["id"])
+    return HTTPStatus.NO_CONTENT, None
+
+
+def marcar_tarea(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.marcar_tarea(ruta["id"])
+
+
+def desmarcar_tarea(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.desmarcar_tarea(ruta["id"])
+
+
+def buscar_tareas(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.buscar_tareas(
+        _texto(consulta, "q", ""), limite=_entero(consulta.get("limite", "20"), "limite")
+    )
+
+
+def resumen(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.resumen()
+
+
+def proximas_entregas(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.proximas_entregas(
+        dias=_entero(consulta.get("dias", "7"), "dias"),
+        limite=_entero(consulta.get("limite", "20"), "limite"),
+    )
+
+
+def entregas_vencidas(tm, ruta, consulta, cuerpo):
+    return HTTPStatus.OK, tm.entregas_vencidas(limite=_entero(consulta.get("limite", "20"), "limite"))
+
+
+# (método, patrón, operación, escribe, requiere usuario)
+RUTAS = [
+    ("GET", r"/usuarios", listar_usuarios, False, False),
+    ("POST", r"/usuarios", crear_usuario, True, False),
+    ("PATCH", r"/usuarios/(?P<id>\d+)", editar_usuario, True, True),
+    ("DELETE", r"/usuarios/(?P<id>\d+)", eliminar_usuario, True, True),
+    ("GET", r"/materias", listar_materias, False, True),
+    ("POST", r"/materias", crear_materia, True, True),
+    ("GET", r"/materias/(?P<id>\d+)", ver_materia, False, True),
+    ("PATCH", r"/materias/(?P<id>\d+)", editar_materia, True, True),
+    ("DELETE", r"/materias/(?P<id>\d+)", eliminar_materia, True, True),
+    ("GET", r"/tareas", listar_tareas, False, True),
+    ("POST", r"/tareas", crear_tarea, True, True),
+    ("GET", r"/tareas/buscar", buscar_tareas, False, True),
+    ("GET", r"/tareas/(?P<id>\d+)", ver_tarea, False, True),
+    ("PATCH", r"/tareas/(?P<id>\d+)", editar_tarea, True, True),
+    ("DELETE", r"/tareas/(?P<id>\d+)", eliminar_tarea, True, True),
+    ("POST", r"/tareas/(?P<id>\d+)/marcar", marcar_tarea, True, True),
+    ("POST", r"/tareas/(?P<id>\d+)/desmarcar", desmarcar_tarea, True, True),
+    ("GET", r"/resumen", resumen, False, True),
+    ("GET", r"/entregas/proximas", proximas_entregas, False, True),
+    ("GET", r"/entregas/vencidas", entregas_vencidas, False, True),
+]
+_RUTAS = [
+    (metodo, re.compile(patron + r"/?\Z"), operacion, escribe, requiere_usuario)
+    for metodo, patron, operacion, escribe, requiere_usuario in RUTAS
+]
+
+
+def resolver_ruta(metodo: str, camino: str):
+    """(operación, parámetros, escribe, requiere usuario) de la ruta; 404/405 si no hay."""
+    metodos = set()
+    for metodo_ruta, patron, operacion, escribe, requiere_usuario in _RUTAS:
+        encontrado = patron.match(camino)
+        if not encontrado:
+            continue
+        if metodo_ruta == metodo:
+            parametros = {k: int(v) for k, v in encontrado.groupdict().items()}
+            return operacion, parametros, escribe, requiere_usuario
+        metodos.add(metodo_ruta)
+    if metodos:
+        raise ErrorHTTP(HTTPStatus.METHOD_NOT_ALLOWED, "Método no permitido")
+    raise ErrorHTTP(HTTPStatus.NOT_FOUND, "Ruta inexistente")
+
+
+def estado_para_error(mensaje: str) -> HTTPStatus:
+    """Traduce los ValueError de TaskManager a un código HTTP."""
+    if "no existe" in mensaje:
+        return HTTPStatus.NOT_FOUND
+    if "otro usuario" in mensaje or "su propio usuario" in mensaje:
+        return HTTPStatus.FORBIDDEN
+    return HTTPStatus.BAD_REQUEST
+
+
+# ──────────────────────────────────────────────────────────────────
+# Servidor
+# ──────────────────────────────────────────────────────────────────
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GestorTareas/1.0"
+    # Cabeceras y cuerpo salen en dos escrituras; con Nagle y el ACK
+    # diferido del cliente cada respuesta keep-alive esperaría ~40 ms
+    disable_nagle_algorithm = True
+    # Segundos que una conexión puede quedar sin enviar nada (p. ej. un
+    # cliente keep-alive inactivo) antes de cerrarse y liberar su hilo
+    timeout = 30
+
+    def do_GET(self):
+        self._despachar("GET")
+
+    def do_POST(self):
+        self._despachar("POST")
+
+    def do_PUT(self):
+        self._despachar("PUT")
+
+    def do_PATCH(self):
+        self._despachar("PATCH")
+
+    def do_DELETE(self):
+        self._despachar("DELETE")
+
+    def log_message(self, formato, *args):
+        if self.server.registrar:
+            super().log_message(formato, *args)
+
+    def _leer_cuerpo(self) -> dict:
+        # Un cuerpo rechazado sin leer quedaría en la conexión y se tomaría
+        # como la petición siguiente: hasta leerlo, la conexión se cierra.
+        cerrar, self.close_connection = self.close_connection, True
+        largo = _entero(self.headers.get("Content-Length") or 0, "Content-Length")
+        if largo < 0:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "'Content-Length' no puede ser negativo")
+        if largo > MAX_CUERPO:
+            raise ErrorHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+        contenido = self.rfile.read(largo) if largo else b""
+        self.close_connection = cerrar
+        if not contenido:
+            return {}
+        try:
+            cuerpo = json.loads(contenido)
+        except ValueError:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "El cuerpo no es JSON válido")
+        if not isinstance(cuerpo, dict):
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON")
+        return cuerpo
+
+    def _despachar(self, metodo: str):
+        try:
+            partes = urlsplit(self.path)
+            # El cuerpo se lee siempre para no dejar bytes en la conexión
+            cuerpo = self._leer_cuerpo()
+            consulta = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+            operacion, ruta, escribe, requiere_usuario = resolver_ruta(metodo, partes.path)
+            estado, datos = self.server.ejecutar(
+                operacion, ruta, consulta, cuerpo, escribe,
+                self.headers.get(CABECERA_USUARIO) if requiere_usuario else None,
+                requiere_usuario
+            )
+        except ErrorHTTP as e:
+            estado, datos = e.estado, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            estado, datos = estado_para_error(str(e)), {"error": str(e)}
+        except Exception as e:
+            self.log_error("Error interno: %r", e)
+            estado, datos = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Error interno"}
+        self._responder(estado, datos)
+
+    def _responder(self, estado: HTTPStatus, datos):
+        self.send_response(estado)
+        if estado == HTTPStatus.NO_CONTENT:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        contenido = json.dumps(a_json(datos), ensure_ascii=False).encode("utf-8")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+
+class ServidorAPI(HTTPServer):
+    """
+    HTTPServer que atiende cada conexión en un ThreadPoolExecutor de
+    `hilos` trabajadores. Con keep-alive una conexión ocupa un trabajador
+    mientras está abierta, así que conviene tener al menos tantos hilos
+    como clientes concurrentes.
+    """
+    allow_reuse_address = True
+
+    def __init__(self, direccion, tm: TaskManager, hilos: int = 8, registrar: bool = False):
+        super().__init__(direccion, ManejadorAPI)
+        self.tm = tm
+        self.registrar = registrar
+        self.escritura = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="api")
+        # Conexiones aceptadas y todavía no cerradas, para cortarlas al cerrar
+        self._conexiones = set()
+        self._lock_conexiones = threading.Lock()
+
+    def ejecutar(self, operacion, ruta, consulta, cuerpo, escribe, usuario, requiere_usuario):
+        with ExitStack() as pila:
+            if requiere_usuario:
+                if usuario is None:
+                    raise ErrorHTTP(HTTPStatus.UNAUTHORIZED, f"Falta la cabecera {CABECERA_USUARIO}")
+                id_usuario = _entero(usuario, CABECERA_USUARIO)
+                try:
+                    pila.enter_context(self.tm.como_usuario(id_usuario))
+                except ValueError as e:
+                    raise ErrorHTTP(HTTPStatus.UNAUTHORIZED, str(e))
+            if escribe:
+                pila.enter_context(self.escritura)
+            return operacion(self.tm, ruta, consulta, cuerpo)
+
+    def process_request(self, request, client_address):
+        with self._lock_conexiones:
+            self._conexiones.add(request)
+        self._pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._cerrar_conexion(request)
+
+    def _cerrar_conexion(self, request):
+        with self._lock_conexiones:
+            if request not in self._conexiones:
+                return
+            self._conexiones.discard(request)
+        self.shutdown_request(request)
+
+    def server_close(self):
+        """
+        Deja de aceptar conexiones y corta las abiertas: un cliente
+        keep-alive conectado no impide cerrar el servidor.
+        """
+        super().server_close()
+        with self._lock_conexiones:
+            abiertas = list(self._conexiones)
+        for request in abiertas:
+            try:
+                # Despierta al hilo que espera la próxima petición
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        # Las que seguían en la cola del pool no llegaron a atenderse
+        for request in abiertas:
+            self._cerrar_conexion(request)
+
+
+def crear_servidor(
+    host: str = "127.0.0.1",
+    puerto: int = 8000,
+    hilos: int = 8,
+    ruta_bd: str = None,
+    perfil: str = None,
+    registrar: bool = False
+) -> ServidorAPI:
+    """
+    Crea el servidor (sin arrancarlo) sobre la BD `ruta_bd` (por defecto
+    la de TASKMANAGER_BD o src/model/db.sqlite), con un pool de conexiones
+    del tamaño del pool de hilos. El TaskManager va sin caché: la CLI, el
+    modo por lotes y las importaciones escriben la misma BD desde otros
+    procesos.
+    """
+    engine = crear_engine(ruta_bd, perfil=perfil, pool_size=hilos, max_overflow=hilos)
+    inicializar_bd(engine)
+    return ServidorAPI((host, puerto), TaskManager(cache=False, engine=engine), hilos=hilos, registrar=registrar)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del gestor de tareas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--hilos", type=int, default=8, help="trabajadores del pool")
+    parser.add_argument("--bd", default=None, help=f"ruta de la BD (por defecto ${VARIABLE_BD} o {db_path})")
+    parser.add_argument("--perfil", default=None, help="perfil de SQLite (durable, balanced, fast)")
+    parser.add_argument("--silencioso", action="store_true", help="no registrar cada petición")
+    args = parser.parse_args(argv)
+
+    servidor = crear_servidor(
+        args.host, args.puerto, args.hilos, args.bd, args.perfil, registrar=not args.silencioso
+    )
+    print(f"Escuchando en http://{args.host}:{servidor.server_address[1]} "
+          f"({args.hilos} hilos)", file=sys.stderr, flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Línea de comandos no interactiva sobre TaskManager.
+
+Cada subcomando llama a la misma operación que la ruta equivalente del
+servicio HTTP (src.api.servidor), así que valida y responde igual, e
+imprime el resultado como JSON (por defecto) o TSV con encabezado. Los
+errores van a stderr y se reflejan en el código de salida:
+
+    0  éxito
+    1  datos inválidos
+    2  uso incorrecto (opciones que faltan o sobran)
+    3  no existe (o es de otro usuario)
+    4  operación prohibida (p. ej. tocar otro usuario)
+    5  falta --usuario o el usuario no existe
+
+Uso (también como `python main.py ...`):
+    python -m src.cli.comandos GRUPO ACCION [ID] [opciones] [--usuario ID]
+                               [--json | --tsv] [--bd RUTA] [--perfil PERFIL]
+
+    usuarios  listar | crear | editar ID | eliminar ID
+    materias  listar | crear | ver ID | editar ID | eliminar ID
+    tareas    listar | crear | ver ID | editar ID | marcar ID | desmarcar ID
+              | eliminar ID | buscar | resumen
+    entregas  proximas | vencidas
+
+Ejemplos:
+    python main.py usuarios crear --nombre "Ana Perez" --correo ana@mail.com
+    python main.py tareas crear --usuario 1 --titulo "Leer cap. 3" --prioridad Alta \\
+        --fecha 2026-11-02 --materia 2
+    python main.py tareas listar --usuario 1 --estado Pendiente --tsv
+"""
+import argparse
+import json
+import sys
+from contextlib import ExitStack
+from http import HTTPStatus
+
+from src.api import servidor
+from src.api.servidor import ErrorHTTP, a_json, estado_para_error
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import VARIABLE_BD, crear_engine, db_path
+from src.model.esquema import inicializar_bd
+
+SALIDA_OK = 0
+SALIDA_INVALIDO = 1
+SALIDA_USO = 2
+SALIDA_NO_EXISTE = 3
+SALIDA_PROHIBIDO = 4
+SALIDA_SIN_USUARIO = 5
+
+_SALIDAS = {
+    HTTPStatus.NOT_FOUND: SALIDA_NO_EXISTE,
+    HTTPStatus.FORBIDDEN: SALIDA_PROHIBIDO,
+    HTTPStatus.UNAUTHORIZED: SALIDA_SIN_USUARIO,
+}
+
+# Errores de una operación que se informan con un código de salida (el
+# resto son fallas internas y se propagan)
+ERRORES = (ErrorHTTP, ValueError, TypeError)
+
+# Opciones de los subcomandos: (opción, campo de la operación, va en "cuerpo" o "consulta")
+_NOMBRE = ("--nombre", "nombre", "cuerpo")
+_CORREO = ("--correo", "correo", "cuerpo")
+_COLOR = ("--color", "color", "cuerpo")
+_TAREA = [
+    ("--titulo", "titulo", "cuerpo"),
+    ("--descripcion", "descripcion", "cuerpo"),
+    ("--prioridad", "prioridad", "cuerpo"),
+    ("--fecha", "fechaEntrega", "cuerpo"),
+    ("--materia", "materia_id", "cuerpo"),
+]
+_LIMITE = ("--limite", "limite", "consulta")
+
+# (grupo, acción, operación, requiere usuario, lleva ID, opciones)
+COMANDOS = [
+    ("usuarios", "listar", servidor.listar_usuarios, False, False, []),
+    ("usuarios", "crear", servidor.crear_usuario, False, False, [_NOMBRE, _CORREO]),
+    ("usuarios", "editar", servidor.editar_usuario, True, True, [_NOMBRE, _CORREO]),
+    ("usuarios", "eliminar", servidor.eliminar_usuario, True, True, []),
+    ("materias", "listar", servidor.listar_materias, True, False, []),
+    ("materias", "crear", servidor.crear_materia, True, False, [_NOMBRE, _COLOR]),
+    ("materias", "ver", servidor.ver_materia, True, True, []),
+    ("materias", "editar", servidor.editar_materia, True, True, [_NOMBRE, _COLOR]),
+    ("materias", "eliminar", servidor.eliminar_materia, True, True, []),
+    ("tareas", "listar", servidor.listar_tareas, True, False, [
+        ("--estado", "estado", "consulta"),
+        ("--prioridad", "prioridad", "consulta"),
+        ("--materia", "materia_id", "consulta"),
+        ("--desde", "desde", "consulta"),
+        ("--hasta", "hasta", "consulta"),
+        ("--orden", "orden", "consulta"),
+        _LIMITE,
+        ("--cursor", "cursor", "consulta"),
+    ]),
+    ("tareas", "crear", servidor.crear_tarea, True, False, _TAREA),
+    ("tareas", "ver", servidor.ver_tarea, True, True, []),
+    ("tareas", "editar", servidor.editar_tarea, True, True, _TAREA),
+    ("tareas", "marcar", servidor.marcar_tarea, True, True, []),
+    ("tareas", "desmarcar", servidor.desmarcar_tarea, True, True, []),
+    ("tareas", "eliminar", servidor.eliminar_tarea, True, True, []),
+    ("tareas", "buscar", servidor.buscar_tareas, True, False, [("--texto", "q", "consulta"), _LIMITE]),
+    ("tareas", "resumen", servidor.resumen, True, False, []),
+    ("entregas", "proximas", servidor.proximas_entregas, True, False, [("--dias", "dias", "consulta"), _LIMITE]),
+    ("entregas", "vencidas", servidor.entregas_vencidas, True, False, [_LIMITE]),
+]
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    comunes = argparse.ArgumentParser(add_help=False)
+    comunes.add_argument("--usuario", type=int, help="ID del usuario con el que se actúa")
+    formato = comunes.add_mutually_exclusive_group()
+    formato.add_argument("--json", dest="formato", action="store_const", const="json", help="salida JSON (por defecto)")
+    formato.add_argument("--tsv", dest="formato", action="store_const", const="tsv", help="salida TSV con encabezado")
+    comunes.add_argument("--bd", default=None, help=f"ruta de la BD (por defecto ${VARIABLE_BD} o {db_path})")
+    comunes.add_argument("--perfil", default=None, help="perfil de SQLite (durable, balanced, fast)")
+
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Gestor de tareas académicas sin menús interactivos."
+    )
+    grupos = parser.add_subparsers(dest="grupo", required=True, metavar="GRUPO")
+    acciones = {}
+    for grupo, accion, operacion, requiere_usuario, lleva_id, opciones in COMANDOS:
+        if grupo not in acciones:
+            acciones[grupo] = grupos.add_parser(grupo).add_subparsers(dest="accion", required=True, metavar="ACCION")
+        sub = acciones[grupo].add_parser(accion, parents=[comunes])
+        if lleva_id:
+            sub.add_argument("id", type=int)
+        for opcion, campo, _ in opciones:
+            sub.add_argument(opcion, dest=campo)
+        sub.set_defaults(operacion=operacion, requiere_usuario=requiere_usuario, opciones=opciones)
+    return parser
+
+
+def ejecutar(tm: TaskManager, operacion, ruta: dict, consulta: dict, cuerpo: dict,
+             usuario: int = None, requiere_usuario: bool = True):
+    """
+    Corre `operacion` (una de las de src.api.servidor) como el usuario
+    `usuario` si la operación lo requiere. Retorna los datos de la respuesta.
+    """
+    with ExitStack() as pila:
+        if requiere_usuario:
+            if usuario is None:
+                raise ErrorHTTP(HTTPStatus.UNAUTHORIZED, "Falta el usuario")
+            try:
+                pila.enter_context(tm.como_usuario(usuario))
+            except ValueError as e:
+                raise ErrorHTTP(HTTPStatus.UNAUTHORIZED, str(e))
+        _, datos = operacion(tm, ruta, consulta, cuerpo)
+    return datos
+
+
+def codigo_de_salida(error: Exception) -> int:
+    """Código de salida para un error de ERRORES."""
+    if isinstance(error, ErrorHTTP):
+        return _SALIDAS.get(error.estado, SALIDA_INVALIDO)
+    return _SALIDAS.get(estado_para_error(str(error)), SALIDA_INVALIDO)
+
+
+# Una fila por línea física: la barra invertida, el tabulador y los saltos
+# de línea de un valor se escriben como \\, \t, \n y \r
+_ESCAPES_TSV = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _celda_tsv(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, (dict, list)):
+        valor = json.dumps(valor, ensure_ascii=False)
+    return str(valor).translate(_ESCAPES_TSV)
+
+
+def escribir(datos, formato: str, salida, errores):
+    """
+    Imprime los datos como un documento JSON o como TSV (una fila por
+    objeto; los valores anidados, como JSON, y los caracteres especiales,
+    escapados). En TSV el cursor de la página siguiente de `tareas listar`
+    va a stderr.
+    """
+    datos = a_json(datos)
+    if datos is None:
+        return
+    if formato == "json":
+        salida.write(json.dumps(datos, ensure_ascii=False) + "\n")
+        return
+
+    if isinstance(datos, dict) and "tareas" in datos:
+        if datos.get("siguiente"):
+            print(f"siguiente: {datos['siguiente']}", file=errores)
+        datos = datos["tareas"]
+    filas = datos if isinstance(datos, list) else [datos]
+    if not filas:
+        return
+    columnas = list(filas[0])
+    salida.write("\t".join(columnas) + "\n")
+    for fila in filas:
+        salida.write("\t".join(_celda_tsv(fila.get(c)) for c in columnas) + "\n")
+
+
+def main(argv=None, tm: TaskManager = None, salida=None, errores=None) -> int:
+    """
+    Corre un subcomando y retorna el código de salida. Sin `tm` abre la
+    BD de --bd (o la por defecto) y verifica su esquema.
+    """
+    salida = salida or sys.stdout
+    errores = errores or sys.stderr
+    try:
+        args = crear_parser().parse_args(argv)
+    except SystemExit as e:
+        # argparse sale con 0 tras --help y con 2 ante un error de uso
+        return SALIDA_OK if e.code == 0 else SALIDA_USO
+
+    if tm is None:
+        engine = crear_engine(args.bd, perfil=args.perfil)
+        inicializar_bd(engine)
+        tm = TaskManager(cache=False, engine=engine)
+    partes = {"cuerpo": {}, "consulta": {}}
+    for _, campo, lugar in args.opciones:
+        valor = getattr(args, campo)
+        if valor is not None:
+            partes[lugar][campo] = valor
+    try:
+        datos = ejecutar(
+            tm, args.operacion, {"id": args.id} if "id" in args else {},
+            partes["consulta"], partes["cuerpo"], args.usuario, args.requiere_usuario
+        )
+    except ERRORES as e:
+        print(f"error: {e}", file=errores)
+        return codigo_de_salida(e)
+    escribir(datos, args.formato or "json", salida, errores)
+    return SALIDA_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Modo por lotes: muchas operaciones en un solo proceso.
+
+Lee de stdin un comando JSON por línea, los ejecuta sobre un único
+TaskManager y escribe en stdout un resultado JSON por línea, en el mismo
+orden. Los comandos se agrupan de a --lote en una transacción
+(tm.transaccion): un solo commit por grupo. Si la entrada es una tubería
+o una terminal y no hay más líneas listas, el grupo se cierra antes: un
+productor que escribe de a un comando y espera su resultado lo recibe
+sin tener que juntar --lote líneas. Cada comando corre en su
+propio SAVEPOINT, así que uno que falla no deshace a los demás de su
+grupo. Los resultados de un grupo se escriben después de su commit: una
+línea con "ok": true ya está confirmada en la BD. Un error inesperado en
+un comando se informa en su línea con codigo 1, como uno de validación,
+y el proceso sigue.
+
+Comandos:
+    {"comando": "tareas crear", "usuario": 1, "datos": {"titulo": "Leer cap. 3",
+     "prioridad": "Alta", "fechaEntrega": "2026-11-02", "materia_id": 2}}
+    {"comando": "tareas marcar", "usuario": 1, "id": 7, "ref": "a-17"}
+
+"comando" es un subcomando de src.cli.comandos ("usuarios crear",
+"materias editar", "tareas listar", ...), "id" el del objeto para los que
+lo llevan y "datos" los campos con los nombres del servicio HTTP (los
+del cuerpo JSON o del query string). "ref" se devuelve tal cual.
+
+Resultados (n es el número de línea y codigo, el código de salida que
+daría el subcomando):
+    {"n": 1, "ok": true, "datos": {...}}
+    {"n": 2, "ref": "a-17", "ok": false, "codigo": 3, "error": "La tarea no existe"}
+
+El proceso sale con 0 si todos los comandos funcionaron y con 1 si
+alguno falló.
+
+Uso:
+    python main.py --batch [--lote 500] [--bd RUTA] [--perfil PERFIL] < comandos.jsonl
+"""
+import argparse
+import json
+import os
+import select
+import sys
+from itertools import islice
+
+from src.api.servidor import a_json
+from src.cli import comandos
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import VARIABLE_BD, crear_engine, db_path
+from src.model.esquema import inicializar_bd
+
+LOTE_POR_DEFECTO = 500
+
+# "grupo acción" -> (operación, requiere usuario, lleva ID)
+OPERACIONES = {
+    f"{grupo} {accion}": (operacion, requiere_usuario, lleva_id)
+    for grupo, accion, operacion, requiere_usuario, lleva_id, _ in comandos.COMANDOS
+}
+
+
+class ComandoInvalido(ValueError):
+    """Una línea que no es un comando bien formado."""
+
+
+def _leer(linea: str):
+    """(comando, operación, requiere usuario, ruta) de una línea."""
+    try:
+        comando = json.loads(linea)
+    except ValueError:
+        raise ComandoInvalido("La línea no es JSON válido")
+    if not isinstance(comando, dict):
+        raise ComandoInvalido("El comando debe ser un objeto JSON")
+    if comando.get("comando") not in OPERACIONES:
+        raise ComandoInvalido(f"Comando desconocido: {comando.get('comando')!r}")
+    operacion, requiere_usuario, lleva_id = OPERACIONES[comando["comando"]]
+    if not isinstance(comando.get("datos", {}), dict):
+        raise ComandoInvalido('"datos" debe ser un objeto JSON')
+    for campo in ("usuario", "id") if lleva_id else ("usuario",):
+        valor = comando.get(campo)
+        if valor is not None and (not isinstance(valor, int) or isinstance(valor, bool)):
+            raise ComandoInvalido(f'"{campo}" debe ser un número entero')
+    if lleva_id and comando.get("id") is None:
+        raise ComandoInvalido('Falta "id"')
+    return comando, operacion, requiere_usuario, {"id": comando["id"]} if lleva_id else {}
+
+
+def ejecutar_linea(tm: TaskManager, n: int, linea: str) -> dict:
+    """Ejecuta el comando de la línea `n` y retorna su resultado."""
+    resultado = {"n": n}
+    try:
+        comando, operacion, requiere_usuario, ruta = _leer(linea)
+        if "ref" in comando:
+            resultado["ref"] = comando["ref"]
+        # Cada operación toma de "datos" lo suyo, venga del cuerpo o de la consulta
+        datos = comando.get("datos", {})
+        respuesta = comandos.ejecutar(
+            tm, operacion, ruta, datos, datos, comando.get("usuario"), requiere_usuario
+        )
+    except ComandoInvalido as e:
+        resultado.update(ok=False, codigo=comandos.SALIDA_USO, error=str(e))
+    except comandos.ERRORES as e:
+        resultado.update(ok=False, codigo=comandos.codigo_de_salida(e), error=str(e))
+    except Exception as e:
+        # Su SAVEPOINT ya se deshizo: el resto del grupo sigue en pie
+        resultado.update(ok=False, codigo=comandos.SALIDA_INVALIDO, error=f"Error interno: {e!r}")
+    else:
+        resultado.update(ok=True, datos=a_json(respuesta))
+    return resultado
+
+
+def _sin_esperar(entrada):
+    """Descriptor de `entrada` si se puede consultar sin bloquear, o None."""
+    if sys.platform == "win32":
+        return None  # select no admite tuberías en Windows
+    try:
+        return entrada.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _grupos(entrada, lote: int):
+    """
+    Agrupa las líneas numeradas de `entrada` de a `lote`. Con un descriptor
+    que admite select, un grupo se cierra también cuando no hay más
+    entrada lista; si no, los grupos son siempre de `lote` líneas.
+    """
+    descriptor = _sin_esperar(entrada)
+    if descriptor is None:
+        lineas = enumerate(entrada, 1)
+        while bloque := list(islice(lineas, lote)):
+            yield bloque
+        return
+
+    # Se lee el descriptor directamente: lo que quedara en el búfer de
+    # `entrada` no lo vería select.
+    codificacion = getattr(entrada, "encoding", None) or "utf-8"
+    lineas, resto, n = [], b"", 0
+    while True:
+        while len(lineas) >= lote:
+            yield lineas[:lote]
+            del lineas[:lote]
+        if lineas and not select.select([descriptor], [], [], 0)[0]:
+            yield lineas
+            lineas = []
+        datos = os.read(descriptor, 1 << 16)
+        if not datos:
+            break
+        *completas, resto = (resto + datos).split(b"\n")
+        for linea in completas:
+            n += 1
+            lineas.append((n, linea.decode(codificacion, "replace") + "\n"))
+    if resto:
+        lineas.append((n + 1, resto.decode(codificacion, "replace")))
+    if lineas:
+        yield lineas
+
+
+def procesar(tm: TaskManager, entrada, salida, lote: int = LOTE_POR_DEFECTO) -> int:
+    """
+    Ejecuta los comandos de `entrada` en transacciones de hasta `lote`
+    líneas y escribe sus resultados en `salida`. Retorna cuántos fallaron.
+    """
+    fallidos = 0
+    # Cada grupo se lee antes de abrir la transacción, para no retener el
+    # lock de escritura mientras se espera la entrada.
+    for bloque in _grupos(entrada, lote):
+        grupo = [(n, linea) for n, linea in bloque if linea.strip()]
+        if not grupo:
+            continue
+        with tm.transaccion():
+            resultados = [ejecutar_linea(tm, n, linea) for n, linea in grupo]
+        for resultado in resultados:
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        salida.flush()
+        fallidos += sum(not resultado["ok"] for resultado in resultados)
+    return fallidos
+
+
+def main(argv=None, tm: TaskManager = None, entrada=None, salida=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="main.py --batch", description="Ejecuta comandos JSON (uno por línea) leídos de stdin."
+    )
+    parser.add_argument("--lote", type=int, default=LOTE_POR_DEFECTO, help="comandos por transacción")
+    parser.add_argument("--bd", default=None, help=f"ruta de la BD (por defecto ${VARIABLE_BD} o {db_path})")
+    parser.add_argument("--perfil", default=None, help="perfil de SQLite (durable, balanced, fast)")
+    try:
+        args = parser.parse_args(argv)
+        if args.lote < 1:
+            parser.error("--lote debe ser al menos 1")
+    except SystemExit as e:
+        return comandos.SALIDA_OK if e.code == 0 else comandos.SALIDA_USO
+
+    if tm is None:
+        engine = crear_engine(args.bd, perfil=args.perfil)
+        inicializar_bd(engine)
+        # Otros procesos pueden escribir en la misma BD: sin caché, que
+        # solo se entera de las escrituras de esta instancia.
+        tm = TaskManager(cache=False, engine=engine)
+    fallidos = procesar(tm, entrada or sys.stdin, salida or sys.stdout, args.lote)
+    return comandos.SALIDA_OK if fallidos == 0 else comandos.SALIDA_INVALIDO
+
+
+if __name__ == "__main__":
+    sys.exit(main())
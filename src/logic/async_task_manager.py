@@ -0,0 +1,543 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.logic.validaciones import Validaciones
+from src.model.declarative_base import (
+    MEMORIA, crear_bd_memoria, instalar_perfil, resolver_bd, resolver_perfil
+)
+from src.model.modelo import Usuario, Materia, Tarea, Importacion, Prioridad, EstadoTarea
+
+
+def crear_engine_async(ruta: str = None, perfil: str = None, echo: bool = False) -> AsyncEngine:
+    """
+    Crea un engine asyncio (aiosqlite) con el mismo perfil de PRAGMA que
+    crear_engine. Requiere los paquetes aiosqlite y greenlet.
+
+    `ruta` se resuelve como en crear_engine: un archivo, una URL sqlite://
+    o MEMORIA; por defecto, la de TASKMANAGER_BD o src/model/db.sqlite.
+    """
+    resolver_perfil(perfil)
+    ruta = resolver_bd(ruta)
+    if ruta == MEMORIA:
+        nuevo = crear_bd_memoria(
+            create_async_engine, "sqlite+aiosqlite", echo=echo, poolclass=AsyncAdaptedQueuePool
+        )
+    elif "://" in ruta:
+        nuevo = create_async_engine(make_url(ruta).set(drivername="sqlite+aiosqlite"), echo=echo)
+    else:
+        nuevo = create_async_engine(URL.create("sqlite+aiosqlite", database=ruta), echo=echo)
+    instalar_perfil(nuevo.sync_engine, perfil)
+    return nuevo
+
+
+class AsyncTaskManager(Validaciones):
+    """
+    Versión asyncio de TaskManager (HU-001 a HU-011) con las mismas reglas
+    y mensajes de error.
+
+    Cada instancia guarda su propio usuario_activo; un front-end asíncrono
+    crea una instancia por sesión de usuario y todas comparten el mismo
+    engine, que es quien mantiene el pool de conexiones.
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self.usuario_activo: Optional[Usuario] = None
+        self.engine = engine or crear_engine_async()
+        # expire_on_commit=False: los objetos retornados siguen legibles
+        # sin un refresh (que en asyncio sería otra ida a la BD)
+        self._Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def _materias_del_usuario(self):
+        """Subconsulta con los IDs de materia del usuario activo."""
+        return select(Materia.idMateria).where(
+            Materia.usuario_id == self.usuario_activo.idUsuario
+        )
+
+    @staticmethod
+    async def _buscar_tarea_con_propietario(session, tarea_id: int):
+        """Retorna (estado, usuario_id) de la tarea, o None si no existe."""
+        return (await session.execute(
+            select(Tarea.estado, Tarea.usuario_id).where(Tarea.idTarea == tarea_id)
+        )).first()
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-001: Crear Usuario
+    # ──────────────────────────────────────────────────────────────
+
+    async def crear_usuario(self, nombre: str, correo: str) -> Usuario:
+        """
+        Crea un nuevo usuario con validaciones completas.
+
+        Raises:
+            ValueError: Si el límite de 5 usuarios se alcanzó, nombre/correo
+                        inválidos, o correo duplicado.
+        """
+        nombre = self._validar_nombre_usuario(nombre)
+        correo = self._validar_correo(correo)
+
+        async with self._Session() as session:
+            try:
+                count = await session.scalar(select(func.count()).select_from(Usuario))
+                if count >= 5:
+                    raise ValueError("Límite de usuarios alcanzado (máximo 5)")
+
+                existente = await session.scalar(select(Usuario).filter_by(correo=correo))
+                if existente:
+                    raise ValueError(f"El correo '{correo}' ya está registrado")
+
+                usuario = Usuario(nombre=nombre, correo=correo, fecha_creacion=date.today())
+                session.add(usuario)
+                await session.commit()
+                return usuario
+
+            except IntegrityError:
+                await session.rollback()
+                raise ValueError("El correo ya está registrado (error de concurrencia)")
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-002: Seleccionar Usuario
+    # ──────────────────────────────────────────────────────────────
+
+    async def listar_usuarios(self) -> list:
+        """Retorna todos los usuarios registrados."""
+        async with self._Session() as session:
+            return list(await session.scalars(select(Usuario)))
+
+    async def seleccionar_usuario(self, id_usuario: int) -> Optional[Usuario]:
+        """
+        Selecciona un usuario por ID y lo asigna como usuario activo.
+
+        Raises:
+            ValueError: Si no hay usuarios registrados o el ID es <= 0.
+        Returns:
+            Usuario encontrado, o None si el ID no existe.
+        """
+        async with self._Session() as session:
+            count = await session.scalar(select(func.count()).select_from(Usuario))
+            if count == 0:
+                raise ValueError("No hay usuarios registrados")
+
+            if id_usuario <= 0:
+                raise ValueError("El ID del usuario debe ser mayor a 0")
+
+            usuario = await session.get(Usuario, id_usuario)
+            if usuario:
+                self.usuario_activo = usuario
+            return usuario
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-003: Crear Materia
+    # ──────────────────────────────────────────────────────────────
+
+    async def crear_materia(self, nombre: str, color: str) -> Materia:
+        """
+        Crea una materia para el usuario activo.
+
+        Raises:
+            ValueError: Si no hay usuario activo, nombre/color inválidos,
+                        o nombre duplicado para el mismo usuario.
+        """
+        self._validar_usuario_activo()
+        nombre = self._validar_nombre_materia(nombre)
+        self._validar_color_hex(color)
+
+        async with self._Session() as session:
+            try:
+                duplicado = await session.scalar(select(Materia).filter_by(
+                    nombre=nombre,
+                    usuario_id=self.usuario_activo.idUsuario
+                ))
+                if duplicado:
+                    raise ValueError(f"Ya existe una materia llamada '{nombre}' para este usuario")
+
+                materia = Materia(
+                    nombre=nombre,
+                    color=color,
+                    usuario_id=self.usuario_activo.idUsuario
+                )
+                session.add(materia)
+                await session.commit()
+                return materia
+
+            except IntegrityError:
+                await session.rollback()
+                raise ValueError("Ya existe una materia con ese nombre para este usuario")
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-004: Crear Tarea
+    # ──────────────────────────────────────────────────────────────
+
+    async def crear_tarea(
+        self,
+        titulo: str,
+        descripcion: str,
+        prioridad: Prioridad,
+        fecha_entrega: date,
+        materia_id: int
+    ) -> Tarea:
+        """
+        Crea una tarea asociada a una materia del usuario activo.
+
+        Raises:
+            ValueError: Si no hay usuario activo, materia inválida/ajena,
+                        título/descripción/fecha/prioridad inválidos.
+        """
+        self._validar_usuario_activo()
+        titulo = self._validar_datos_tarea(titulo, descripcion, prioridad, fecha_entrega)
+
+        async with self._Session() as session:
+            materia = await session.get(Materia, materia_id)
+            if not materia:
+                raise ValueError("La materia no existe")
+            if materia.usuario_id != self.usuario_activo.idUsuario:
+                raise ValueError("No puede crear una tarea en una materia de otro usuario")
+
+            tarea = Tarea(
+                titulo=titulo,
+                descripcion=descripcion,
+                materia_id=materia_id,
+                usuario_id=materia.usuario_id,
+                prioridad=prioridad,
+                fechaEntrega=fecha_entrega,
+                estado=EstadoTarea.Pendiente
+            )
+            session.add(tarea)
+            await session.commit()
+            return tarea
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-005: Marcar / Desmarcar Tarea
+    # ──────────────────────────────────────────────────────────────
+
+    async def _cambiar_estado_tarea(self, tarea_id: int, nuevo_estado: EstadoTarea) -> Tarea:
+        self._validar_usuario_activo()
+
+        async with self._Session() as session:
+            tarea = (await session.scalars(
+                update(Tarea)
+                .where(
+                    Tarea.idTarea == tarea_id,
+                    Tarea.usuario_id == self.usuario_activo.idUsuario,
+                    Tarea.estado != nuevo_estado
+                )
+                .values(estado=nuevo_estado)
+                .returning(Tarea)
+                .execution_options(synchronize_session=False)
+            )).one_or_none()
+
+            if tarea is None:
+                fila = await self._buscar_tarea_con_propietario(session, tarea_id)
+                if not fila:
+                    raise ValueError("La tarea no existe")
+                if fila.usuario_id != self.usuario_activo.idUsuario:
+                    raise ValueError("No puede modificar una tarea de otro usuario")
+                if nuevo_estado == EstadoTarea.Completada:
+                    raise ValueError("La tarea ya está completada")
+                else:
+                    raise ValueError("La tarea ya está pendiente")
+
+            await session.commit()
+            return tarea
+
+    async def marcar_tarea(self, tarea_id: int) -> Tarea:
+        return await self._cambiar_estado_tarea(tarea_id, EstadoTarea.Completada)
+
+    async def desmarcar_tarea(self, tarea_id: int) -> Tarea:
+        return await self._cambiar_estado_tarea(tarea_id, EstadoTarea.Pendiente)
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-006: Editar Usuario
+    # ──────────────────────────────────────────────────────────────
+
+    async def editar_usuario(
+        self,
+        id_usuario: int,
+        nuevo_nombre: Optional[str] = None,
+        nuevo_correo: Optional[str] = None
+    ) -> Usuario:
+        """
+        Edita el usuario activo. Solo puede editar su propio usuario.
+
+        Raises:
+            ValueError: Si no hay usuario activo, intenta editar otro usuario,
+                        o nombre/correo inválidos o duplicados.
+        """
+        self._validar_usuario_activo()
+
+        if id_usuario != self.usuario_activo.idUsuario:
+            raise ValueError("Solo puede editar su propio usuario")
+
+        if nuevo_nombre is not None:
+            nuevo_nombre = self._validar_nombre_usuario(nuevo_nombre)
+        if nuevo_correo is not None:
+            nuevo_correo = self._validar_correo(nuevo_correo)
+
+        async with self._Session() as session:
+            try:
+                usuario = await session.get(Usuario, id_usuario)
+                if not usuario:
+                    raise ValueError("El usuario no existe")
+
+                if nuevo_nombre is not None:
+                    usuario.nombre = nuevo_nombre
+
+                if nuevo_correo is not None:
+                    existente = await session.scalar(select(Usuario).where(
+                        Usuario.correo == nuevo_correo,
+                        Usuario.idUsuario != id_usuario
+                    ))
+                    if existente:
+                        raise ValueError(f"El correo '{nuevo_correo}' ya está registrado")
+                    usuario.correo = nuevo_correo
+
+                await session.commit()
+                self.usuario_activo = usuario
+                return usuario
+
+            except IntegrityError:
+                await session.rollback()
+                raise ValueError("El correo ya está registrado")
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-007: Eliminar Usuario
+    # ──────────────────────────────────────────────────────────────
+
+    async def eliminar_usuario(self, id_usuario: int) -> bool:
+        """
+        Elimina el usuario activo. Solo puede eliminar su propio usuario.
+        Limpia self.usuario_activo al finalizar.
+
+        Raises:
+            TypeError: Si el ID no es un entero.
+            ValueError: Si no hay usuario activo, intenta eliminar otro usuario,
+                        tiene materias asociadas, o el usuario no existe.
+        """
+        if not isinstance(id_usuario, int):
+            raise TypeError("El ID debe ser un número entero")
+
+        self._validar_usuario_activo()
+
+        if id_usuario != self.usuario_activo.idUsuario:
+            raise ValueError("Solo puede eliminar su propio usuario")
+
+        async with self._Session() as session:
+            usuario = await session.get(Usuario, id_usuario)
+            if not usuario:
+                raise ValueError(f"El usuario con ID {id_usuario} no existe")
+
+            tiene_materias = await session.scalar(
+                select(Materia.idMateria).where(Materia.usuario_id == id_usuario).limit(1)
+            )
+            if tiene_materias is not None:
+                raise ValueError("Debe eliminar primero todas las materias del usuario")
+
+            await session.execute(delete(Importacion).where(Importacion.usuario_id == id_usuario))
+            await session.delete(usuario)
+            await session.commit()
+            self.usuario_activo = None
+            return True
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-008: Editar Materia
+    # ──────────────────────────────────────────────────────────────
+
+    async def editar_materia(
+        self,
+        id_materia: int,
+        nuevo_nombre: Optional[str] = None,
+        nuevo_color: Optional[str] = None
+    ) -> Materia:
+        """
+        Edita una materia del usuario activo.
+
+        Raises:
+            ValueError: Si no hay usuario activo, la materia no existe o
+                        pertenece a otro usuario, nombre/color inválidos o duplicados.
+        """
+        self._validar_usuario_activo()
+
+        if nuevo_nombre is not None:
+            nuevo_nombre = self._validar_nombre_materia(nuevo_nombre)
+        if nuevo_color is not None:
+            self._validar_color_hex(nuevo_color)
+
+        async with self._Session() as session:
+            materia = await session.get(Materia, id_materia)
+            if not materia:
+                raise ValueError("La materia no existe")
+            if materia.usuario_id != self.usuario_activo.idUsuario:
+                raise ValueError("No puede editar una materia de otro usuario")
+
+            if nuevo_nombre is not None:
+                duplicado = await session.scalar(select(Materia).where(
+                    Materia.nombre == nuevo_nombre,
+                    Materia.usuario_id == self.usuario_activo.idUsuario,
+                    Materia.idMateria != id_materia
+                ))
+                if duplicado:
+                    raise ValueError(f"Ya existe una materia llamada '{nuevo_nombre}' para este usuario")
+                materia.nombre = nuevo_nombre
+
+            if nuevo_color is not None:
+                materia.color = nuevo_color
+
+            await session.commit()
+            return materia
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-009: Editar Tarea
+    # ──────────────────────────────────────────────────────────────
+
+    async def editar_tarea(
+        self,
+        id_tarea: int,
+        nuevo_titulo: Optional[str] = None,
+        nueva_descripcion: Optional[str] = None,
+        nueva_prioridad: Optional[Prioridad] = None,
+        nueva_fecha_entrega: Optional[date] = None,
+        nueva_materia_id: Optional[int] = None
+    ) -> Tarea:
+        """
+        Edita una tarea del usuario activo.
+
+        Raises:
+            ValueError: Si no hay usuario activo, la tarea no existe o es ajena,
+                        validaciones de campos, o nueva materia es ajena.
+        """
+        self._validar_usuario_activo()
+        nuevo_titulo = self._validar_cambios_tarea(
+            nuevo_titulo, nueva_descripcion, nueva_prioridad, nueva_fecha_entrega
+        )
+
+        valores = {}
+        if nuevo_titulo is not None:
+            valores["titulo"] = nuevo_titulo
+        if nueva_descripcion is not None:
+            valores["descripcion"] = nueva_descripcion
+        if nueva_prioridad is not None:
+            valores["prioridad"] = nueva_prioridad
+        if nueva_fecha_entrega is not None:
+            valores["fechaEntrega"] = nueva_fecha_entrega
+
+        condiciones = [
+            Tarea.idTarea == id_tarea,
+            Tarea.usuario_id == self.usuario_activo.idUsuario
+        ]
+        if nueva_materia_id is not None:
+            valores["materia_id"] = nueva_materia_id
+            valores["usuario_id"] = (
+                select(Materia.usuario_id)
+                .where(Materia.idMateria == nueva_materia_id)
+                .scalar_subquery()
+            )
+            condiciones.append(
+                self._materias_del_usuario()
+                .where(Materia.idMateria == nueva_materia_id)
+                .exists()
+            )
+
+        if valores:
+            sentencia = (
+                update(Tarea)
+                .where(*condiciones)
+                .values(**valores)
+                .returning(Tarea)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            sentencia = select(Tarea).where(*condiciones)
+
+        async with self._Session() as session:
+            tarea = (await session.scalars(sentencia)).one_or_none()
+
+            if tarea is None:
+                fila = await self._buscar_tarea_con_propietario(session, id_tarea)
+                if not fila:
+                    raise ValueError("La tarea no existe")
+                if fila.usuario_id != self.usuario_activo.idUsuario:
+                    raise ValueError("No puede editar una tarea de otro usuario")
+                propietario = await session.scalar(
+                    select(Materia.usuario_id).where(Materia.idMateria == nueva_materia_id)
+                )
+                if propietario is None:
+                    raise ValueError("La nueva materia no existe")
+                raise ValueError("No puede mover una tarea a una materia de otro usuario")
+
+            await session.commit()
+            return tarea
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-010: Eliminar Materia
+    # ──────────────────────────────────────────────────────────────
+
+    async def seleccionar_materia(self, materia_id: int) -> Optional[Materia]:
+        """Retorna una materia por ID, o None si no existe."""
+        async with self._Session() as session:
+            return await session.get(Materia, materia_id)
+
+    async def eliminar_materia(self, materia_id: int) -> bool:
+        """
+        Elimina una materia del usuario activo (y sus tareas en cascada).
+
+        Raises:
+            ValueError: Si no hay usuario activo, la materia no existe o es ajena.
+        """
+        self._validar_usuario_activo()
+
+        async with self._Session() as session:
+            materia = await session.get(Materia, materia_id)
+            if not materia:
+                raise ValueError("La materia no existe")
+            if materia.usuario_id != self.usuario_activo.idUsuario:
+                raise ValueError("No puede eliminar una materia de otro usuario")
+
+            # Cascada explícita en dos DELETE en lugar de cargar cada tarea
+            await session.execute(delete(Tarea).where(Tarea.materia_id == materia_id))
+            await session.execute(delete(Materia).where(Materia.idMateria == materia_id))
+            await session.commit()
+            return True
+
+    # ──────────────────────────────────────────────────────────────
+    # HU-011: Eliminar Tarea
+    # ──────────────────────────────────────────────────────────────
+
+    async def seleccionar_tarea(self, tarea_id: int) -> Optional[Tarea]:
+        """Retorna una tarea por ID, o None si no existe."""
+        async with self._Session() as session:
+            return await session.get(Tarea, tarea_id)
+
+    async def eliminar_tarea(self, id_tarea: int) -> bool:
+        """
+        Elimina una tarea del usuario activo.
+
+        Raises:
+            TypeError: Si el ID no es un entero.
+            ValueError: Si no hay usuario activo, la tarea no existe o es ajena.
+        """
+        if not isinstance(id_tarea, int):
+            raise TypeError("El ID de la tarea debe ser un número entero")
+
+        self._validar_usuario_activo()
+
+        async with self._Session() as session:
+            eliminada = (await session.execute(
+                delete(Tarea)
+                .where(
+                    Tarea.idTarea == id_tarea,
+                    Tarea.usuario_id == self.usuario_activo.idUsuario
+                )
+                .returning(Tarea.idTarea)
+                .execution_options(synchronize_session=False)
+            )).first()
+
+            if eliminada is None:
+                if not await self._buscar_tarea_con_propietario(session, id_tarea):
+                    raise ValueError(f"La tarea con id {id_tarea} no existe")
+                raise ValueError("No puede eliminar una tarea de otro usuario")
+
+            await session.commit()
+            return True
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Caché LRU en memoria con contadores de aciertos y fallos.
+
+    Solo guarda lo que se le entrega; no conoce la BD. Quien la usa es
+    responsable de invalidar las claves cuando escribe. Con activa=False
+    todas las operaciones son no-ops y obtener() siempre retorna None.
+    """
+
+    def __init__(self, capacidad: int = 256, activa: bool = True):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la caché debe ser mayor a 0")
+        self.capacidad = capacidad
+        self.activa = activa
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        if not self.activa:
+            return None
+        with self._lock:
+            valor = self._datos.get(clave)
+            if valor is None:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave: Hashable, valor: Any):
+        if not self.activa:
+            return
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, *claves: Hashable):
+        with self._lock:
+            for clave in claves:
+                self._datos.pop(clave, None)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "activa": self.activa,
+                "capacidad": self.capacidad,
+                "tamano": len(self._datos),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+            }
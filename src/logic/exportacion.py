@@ -0,0 +1,118 @@
+"""
+Exportación de los datos de un usuario a CSV o JSON Lines.
+
+Las filas se leen en bloques con yield_per y se escriben a medida que
+llegan, así que la memoria usada no depende de la cantidad de tareas.
+
+Uso por línea de comandos:
+    python -m src.logic.exportacion --usuario ID --formato csv|jsonl --destino RUTA
+
+Con CSV, RUTA es un directorio donde se escriben usuarios.csv,
+materias.csv y tareas.csv; con JSONL es un archivo ("-" para stdout)
+donde cada línea lleva un campo "tipo" (usuario, materia o tarea).
+"""
+import argparse
+import csv
+import enum
+import json
+import os
+import sys
+from datetime import date
+from sqlalchemy import select
+from src.model.modelo import Usuario, Materia, Tarea
+
+FORMATOS = ("csv", "jsonl")
+
+# Filas por bloque leído de SQLite
+TAMANO_BLOQUE = 1000
+
+
+def _valor(valor):
+    if isinstance(valor, enum.Enum):
+        return valor.value
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return valor
+
+
+def _consultas(usuario_id: int) -> list:
+    """
+    (tipo, archivo CSV, columnas, condición, orden) de cada entidad del
+    usuario. El orden sigue a los índices por usuario para que SQLite no
+    tenga que ordenar (y retener) todas las filas antes de entregarlas.
+    """
+    return [
+        ("usuario", "usuarios.csv", Usuario.__table__.columns,
+         Usuario.idUsuario == usuario_id, (Usuario.idUsuario,)),
+        ("materia", "materias.csv", Materia.__table__.columns,
+         Materia.usuario_id == usuario_id, (Materia.nombre, Materia.idMateria)),
+        ("tarea", "tareas.csv", Tarea.__table__.columns,
+         Tarea.usuario_id == usuario_id, (Tarea.fechaEntrega, Tarea.idTarea)),
+    ]
+
+
+def _filas(session, columnas, condicion, orden):
+    """Itera las filas como tuplas de valores serializables, por bloques."""
+    consulta = (
+        select(*columnas)
+        .where(condicion)
+        .order_by(*orden)
+        .execution_options(yield_per=TAMANO_BLOQUE)
+    )
+    for fila in session.execute(consulta):
+        yield tuple(_valor(v) for v in fila)
+
+
+def exportar_csv(session, usuario_id: int, directorio: str) -> dict:
+    """Escribe un CSV por entidad en `directorio`. Retorna las filas por tipo."""
+    os.makedirs(directorio, exist_ok=True)
+    conteos = {}
+    for tipo, archivo, columnas, condicion, orden in _consultas(usuario_id):
+        conteos[tipo] = 0
+        with open(os.path.join(directorio, archivo), "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow([c.name for c in columnas])
+            for fila in _filas(session, columnas, condicion, orden):
+                escritor.writerow(fila)
+                conteos[tipo] += 1
+    return conteos
+
+
+def exportar_jsonl(session, usuario_id: int, salida) -> dict:
+    """Escribe una línea JSON por fila en el archivo abierto `salida`."""
+    conteos = {}
+    for tipo, _, columnas, condicion, orden in _consultas(usuario_id):
+        conteos[tipo] = 0
+        nombres = [c.name for c in columnas]
+        for fila in _filas(session, columnas, condicion, orden):
+            registro = {"tipo": tipo, **dict(zip(nombres, fila))}
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            conteos[tipo] += 1
+    return conteos
+
+
+def main(argv=None):
+    from src.logic.task_manager import TaskManager
+
+    parser = argparse.ArgumentParser(description="Exporta los datos de un usuario.")
+    parser.add_argument("--usuario", type=int, required=True, help="ID del usuario")
+    parser.add_argument("--formato", choices=FORMATOS, default="jsonl")
+    parser.add_argument("--destino", required=True,
+                        help='directorio (csv) o archivo (jsonl, "-" para stdout)')
+    args = parser.parse_args(argv)
+
+    tm = TaskManager(cache=False)
+    try:
+        if not tm.seleccionar_usuario(args.usuario):
+            raise ValueError("El usuario no existe")
+        destino = sys.stdout if args.destino == "-" else args.destino
+        conteos = tm.exportar(args.formato, destino)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(conteos), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
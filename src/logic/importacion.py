@@ -0,0 +1,277 @@
+"""
+Importación de tareas desde CSV o JSON Lines por bloques.
+
+Cada registro pasa por las mismas validaciones que crear_tarea; los
+nombres de materia se resuelven a IDs con una consulta por bloque, y cada
+bloque se inserta y se confirma junto con el progreso (tabla
+importaciones). Si la importación se interrumpe, la siguiente llamada
+sobre el mismo archivo continúa después del último bloque confirmado.
+Los registros rechazados se escriben con su motivo en un archivo aparte.
+
+Columnas / claves de cada registro: titulo, descripcion, prioridad
+(Baja, Media o Alta), fechaEntrega (AAAA-MM-DD; también fecha_entrega),
+materia (nombre de una materia del usuario) y, opcional, estado. En
+JSONL se ignoran las líneas cuyo "tipo" no sea "tarea".
+
+Uso por línea de comandos:
+    python -m src.logic.importacion --usuario ID [--formato csv|jsonl]
+                                    [--bloque N] [--rechazos RUTA] ARCHIVO
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date
+from itertools import islice
+from typing import Iterator, Optional
+from sqlalchemy import insert, select
+from src.logic.validaciones import Validaciones
+from src.model.modelo import Importacion, Materia, Tarea, Prioridad, EstadoTarea
+
+FORMATOS = ("csv", "jsonl")
+
+# Registros por transacción
+TAMANO_BLOQUE = 1000
+
+# Nombres de materia por consulta IN
+_TAMANO_BLOQUE_IN = 500
+
+# Campos que, si vienen, deben ser texto (en JSONL pueden ser de cualquier tipo)
+_CAMPOS_TEXTO = ("titulo", "descripcion", "prioridad", "fechaEntrega", "fecha_entrega", "estado", "materia")
+
+
+def detectar_formato(ruta: str) -> str:
+    """Formato según la extensión del archivo."""
+    extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+    if extension == "json":
+        extension = "jsonl"
+    if extension not in FORMATOS:
+        raise ValueError(f"No se reconoce el formato de '{ruta}' (use csv o jsonl)")
+    return extension
+
+
+def leer_registros(ruta: str, formato: str) -> Iterator[Optional[dict]]:
+    """
+    Genera un dict por registro del archivo, en orden. Una línea JSONL
+    que no es un objeto JSON genera None (se rechaza al validar).
+    """
+    with open(ruta, newline="" if formato == "csv" else None, encoding="utf-8") as f:
+        if formato == "csv":
+            yield from csv.DictReader(f)
+            return
+        for linea in f:
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                registro = None
+            if isinstance(registro, dict) and registro.get("tipo", "tarea") != "tarea":
+                continue
+            yield registro if isinstance(registro, dict) else None
+
+
+def _validar_registro(registro: Optional[dict]) -> dict:
+    """
+    Convierte un registro del archivo en los valores de una tarea.
+    La materia queda como nombre; se resuelve después, por bloque.
+
+    Raises:
+        ValueError: Con el motivo del rechazo.
+    """
+    if registro is None:
+        raise ValueError("La línea no es un objeto JSON válido")
+    for campo in _CAMPOS_TEXTO:
+        valor = registro.get(campo)
+        if valor is not None and not isinstance(valor, str):
+            raise ValueError(f"El campo '{campo}' debe ser texto")
+
+    try:
+        prioridad = Prioridad((registro.get("prioridad") or "").strip())
+    except ValueError:
+        raise ValueError("La prioridad debe ser Baja, Media o Alta")
+
+    fecha = registro.get("fechaEntrega") or registro.get("fecha_entrega")
+    try:
+        fecha_entrega = date.fromisoformat(fecha.strip())
+    except (AttributeError, ValueError):
+        raise ValueError("La fecha de entrega es inválida")
+
+    estado = (registro.get("estado") or "").strip() or EstadoTarea.Pendiente.value
+    try:
+        estado = EstadoTarea(estado)
+    except ValueError:
+        raise ValueError("El estado debe ser Pendiente o Completada")
+
+    descripcion = registro.get("descripcion") or None
+    titulo = Validaciones._validar_datos_tarea(
+        registro.get("titulo") or "", descripcion, prioridad, fecha_entrega
+    )
+
+    materia = (registro.get("materia") or "").strip()
+    if not materia:
+        raise ValueError("Falta el nombre de la materia")
+
+    return {
+        "titulo": titulo,
+        "descripcion": descripcion,
+        "prioridad": prioridad,
+        "fechaEntrega": fecha_entrega,
+        "estado": estado,
+        "materia": materia,
+    }
+
+
+def _resolver_materias(session, usuario_id: int, nombres: set, ids: dict):
+    """Agrega a `ids` los IDs de las materias del usuario que falten en él."""
+    faltantes = [n for n in nombres if n not in ids]
+    for inicio in range(0, len(faltantes), _TAMANO_BLOQUE_IN):
+        bloque = faltantes[inicio:inicio + _TAMANO_BLOQUE_IN]
+        ids.update(session.execute(
+            select(Materia.nombre, Materia.idMateria)
+            .where(Materia.usuario_id == usuario_id, Materia.nombre.in_(bloque))
+        ).all())
+
+
+def _progreso(session, usuario_id: int, archivo: str, reanudar: bool) -> Importacion:
+    """La importación sin terminar del archivo, o una nueva."""
+    progreso = None
+    if reanudar:
+        progreso = session.scalars(
+            select(Importacion)
+            .where(
+                Importacion.usuario_id == usuario_id,
+                Importacion.archivo == archivo,
+                Importacion.completada.is_(False)
+            )
+            .order_by(Importacion.idImportacion.desc())
+            .limit(1)
+        ).first()
+    if progreso is None:
+        progreso = Importacion(
+            usuario_id=usuario_id, archivo=archivo, registros=0, importadas=0, rechazadas=0
+        )
+        session.add(progreso)
+        session.commit()
+    return progreso
+
+
+def importar_tareas(
+    session,
+    usuario_id: int,
+    ruta: str,
+    formato: Optional[str] = None,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    rechazos: Optional[str] = None,
+    reanudar: bool = True
+) -> dict:
+    """
+    Importa las tareas de `ruta` para el usuario, confirmando cada
+    `tamano_bloque` registros. Los rechazos se escriben como JSONL en
+    `rechazos` (por defecto, ruta + ".rechazos.jsonl").
+
+    Returns:
+        Totales de la importación (incluye los bloques de corridas
+        anteriores si se reanudó): registros, importadas, rechazadas y
+        reanudada_desde (registros que ya estaban confirmados).
+    """
+    formato = formato or detectar_formato(ruta)
+    archivo = os.path.abspath(ruta)
+    rechazos = rechazos or ruta + ".rechazos.jsonl"
+
+    progreso = _progreso(session, usuario_id, archivo, reanudar)
+    inicio = progreso.registros
+    modo = "a" if inicio else "w"
+    ids_materia = {}
+
+    registros = islice(leer_registros(ruta, formato), inicio, None)
+    with open(rechazos, modo, encoding="utf-8") as salida_rechazos:
+        numero = inicio
+        while True:
+            bloque = list(islice(registros, tamano_bloque))
+            if not bloque:
+                break
+
+            validas, rechazadas = [], []
+            for registro in bloque:
+                numero += 1
+                try:
+                    validas.append((numero, registro, _validar_registro(registro)))
+                except ValueError as e:
+                    rechazadas.append({"registro": numero, "error": str(e), "datos": registro})
+
+            _resolver_materias(
+                session, usuario_id, {valores["materia"] for _, _, valores in validas}, ids_materia
+            )
+            filas = []
+            for n, registro, valores in validas:
+                materia = valores.pop("materia")
+                if materia not in ids_materia:
+                    rechazadas.append({
+                        "registro": n, "error": f"La materia '{materia}' no existe", "datos": registro
+                    })
+                    continue
+                valores["materia_id"] = ids_materia[materia]
+                valores["usuario_id"] = usuario_id
+                filas.append(valores)
+
+            try:
+                if filas:
+                    session.execute(insert(Tarea), filas)
+                progreso.registros += len(bloque)
+                progreso.importadas += len(filas)
+                progreso.rechazadas += len(rechazadas)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+            rechazadas.sort(key=lambda r: r["registro"])
+            for rechazo in rechazadas:
+                salida_rechazos.write(json.dumps(rechazo, ensure_ascii=False, default=str) + "\n")
+            salida_rechazos.flush()
+
+    progreso.completada = True
+    session.commit()
+    return {
+        "registros": progreso.registros,
+        "importadas": progreso.importadas,
+        "rechazadas": progreso.rechazadas,
+        "reanudada_desde": inicio,
+    }
+
+
+def main(argv=None):
+    from src.logic.task_manager import TaskManager
+
+    parser = argparse.ArgumentParser(description="Importa tareas de un usuario desde CSV o JSONL.")
+    parser.add_argument("archivo")
+    parser.add_argument("--usuario", type=int, required=True, help="ID del usuario")
+    parser.add_argument("--formato", choices=FORMATOS, default=None,
+                        help="por defecto, según la extensión del archivo")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE,
+                        help="registros por transacción")
+    parser.add_argument("--rechazos", default=None,
+                        help='archivo de rechazos (por defecto, ARCHIVO + ".rechazos.jsonl")')
+    parser.add_argument("--desde-cero", action="store_true",
+                        help="no reanudar una importación anterior del mismo archivo")
+    args = parser.parse_args(argv)
+
+    tm = TaskManager(cache=False)
+    try:
+        if not tm.seleccionar_usuario(args.usuario):
+            raise ValueError("El usuario no existe")
+        resultado = tm.importar_tareas(
+            args.archivo, formato=args.formato, tamano_bloque=args.bloque,
+            rechazos=args.rechazos, reanudar=not args.desde_cero
+        )
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(resultado), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import functools
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Límites superiores (ms) de los cubos del histograma de tiempos
+LIMITES_HISTOGRAMA_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class _Marco:
+    """Llamada instrumentada en curso dentro de un hilo."""
+    __slots__ = ("sentencias", "tiempo_sql")
+
+    def __init__(self):
+        self.sentencias = 0
+        self.tiempo_sql = 0.0
+
+
+class Instrumentacion:
+    """
+    Contadores por método: llamadas, errores, histograma de tiempos,
+    sentencias SQL y tiempo dentro de SQLite.
+
+    Las sentencias se cuentan con los eventos before/after_cursor_execute,
+    que solo se registran mientras la instrumentación está activa, y se
+    atribuyen a las llamadas instrumentadas en curso del mismo hilo.
+    Desactivada, el único costo es el chequeo de `activa` en el decorador.
+    """
+
+    def __init__(self):
+        self.activa = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metodos = {}
+
+    # ── Activación ────────────────────────────────────────────────
+
+    def activar(self):
+        if self.activa:
+            return
+        event.listen(Engine, "before_cursor_execute", self._antes_de_ejecutar)
+        event.listen(Engine, "after_cursor_execute", self._despues_de_ejecutar)
+        self.activa = True
+
+    def desactivar(self):
+        if not self.activa:
+            return
+        self.activa = False
+        event.remove(Engine, "before_cursor_execute", self._antes_de_ejecutar)
+        event.remove(Engine, "after_cursor_execute", self._despues_de_ejecutar)
+
+    # ── Eventos de SQLAlchemy ─────────────────────────────────────
+
+    def _marcos(self) -> list:
+        marcos = getattr(self._local, "marcos", None)
+        if marcos is None:
+            marcos = self._local.marcos = []
+        return marcos
+
+    def _antes_de_ejecutar(self, conn, cursor, sentencia, parametros, context, executemany):
+        if self._marcos():
+            self._local.inicio_sql = time.perf_counter()
+
+    def _despues_de_ejecutar(self, conn, cursor, sentencia, parametros, context, executemany):
+        marcos = self._marcos()
+        if not marcos:
+            return
+        duracion = time.perf_counter() - self._local.inicio_sql
+        for marco in marcos:
+            marco.sentencias += 1
+            marco.tiempo_sql += duracion
+
+    # ── Medición de métodos ───────────────────────────────────────
+
+    def medir(self, nombre: str, funcion, *args, **kwargs):
+        marcos = self._marcos()
+        marco = _Marco()
+        marcos.append(marco)
+        error = False
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            duracion = time.perf_counter() - inicio
+            marcos.pop()
+            self._registrar(nombre, duracion, marco, error)
+
+    def _registrar(self, nombre: str, duracion: float, marco: _Marco, error: bool):
+        ms = duracion * 1000
+        with self._lock:
+            datos = self._metodos.get(nombre)
+            if datos is None:
+                datos = self._metodos[nombre] = {
+                    "llamadas": 0,
+                    "errores": 0,
+                    "tiempo_total_ms": 0.0,
+                    "tiempo_max_ms": 0.0,
+                    "tiempo_sql_ms": 0.0,
+                    "sentencias": 0,
+                    "histograma": [0] * (len(LIMITES_HISTOGRAMA_MS) + 1),
+                }
+            datos["llamadas"] += 1
+            datos["errores"] += error
+            datos["tiempo_total_ms"] += ms
+            datos["tiempo_max_ms"] = max(datos["tiempo_max_ms"], ms)
+            datos["tiempo_sql_ms"] += marco.tiempo_sql * 1000
+            datos["sentencias"] += marco.sentencias
+            cubo = len(LIMITES_HISTOGRAMA_MS)
+            for i, limite in enumerate(LIMITES_HISTOGRAMA_MS):
+                if ms <= limite:
+                    cubo = i
+                    break
+            datos["histograma"][cubo] += 1
+
+    # ── Consulta ──────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        etiquetas = [f"<={limite}" for limite in LIMITES_HISTOGRAMA_MS]
+        etiquetas.append(f">{LIMITES_HISTOGRAMA_MS[-1]}")
+        resultado = {}
+        with self._lock:
+            for nombre, datos in self._metodos.items():
+                llamadas = datos["llamadas"]
+                resultado[nombre] = {
+                    "llamadas": llamadas,
+                    "errores": datos["errores"],
+                    "tiempo_total_ms": datos["tiempo_total_ms"],
+                    "tiempo_medio_ms": datos["tiempo_total_ms"] / llamadas,
+                    "tiempo_max_ms": datos["tiempo_max_ms"],
+                    "tiempo_sql_ms": datos["tiempo_sql_ms"],
+                    "sentencias": datos["sentencias"],
+                    "sentencias_por_llamada": datos["sentencias"] / llamadas,
+                    "histograma_ms": dict(zip(etiquetas, datos["histograma"])),
+                }
+        return resultado
+
+    def reiniciar(self):
+        with self._lock:
+            self._metodos.clear()
+
+
+def instrumentado(metodo):
+    """
+    Decorador para los métodos públicos de TaskManager: si la instancia
+    tiene la instrumentación activa, mide la llamada con su nombre.
+    """
+    nombre = metodo.__name__
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        instrumentacion = self._instrumentacion
+        if not instrumentacion.activa:
+            return metodo(self, *args, **kwargs)
+        return instrumentacion.medir(nombre, metodo, self, *args, **kwargs)
+
+    return envoltura
@@ -0,0 +1,138 @@
+"""
+Reintentos de las escrituras ante "database is locked".
+
+SQLite admite un solo escritor por BD. Los PRAGMA busy_timeout de los
+perfiles hacen que una conexión espere el lock de escritura en vez de
+fallar enseguida, pero si otro proceso lo retiene más que ese tiempo
+(una importación por bloques, un lote grande, un transaccion() largo) la
+escritura falla con OperationalError. PoliticaReintentos repite entonces
+la transacción entera, esperando entre intentos un tiempo aleatorio
+entre 0 y min(espera_maxima, espera_inicial * 2**intento) (backoff
+exponencial con jitter completo, para que los procesos que fallaron
+juntos no vuelvan a chocar juntos).
+
+Un SQLITE_BUSY deja la transacción sin confirmar, así que repetirla no
+duplica escrituras.
+"""
+import functools
+import random
+import sqlite3
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+
+# Códigos primarios de SQLite (el byte bajo de los extendidos, p. ej. BUSY_SNAPSHOT)
+_CODIGOS_BLOQUEO = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def es_bloqueo(error: BaseException) -> bool:
+    """
+    True si `error` es un "database is locked" / "database is busy", ya
+    sea de SQLAlchemy o del driver sqlite3 directamente.
+    """
+    if isinstance(error, OperationalError):
+        error = error.orig
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    codigo = getattr(error, "sqlite_errorcode", None)
+    if codigo is not None:
+        return codigo & 0xFF in _CODIGOS_BLOQUEO
+    mensaje = str(error)
+    return "database is locked" in mensaje or "database is busy" in mensaje
+
+
+class PoliticaReintentos:
+    """
+    Ejecuta una operación hasta `intentos` veces mientras falle por
+    bloqueo, y cuenta los reintentos por nombre de operación.
+    """
+
+    def __init__(
+        self,
+        intentos: int = 8,
+        espera_inicial: float = 0.02,
+        espera_maxima: float = 1.0,
+        semilla: int = None,
+        dormir=time.sleep
+    ):
+        if intentos < 1:
+            raise ValueError("Los intentos deben ser al menos 1")
+        self.intentos = intentos
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self._aleatorio = random.Random(semilla)
+        self._dormir = dormir
+        self._lock = threading.Lock()
+        self._operaciones = {}
+
+    def espera(self, intento: int) -> float:
+        """Segundos a esperar antes del reintento número `intento` + 1."""
+        tope = min(self.espera_maxima, self.espera_inicial * 2 ** intento)
+        with self._lock:
+            return self._aleatorio.uniform(0, tope)
+
+    def ejecutar(self, nombre: str, funcion, *args, **kwargs):
+        """Llama funcion(*args, **kwargs), reintentando si falla por bloqueo."""
+        intento = 0
+        while True:
+            try:
+                return funcion(*args, **kwargs)
+            except (OperationalError, sqlite3.OperationalError) as e:
+                if not es_bloqueo(e):
+                    raise
+                if intento + 1 >= self.intentos:
+                    self._registrar(nombre, agotado=True)
+                    raise
+                espera = self.espera(intento)
+                self._registrar(nombre, espera=espera)
+                self._dormir(espera)
+                intento += 1
+
+    def _registrar(self, nombre: str, espera: float = 0.0, agotado: bool = False):
+        with self._lock:
+            datos = self._operaciones.get(nombre)
+            if datos is None:
+                datos = self._operaciones[nombre] = {
+                    "reintentos": 0, "agotados": 0, "espera_ms": 0.0
+                }
+            if agotado:
+                datos["agotados"] += 1
+            else:
+                datos["reintentos"] += 1
+                datos["espera_ms"] += espera * 1000
+
+    def estadisticas(self) -> dict:
+        """
+        Totales y, por operación, reintentos hechos, operaciones que
+        agotaron los intentos y tiempo total esperado (ms).
+        """
+        with self._lock:
+            por_operacion = {nombre: dict(datos) for nombre, datos in self._operaciones.items()}
+        return {
+            "reintentos": sum(d["reintentos"] for d in por_operacion.values()),
+            "agotados": sum(d["agotados"] for d in por_operacion.values()),
+            "espera_ms": sum(d["espera_ms"] for d in por_operacion.values()),
+            "operaciones": por_operacion,
+        }
+
+    def reiniciar(self):
+        with self._lock:
+            self._operaciones.clear()
+
+
+def reintentable(metodo):
+    """
+    Decorador para los métodos de escritura de TaskManager: repite la
+    llamada completa (sesión nueva incluida) según la política de la
+    instancia. Dentro de transaccion() no reintenta: la transacción ya
+    tiene el lock de escritura y deshacer una operación suelta no sirve.
+    """
+    nombre = metodo.__name__
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if self._conexion.get() is not None:
+            return metodo(self, *args, **kwargs)
+        return self._reintentos.ejecutar(nombre, metodo, self, *args, **kwargs)
+
+    return envoltura
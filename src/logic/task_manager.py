@@ -1,93 +1,380 @@
+import base64
+import json
 import re
-from datetime import date
-from typing import Optional
+import weakref
+from datetime import date, timedelta
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional, Union
+from sqlalchemy import (
+    and_, delete, func, insert, literal, literal_column, or_, select, text, tuple_, update
+)
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
-from src.model.declarative_base import engine
-from src.model.modelo import Usuario, Materia, Tarea, Prioridad, EstadoTarea
+from src.logic import exportacion, importacion
+from src.logic.cache import CacheLRU
+from src.logic.instrumentacion import Instrumentacion, instrumentado
+from src.logic.reintentos import PoliticaReintentos, reintentable
+from src.logic.validaciones import Validaciones
+from src.model import declarative_base
+from src.model.declarative_base import engine_de_lectura
+from src.model.modelo import (
+    Usuario, Materia, Tarea, ResumenTarea, Importacion, Prioridad, EstadoTarea, tareas_fts,
+    RANGO_PRIORIDAD_SQL
+)
+
+# Fábrica de sesiones de los TaskManager creados sin engine. Si nadie la
+# enlaza con Session.configure(bind=...), usa el engine por defecto de
+# declarative_base, que se crea recién cuando un TaskManager lo necesita.
+Session = sessionmaker()
+
+# Límite conservador de parámetros por sentencia IN (...) en SQLite
+_TAMANO_BLOQUE_IN = 500
+
+# Pesos bm25 de (titulo, descripcion): un acierto en el título pesa más
+_PESOS_BUSQUEDA = (10.0, 1.0)
+
+# Criterios de orden admitidos por listar_tareas ("-" delante = descendente)
+_ORDENES_TAREA = {
+    "fechaEntrega": Tarea.fechaEntrega,
+    "titulo": Tarea.titulo,
+    "idTarea": Tarea.idTarea,
+}
+
+# Usuario activo y conexión de la transacción abierta de cada TaskManager.
+# Las ContextVar son de módulo (crearlas por instancia las deja vivas en
+# cada contexto que las tocó); guardan un mapa instancia -> valor.
+_USUARIOS_ACTIVOS = ContextVar("usuarios_activos", default=None)
+_CONEXIONES = ContextVar("conexiones_transaccion", default=None)
+
+
+class _VariablePorInstancia:
+    """Vista de una de las ContextVar de arriba para una sola instancia.
+
+    El mapa se copia en cada set, así los contextos que lo comparten no se
+    ven entre sí, y sus claves son débiles para no retener las instancias.
+    """
+
+    __slots__ = ("_variable", "__weakref__")
+
+    def __init__(self, variable: ContextVar):
+        self._variable = variable
+
+    def get(self):
+        valores = self._variable.get()
+        return None if valores is None else valores.get(self)
+
+    def set(self, valor):
+        """Asigna el valor y devuelve el anterior, para pasarlo a reset."""
+        anterior = self.get()
+        valores = weakref.WeakKeyDictionary(self._variable.get() or {})
+        valores[self] = valor
+        self._variable.set(valores)
+        return anterior
+
+    def reset(self, anterior):
+        self.set(anterior)
+
+
+class TaskManager(Validaciones):
+
+    def __init__(
+        self,
+        cache: bool = True,
+        capacidad_cache: int = 256,
+        instrumentar: bool = False,
+        reintentos: Optional[PoliticaReintentos] = None,
+        engine: Optional[Engine] = None
+    ):
+        # Con engine, la instancia usa esa BD; sin él, la fábrica Session
+        # del módulo (ver TaskManager.engine).
+        self._Session = Session if engine is None else sessionmaker(bind=engine)
+        # El usuario activo y la transacción abierta viven en variables de
+        # contexto: cada hilo (o cada bloque como_usuario) ve los suyos, así
+        # que una misma instancia puede atender a varios usuarios a la vez.
+        self._usuario_activo = _VariablePorInstancia(_USUARIOS_ACTIVOS)
+        self._conexion = _VariablePorInstancia(_CONEXIONES)
+        # Caché de Usuario/Materia por id, correo y (usuario_id, nombre),
+        # compartida entre hilos.
+        # Solo se invalida con las escrituras de esta instancia: si otro
+        # proceso modifica la misma BD, las lecturas pueden ver datos viejos
+        # y conviene crear el TaskManager con cache=False. Las escrituras
+        # comprueban la propiedad en la BD y no dependen de ella.
+        self._cache = CacheLRU(capacidad_cache, activa=cache)
+        self._instrumentacion = Instrumentacion()
+        if instrumentar:
+            self._instrumentacion.activar()
+        # Las escrituras que fallan por "database is locked" (otro proceso
+        # retuvo el lock más que busy_timeout) se repiten con backoff.
+        self._reintentos = reintentos or PoliticaReintentos()
+
+    @property
+    def engine(self) -> Union[Engine, Connection]:
+        """
+        Engine de escritura de la BD con la que trabaja esta instancia, o la
+        conexión a la que se enlazó su fábrica de sesiones (p. ej. la de una
+        prueba que deshace todo al terminar).
+        """
+        bind = self._Session.kw.get("bind")
+        if bind is None:
+            bind = declarative_base.engine
+            self._Session.configure(bind=bind)
+        return bind
+
+    @property
+    def usuario_activo(self) -> Optional[Usuario]:
+        """Usuario con el que actúan los métodos en el contexto actual."""
+        return self._usuario_activo.get()
+
+    @usuario_activo.setter
+    def usuario_activo(self, usuario: Optional[Usuario]):
+        self._usuario_activo.set(usuario)
+
+    @contextmanager
+    def como_usuario(self, id_usuario: int):
+        """
+        Actúa como el usuario `id_usuario` dentro del bloque, sin tocar el
+        usuario activo fuera de él ni el de otros hilos:
 
-Session = sessionmaker(bind=engine)
+            with tm.como_usuario(id_usuario):
+                tm.crear_tarea(...)
 
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        usuario = self._cache.obtener(("usuario", id_usuario))
+        if usuario is None:
+            session = self._sesion_lectura()
+            try:
+                usuario = session.get(Usuario, id_usuario)
+                if usuario is not None:
+                    session.expunge(usuario)
+                    self._cachear_usuario(usuario)
+            finally:
+                session.close()
+        if usuario is None:
+            raise ValueError(f"El usuario con ID {id_usuario} no existe")
+
+        anterior = self._usuario_activo.set(usuario)
+        try:
+            yield usuario
+        finally:
+            self._usuario_activo.reset(anterior)
 
-class TaskManager:
+    # ──────────────────────────────────────────────────────────────
+    # TRANSACCIONES (varias operaciones, un solo commit)
+    # ──────────────────────────────────────────────────────────────
+
+    def _sesion(self):
+        """
+        Sesión para un método público. Fuera de transaccion() es una sesión
+        propia que confirma al hacer commit; dentro, usa la conexión de la
+        transacción y su commit/rollback solo liberan/deshacen un SAVEPOINT.
+        """
+        conexion = self._conexion.get()
+        if conexion is None:
+            return self._Session(bind=self.engine)
+        return self._Session(bind=conexion, join_transaction_mode="create_savepoint")
+
+    def _sesion_lectura(self):
+        """
+        Sesión para un método que solo lee. Fuera de transaccion() usa el
+        engine de solo lectura de la BD, así que los listados y reportes no
+        ocupan las conexiones de escritura; dentro, la de la transacción,
+        para ver sus cambios sin confirmar.
+        """
+        bind = self.engine
+        if self._conexion.get() is None and isinstance(bind, Engine):
+            lectura = engine_de_lectura(bind)
+            if lectura is not None:
+                return self._Session(bind=lectura)
+        return self._sesion()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa las operaciones del bloque en una sola transacción:
 
-    def __init__(self):
-        self.usuario_activo: Optional[Usuario] = None
+            with tm.transaccion():
+                materia = tm.crear_materia("Física", "#FF5733")
+                for fila in filas:
+                    tm.crear_tarea(..., materia_id=materia.idMateria)
+
+        Se confirma una vez al salir del bloque y se deshace entera si sale
+        una excepción. Cada operación corre en su propio SAVEPOINT, así que
+        un error capturado dentro del bloque deshace solo esa operación.
+        Un bloque anidado es un SAVEPOINT de la transacción exterior. La
+        transacción es del hilo que abre el bloque.
+
+        Si la transacción se deshace se vacía la caché, que pudo haber
+        guardado usuarios o materias que ya no existen.
+
+        Si la instancia está enlazada a una conexión con una transacción
+        ya abierta, el bloque es un SAVEPOINT de esa transacción.
+        """
+        actual = self._conexion.get()
+        if actual is None and isinstance(self.engine, Connection):
+            anterior = self._conexion.set(self.engine)
+            try:
+                with self.transaccion():
+                    yield self
+            finally:
+                self._conexion.reset(anterior)
+            return
+        if actual is not None:
+            try:
+                with actual.begin_nested():
+                    yield self
+            except BaseException:
+                self._cache.limpiar()
+                raise
+            return
+
+        conexion = self.engine.connect()
+        # pysqlite abre sus transacciones recién antes del primer INSERT/
+        # UPDATE/DELETE, lo que rompe los SAVEPOINT. En esta conexión se
+        # apaga ese manejo y se abre la transacción a mano con BEGIN
+        # IMMEDIATE: el bloque toma el lock de escritura al empezar (con
+        # busy_timeout y reintentos) en vez de fallar al querer escribir a
+        # mitad de camino; por eso las operaciones de adentro no reintentan.
+        driver = conexion.connection.dbapi_connection
+        nivel_anterior = driver.isolation_level
+        driver.isolation_level = None
+        anterior = self._conexion.set(conexion)
+        try:
+            with conexion.begin():
+                self._reintentos.ejecutar("transaccion", driver.execute, "BEGIN IMMEDIATE")
+                yield self
+        except BaseException:
+            self._cache.limpiar()
+            raise
+        finally:
+            self._conexion.reset(anterior)
+            driver.isolation_level = nivel_anterior
+            conexion.close()
 
     # ──────────────────────────────────────────────────────────────
-    # MÉTODOS PRIVADOS DE VALIDACIÓN
+    # INSTRUMENTACIÓN (tiempos y sentencias SQL por método)
     # ──────────────────────────────────────────────────────────────
 
-    def _validar_usuario_activo(self):
-        if self.usuario_activo is None:
-            raise ValueError("Debe seleccionar un usuario primero")
+    def activar_instrumentacion(self):
+        """Empieza a medir los métodos públicos de esta instancia."""
+        self._instrumentacion.activar()
 
-    @staticmethod
-    def _validar_nombre_usuario(nombre: str) -> str:
-        nombre = nombre.strip()
-        if not nombre:
-            raise ValueError("El nombre no puede estar vacío")
-        if len(nombre) < 3:
-            raise ValueError("El nombre debe tener al menos 3 caracteres")
-        if len(nombre) > 50:
-            raise ValueError("El nombre es muy largo (máximo 50 caracteres)")
-        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$', nombre):
-            raise ValueError(
-                "El nombre solo puede contener letras y espacios, "
-                "sin números ni caracteres especiales"
-            )
-        return nombre
+    def desactivar_instrumentacion(self):
+        """Deja de medir; los datos acumulados se conservan."""
+        self._instrumentacion.desactivar()
 
-    @staticmethod
-    def _validar_correo(correo: str) -> str:
-        correo = correo.strip().lower()
-        if not correo:
-            raise ValueError("El correo no puede estar vacío")
-        if len(correo) > 100:
-            raise ValueError("El correo es muy largo (máximo 100 caracteres)")
-        if ' ' in correo:
-            raise ValueError("El correo no puede contener espacios")
-        if correo.count('@') != 1:
-            raise ValueError("El correo debe contener exactamente un @")
-        if correo.startswith('@'):
-            raise ValueError("El correo no puede iniciar con @")
-        if correo.endswith('.'):
-            raise ValueError("El correo no puede terminar en punto")
-        if not re.match(r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', correo):
-            raise ValueError("El correo tiene un formato inválido")
-        return correo
+    def stats(self) -> dict:
+        """
+        Retorna, por método público llamado con la instrumentación activa:
+        llamadas, errores, tiempos (total/medio/máximo/SQL, en ms), sentencias
+        totales y por llamada, e histograma de tiempos.
+        """
+        return self._instrumentacion.stats()
 
-    @staticmethod
-    def _validar_nombre_materia(nombre: str) -> str:
-        nombre = nombre.strip()
-        if not nombre:
-            raise ValueError("El nombre de la materia no puede estar vacío")
-        if len(nombre) < 3:
-            raise ValueError("El nombre de la materia debe tener al menos 3 caracteres")
-        if len(nombre) > 50:
-            raise ValueError("El nombre de la materia es muy largo (máximo 50 caracteres)")
-        return nombre
+    def reiniciar_stats(self):
+        """Descarta los datos de instrumentación acumulados."""
+        self._instrumentacion.reiniciar()
 
-    @staticmethod
-    def _validar_color_hex(color: str):
-        if not re.match(r'^#[0-9A-Fa-f]{6}$', color):
-            raise ValueError("El color debe ser formato HEX (#RRGGBB)")
+    # ──────────────────────────────────────────────────────────────
+    # REINTENTOS ANTE "database is locked"
+    # ──────────────────────────────────────────────────────────────
+
+    def estadisticas_reintentos(self) -> dict:
+        """
+        Retorna los reintentos por bloqueo de esta instancia: totales y,
+        por método, reintentos, llamadas que agotaron los intentos y
+        tiempo esperado (ms).
+        """
+        return self._reintentos.estadisticas()
+
+    def reiniciar_reintentos(self):
+        """Descarta los contadores de reintentos."""
+        self._reintentos.reiniciar()
+
+    # ──────────────────────────────────────────────────────────────
+    # CACHÉ DE USUARIOS Y MATERIAS
+    # ──────────────────────────────────────────────────────────────
+
+    def estadisticas_cache(self) -> dict:
+        """Retorna aciertos, fallos y ocupación de la caché."""
+        return self._cache.estadisticas()
+
+    def limpiar_cache(self):
+        """Vacía la caché y reinicia sus contadores."""
+        self._cache.limpiar()
+
+    def _cachear_usuario(self, usuario: Usuario):
+        self._cache.guardar(("usuario", usuario.idUsuario), usuario)
+        self._cache.guardar(("correo", usuario.correo), usuario)
+
+    def _invalidar_usuario(self, usuario: Usuario):
+        self._cache.invalidar(("usuario", usuario.idUsuario), ("correo", usuario.correo))
+
+    def _cachear_materia(self, materia: Materia):
+        self._cache.guardar(("materia", materia.idMateria), materia)
+        self._cache.guardar(("materia_nombre", materia.usuario_id, materia.nombre), materia)
+
+    def _invalidar_materia(self, materia: Materia):
+        self._cache.invalidar(
+            ("materia", materia.idMateria),
+            ("materia_nombre", materia.usuario_id, materia.nombre)
+        )
+
+    def _obtener_materia(self, session, materia_id: int) -> Optional[Materia]:
+        """Materia por ID desde la caché o la BD; siempre desligada de la sesión."""
+        materia = self._cache.obtener(("materia", materia_id))
+        if materia is None:
+            materia = session.get(Materia, materia_id)
+            if materia is not None:
+                session.expunge(materia)
+                self._cachear_materia(materia)
+        return materia
+
+    def _explicar_materia_rechazada(self, session, materia_id: int, accion: str):
+        """
+        Lanza el ValueError de una escritura protegida que no afectó a la
+        materia `materia_id`: no existe o es de otro usuario. Lee la BD, no
+        la caché, y descarta la entrada vieja si la materia ya no está.
+        """
+        propietario = session.scalar(
+            select(Materia.usuario_id).where(Materia.idMateria == materia_id)
+        )
+        if propietario is None:
+            vieja = self._cache.obtener(("materia", materia_id))
+            if vieja is not None:
+                self._invalidar_materia(vieja)
+            raise ValueError("La materia no existe")
+        raise ValueError(f"No puede {accion} una materia de otro usuario")
+
+    # ──────────────────────────────────────────────────────────────
+    # MÉTODOS PRIVADOS DE CONSULTA
+    # ──────────────────────────────────────────────────────────────
+
+    def _materias_del_usuario(self):
+        """Subconsulta con los IDs de materia del usuario activo."""
+        return select(Materia.idMateria).where(
+            Materia.usuario_id == self.usuario_activo.idUsuario
+        )
 
     @staticmethod
-    def _validar_titulo_tarea(titulo: str) -> str:
-        titulo = titulo.strip()
-        if not titulo:
-            raise ValueError("El título de la tarea no puede estar vacío")
-        if len(titulo) < 3:
-            raise ValueError("El título de la tarea debe tener al menos 3 caracteres")
-        if len(titulo) > 100:
-            raise ValueError("El título de la tarea es muy largo (máximo 100 caracteres)")
-        return titulo
+    def _buscar_tarea_con_propietario(session, tarea_id: int):
+        """
+        Retorna (estado, usuario_id) de la tarea, o None si no existe.
+        Solo se usa para explicar por qué falló una sentencia protegida.
+        """
+        return session.execute(
+            select(Tarea.estado, Tarea.usuario_id).where(Tarea.idTarea == tarea_id)
+        ).first()
 
     # ──────────────────────────────────────────────────────────────
     # HU-001: Crear Usuario
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def crear_usuario(self, nombre: str, correo: str) -> Usuario:
         """
         Crea un nuevo usuario con validaciones completas.
@@ -99,13 +386,16 @@ class TaskManager:
         nombre = self._validar_nombre_usuario(nombre)
         correo = self._validar_correo(correo)
 
-        session = Session()
+        session = self._sesion()
         try:
             count = session.query(Usuario).count()
             if count >= 5:
                 raise ValueError("Límite de usuarios alcanzado (máximo 5)")
 
-            existente = session.query(Usuario).filter_by(correo=correo).first()
+            existente = (
+                self._cache.obtener(("correo", correo))
+                or session.query(Usuario).filter_by(correo=correo).first()
+            )
             if existente:
                 raise ValueError(f"El correo '{correo}' ya está registrado")
 
@@ -118,6 +408,7 @@ class TaskManager:
             session.commit()
             session.refresh(usuario)
             session.expunge(usuario)
+            self._cachear_usuario(usuario)
             return usuario
 
         except IntegrityError:
@@ -133,9 +424,10 @@ class TaskManager:
     # HU-002: Seleccionar Usuario
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
     def listar_usuarios(self) -> list:
         """Retorna todos los usuarios registrados."""
-        session = Session()
+        session = self._sesion_lectura()
         try:
             usuarios = session.query(Usuario).all()
             for u in usuarios:
@@ -144,6 +436,7 @@ class TaskManager:
         finally:
             session.close()
 
+    @instrumentado
     def seleccionar_usuario(self, id_usuario: int) -> Optional[Usuario]:
         """
         Selecciona un usuario por ID y lo asigna como usuario activo.
@@ -153,7 +446,13 @@ class TaskManager:
         Returns:
             Usuario encontrado, o None si el ID no existe.
         """
-        session = Session()
+        # Un acierto implica que hay usuarios y que el ID es válido
+        usuario = self._cache.obtener(("usuario", id_usuario))
+        if usuario is not None:
+            self.usuario_activo = usuario
+            return usuario
+
+        session = self._sesion_lectura()
         try:
             count = session.query(Usuario).count()
             if count == 0:
@@ -165,6 +464,7 @@ class TaskManager:
             usuario = session.query(Usuario).filter_by(idUsuario=id_usuario).first()
             if usuario:
                 session.expunge(usuario)
+                self._cachear_usuario(usuario)
                 self.usuario_activo = usuario
             return usuario
         finally:
@@ -174,6 +474,8 @@ class TaskManager:
     # HU-003: Crear Materia
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def crear_materia(self, nombre: str, color: str) -> Materia:
         """
         Crea una materia para el usuario activo.
@@ -186,12 +488,15 @@ class TaskManager:
         nombre = self._validar_nombre_materia(nombre)
         self._validar_color_hex(color)
 
-        session = Session()
+        session = self._sesion()
         try:
-            duplicado = session.query(Materia).filter_by(
-                nombre=nombre,
-                usuario_id=self.usuario_activo.idUsuario
-            ).first()
+            duplicado = (
+                self._cache.obtener(("materia_nombre", self.usuario_activo.idUsuario, nombre))
+                or session.query(Materia).filter_by(
+                    nombre=nombre,
+                    usuario_id=self.usuario_activo.idUsuario
+                ).first()
+            )
             if duplicado:
                 raise ValueError(f"Ya existe una materia llamada '{nombre}' para este usuario")
 
@@ -204,6 +509,7 @@ class TaskManager:
             session.commit()
             session.refresh(materia)
             session.expunge(materia)
+            self._cachear_materia(materia)
             return materia
 
         except IntegrityError:
@@ -215,10 +521,34 @@ class TaskManager:
         finally:
             session.close()
 
+    @instrumentado
+    def listar_materias(self) -> list:
+        """
+        Retorna las materias del usuario activo ordenadas por nombre.
+
+        Raises:
+            ValueError: Si no hay usuario activo.
+        """
+        self._validar_usuario_activo()
+        session = self._sesion_lectura()
+        try:
+            materias = session.scalars(
+                select(Materia)
+                .where(Materia.usuario_id == self.usuario_activo.idUsuario)
+                .order_by(Materia.nombre, Materia.idMateria)
+            ).all()
+            for m in materias:
+                session.expunge(m)
+            return materias
+        finally:
+            session.close()
+
     # ──────────────────────────────────────────────────────────────
     # HU-004: Crear Tarea
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def crear_tarea(
         self,
         titulo: str,
@@ -235,40 +565,154 @@ class TaskManager:
                         título/descripción/fecha/prioridad inválidos.
         """
         self._validar_usuario_activo()
-        titulo = self._validar_titulo_tarea(titulo)
+        titulo = self._validar_datos_tarea(titulo, descripcion, prioridad, fecha_entrega)
 
-        if descripcion and len(descripcion) > 500:
-            raise ValueError("La descripción es muy larga (máximo 500 caracteres)")
+        session = self._sesion()
+        try:
+            # La propiedad de la materia se comprueba en el mismo INSERT: la
+            # caché puede tener una materia que otro proceso ya borró.
+            tarea = session.scalars(
+                insert(Tarea)
+                .from_select(
+                    ["titulo", "descripcion", "prioridad", "fechaEntrega", "estado", "materia_id", "usuario_id"],
+                    select(
+                        literal(titulo, Tarea.titulo.type),
+                        literal(descripcion, Tarea.descripcion.type),
+                        literal(prioridad, Tarea.prioridad.type),
+                        literal(fecha_entrega, Tarea.fechaEntrega.type),
+                        literal(EstadoTarea.Pendiente, Tarea.estado.type),
+                        Materia.idMateria,
+                        Materia.usuario_id
+                    ).where(
+                        Materia.idMateria == materia_id,
+                        Materia.usuario_id == self.usuario_activo.idUsuario
+                    )
+                )
+                .returning(Tarea)
+            ).one_or_none()
+            if tarea is None:
+                self._explicar_materia_rechazada(session, materia_id, "crear una tarea en")
+            session.expunge(tarea)
+            session.commit()
+            return tarea
 
-        if not isinstance(fecha_entrega, date):
-            raise ValueError("La fecha de entrega es inválida")
-        if fecha_entrega < date.today():
-            raise ValueError("La fecha de entrega no puede ser en el pasado")
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
 
-        if not isinstance(prioridad, Prioridad):
-            raise ValueError("La prioridad debe ser una instancia de Prioridad (Baja, Media o Alta)")
+    @instrumentado
+    def crear_tareas_lote(self, filas: Iterable[dict]) -> list:
+        """
+        Crea muchas tareas del usuario activo en una sola transacción.
+
+        Cada fila es un dict con las mismas claves que los argumentos de
+        crear_tarea (titulo, descripcion, prioridad, fecha_entrega,
+        materia_id). Todas las filas se validan antes de tocar la BD, la
+        propiedad de las materias se resuelve con una sola consulta y las
+        filas válidas se insertan juntas con un único commit.
 
-        session = Session()
+        Raises:
+            ValueError: Si no hay usuario activo.
+        Returns:
+            Lista con un resultado por fila, en el mismo orden:
+            {"fila": i, "ok": True, "idTarea": id} o
+            {"fila": i, "ok": False, "error": mensaje}.
+        """
+        self._validar_usuario_activo()
+
+        resultados = []
+        validas = []
+        for i, fila in enumerate(filas):
+            try:
+                self._validar_forma_fila(fila)
+                titulo = self._validar_datos_tarea(
+                    fila.get("titulo") or "",
+                    fila.get("descripcion"),
+                    fila.get("prioridad"),
+                    fila.get("fecha_entrega")
+                )
+            except ValueError as e:
+                resultados.append({"fila": i, "ok": False, "error": str(e)})
+                continue
+            resultados.append(None)
+            validas.append((i, {
+                "titulo": titulo,
+                "descripcion": fila.get("descripcion"),
+                "materia_id": fila.get("materia_id"),
+                "usuario_id": self.usuario_activo.idUsuario,
+                "prioridad": fila.get("prioridad"),
+                "fechaEntrega": fila.get("fecha_entrega"),
+                "estado": EstadoTarea.Pendiente
+            }))
+
+        if validas:
+            for i, resultado in self._insertar_tareas_lote(validas).items():
+                resultados[i] = resultado
+        return resultados
+
+    @staticmethod
+    def _validar_forma_fila(fila):
+        """
+        Tipos de una fila de crear_tareas_lote, antes de las validaciones de
+        crear_tarea (que suponen texto y un ID entero).
+        """
+        if not isinstance(fila, dict):
+            raise ValueError("La fila debe ser un diccionario")
+        for campo in ("titulo", "descripcion"):
+            valor = fila.get(campo)
+            if valor is not None and not isinstance(valor, str):
+                raise ValueError(f"El campo '{campo}' debe ser texto")
+        materia_id = fila.get("materia_id")
+        if isinstance(materia_id, bool) or not isinstance(materia_id, int):
+            raise ValueError("El campo 'materia_id' debe ser un número entero")
+
+    @reintentable
+    def _insertar_tareas_lote(self, validas: list) -> dict:
+        """
+        Parte de crear_tareas_lote que toca la BD: comprueba la propiedad de
+        las materias e inserta las filas ya validadas. Es lo único que se
+        reintenta, así que `filas` se recorre una sola vez aunque sea un
+        generador. Retorna {i: resultado} para cada fila de `validas`.
+        """
+        resultados = {}
+        session = self._sesion()
         try:
-            materia = session.query(Materia).filter_by(idMateria=materia_id).first()
-            if not materia:
-                raise ValueError("La materia no existe")
-            if materia.usuario_id != self.usuario_activo.idUsuario:
-                raise ValueError("No puede crear una tarea en una materia de otro usuario")
-
-            tarea = Tarea(
-                titulo=titulo,
-                descripcion=descripcion,
-                materia_id=materia_id,
-                prioridad=prioridad,
-                fechaEntrega=fecha_entrega,
-                estado=EstadoTarea.Pendiente
-            )
-            session.add(tarea)
-            session.commit()
-            session.refresh(tarea)
-            session.expunge(tarea)
-            return tarea
+            # Los propietarios se leen de la BD: la caché no sirve para
+            # autorizar una escritura (otro proceso pudo borrar la materia)
+            propietarios = {}
+            ids_materia = list({valores["materia_id"] for _, valores in validas})
+            for inicio in range(0, len(ids_materia), _TAMANO_BLOQUE_IN):
+                bloque = ids_materia[inicio:inicio + _TAMANO_BLOQUE_IN]
+                propietarios.update(session.execute(
+                    select(Materia.idMateria, Materia.usuario_id)
+                    .where(Materia.idMateria.in_(bloque))
+                ).all())
+
+            a_insertar = []
+            for i, valores in validas:
+                propietario = propietarios.get(valores["materia_id"])
+                if propietario is None:
+                    resultados[i] = {"fila": i, "ok": False, "error": "La materia no existe"}
+                elif propietario != self.usuario_activo.idUsuario:
+                    resultados[i] = {
+                        "fila": i,
+                        "ok": False,
+                        "error": "No puede crear una tarea en una materia de otro usuario"
+                    }
+                else:
+                    a_insertar.append((i, valores))
+
+            if a_insertar:
+                ids = session.scalars(
+                    insert(Tarea).returning(Tarea.idTarea, sort_by_parameter_order=True),
+                    [valores for _, valores in a_insertar]
+                ).all()
+                session.commit()
+                for (i, _), id_tarea in zip(a_insertar, ids):
+                    resultados[i] = {"fila": i, "ok": True, "idTarea": id_tarea}
+            return resultados
 
         except Exception:
             session.rollback()
@@ -276,15 +720,22 @@ class TaskManager:
         finally:
             session.close()
 
+    @instrumentado
     def buscar_usuario_por_correo(self, correo):
         """Busca un usuario por su correo electrónico."""
-        from src.model.declarative_base import Session
-        from src.model.modelo import Usuario
-        
-        session = Session()
-        usuario = session.query(Usuario).filter_by(correo=correo).first()
-        session.close()
-        return usuario
+        usuario = self._cache.obtener(("correo", correo))
+        if usuario is not None:
+            return usuario
+
+        session = self._sesion_lectura()
+        try:
+            usuario = session.query(Usuario).filter_by(correo=correo).first()
+            if usuario:
+                session.expunge(usuario)
+                self._cachear_usuario(usuario)
+            return usuario
+        finally:
+            session.close()
 
     # ──────────────────────────────────────────────────────────────
     # HU-005: Marcar / Desmarcar Tarea
@@ -293,26 +744,35 @@ class TaskManager:
     def _cambiar_estado_tarea(self, tarea_id: int, nuevo_estado: EstadoTarea) -> Tarea:
         self._validar_usuario_activo()
 
-        session = Session()
+        session = self._sesion()
         try:
-            tarea = session.query(Tarea).filter_by(idTarea=tarea_id).first()
-            if not tarea:
-                raise ValueError("La tarea no existe")
-
-            materia = session.query(Materia).filter_by(idMateria=tarea.materia_id).first()
-            if materia.usuario_id != self.usuario_activo.idUsuario:
-                raise ValueError("No puede modificar una tarea de otro usuario")
-
-            if tarea.estado == nuevo_estado:
+            # Un solo UPDATE protegido por propietario y estado; solo si no
+            # afecta ninguna fila se consulta el motivo.
+            tarea = session.scalars(
+                update(Tarea)
+                .where(
+                    Tarea.idTarea == tarea_id,
+                    Tarea.usuario_id == self.usuario_activo.idUsuario,
+                    Tarea.estado != nuevo_estado
+                )
+                .values(estado=nuevo_estado)
+                .returning(Tarea)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+
+            if tarea is None:
+                fila = self._buscar_tarea_con_propietario(session, tarea_id)
+                if not fila:
+                    raise ValueError("La tarea no existe")
+                if fila.usuario_id != self.usuario_activo.idUsuario:
+                    raise ValueError("No puede modificar una tarea de otro usuario")
                 if nuevo_estado == EstadoTarea.Completada:
                     raise ValueError("La tarea ya está completada")
                 else:
                     raise ValueError("La tarea ya está pendiente")
 
-            tarea.estado = nuevo_estado
-            session.commit()
-            session.refresh(tarea)
             session.expunge(tarea)
+            session.commit()
             return tarea
 
         except Exception:
@@ -321,9 +781,13 @@ class TaskManager:
         finally:
             session.close()
 
+    @instrumentado
+    @reintentable
     def marcar_tarea(self, tarea_id: int) -> Tarea:
         return self._cambiar_estado_tarea(tarea_id, EstadoTarea.Completada)
 
+    @instrumentado
+    @reintentable
     def desmarcar_tarea(self, tarea_id: int) -> Tarea:
         return self._cambiar_estado_tarea(tarea_id, EstadoTarea.Pendiente)
 
@@ -331,6 +795,8 @@ class TaskManager:
     # HU-006: Editar Usuario
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def editar_usuario(
         self,
         id_usuario: int,
@@ -354,11 +820,12 @@ class TaskManager:
         if nuevo_correo is not None:
             nuevo_correo = self._validar_correo(nuevo_correo)
 
-        session = Session()
+        session = self._sesion()
         try:
             usuario = session.query(Usuario).filter_by(idUsuario=id_usuario).first()
             if not usuario:
                 raise ValueError("El usuario no existe")
+            self._invalidar_usuario(usuario)
 
             if nuevo_nombre is not None:
                 usuario.nombre = nuevo_nombre
@@ -375,6 +842,7 @@ class TaskManager:
             session.commit()
             session.refresh(usuario)
             session.expunge(usuario)
+            self._cachear_usuario(usuario)
             # Actualizar referencia en memoria
             self.usuario_activo = usuario
             return usuario
@@ -392,6 +860,8 @@ class TaskManager:
     # HU-007: Eliminar Usuario
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def eliminar_usuario(self, id_usuario: int) -> bool:
         """
         Elimina el usuario activo. Solo puede eliminar su propio usuario.
@@ -410,7 +880,7 @@ class TaskManager:
         if id_usuario != self.usuario_activo.idUsuario:
             raise ValueError("Solo puede eliminar su propio usuario")
 
-        session = Session()
+        session = self._sesion()
         try:
             usuario = session.query(Usuario).filter_by(idUsuario=id_usuario).first()
             if not usuario:
@@ -419,8 +889,10 @@ class TaskManager:
             if usuario.materias:
                 raise ValueError("Debe eliminar primero todas las materias del usuario")
 
+            session.execute(delete(Importacion).where(Importacion.usuario_id == id_usuario))
             session.delete(usuario)
             session.commit()
+            self._invalidar_usuario(usuario)
             self.usuario_activo = None
             return True
 
@@ -434,6 +906,8 @@ class TaskManager:
     # HU-008: Editar Materia
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def editar_materia(
         self,
         id_materia: int,
@@ -454,31 +928,54 @@ class TaskManager:
         if nuevo_color is not None:
             self._validar_color_hex(nuevo_color)
 
-        session = Session()
+        session = self._sesion()
         try:
-            materia = session.query(Materia).filter_by(idMateria=id_materia).first()
+            materia = self._obtener_materia(session, id_materia)
             if not materia:
                 raise ValueError("La materia no existe")
             if materia.usuario_id != self.usuario_activo.idUsuario:
                 raise ValueError("No puede editar una materia de otro usuario")
 
+            valores = {}
             if nuevo_nombre is not None:
-                duplicado = session.query(Materia).filter(
-                    Materia.nombre == nuevo_nombre,
-                    Materia.usuario_id == self.usuario_activo.idUsuario,
-                    Materia.idMateria != id_materia
-                ).first()
-                if duplicado:
+                duplicado = self._cache.obtener(
+                    ("materia_nombre", self.usuario_activo.idUsuario, nuevo_nombre)
+                )
+                if duplicado is None:
+                    duplicado = session.query(Materia).filter(
+                        Materia.nombre == nuevo_nombre,
+                        Materia.usuario_id == self.usuario_activo.idUsuario,
+                        Materia.idMateria != id_materia
+                    ).first()
+                if duplicado and duplicado.idMateria != id_materia:
                     raise ValueError(f"Ya existe una materia llamada '{nuevo_nombre}' para este usuario")
-                materia.nombre = nuevo_nombre
+                valores["nombre"] = nuevo_nombre
 
             if nuevo_color is not None:
-                materia.color = nuevo_color
-
+                valores["color"] = nuevo_color
+
+            if not valores:
+                return materia
+
+            # La caché solo adelanta los errores: el UPDATE vuelve a exigir
+            # que la materia exista y sea del usuario.
+            editada = session.scalars(
+                update(Materia)
+                .where(
+                    Materia.idMateria == id_materia,
+                    Materia.usuario_id == self.usuario_activo.idUsuario
+                )
+                .values(**valores)
+                .returning(Materia)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            if editada is None:
+                self._explicar_materia_rechazada(session, id_materia, "editar")
+            session.expunge(editada)
             session.commit()
-            session.refresh(materia)
-            session.expunge(materia)
-            return materia
+            self._invalidar_materia(materia)
+            self._cachear_materia(editada)
+            return editada
 
         except Exception:
             session.rollback()
@@ -490,6 +987,8 @@ class TaskManager:
     # HU-009: Editar Tarea
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
+    @reintentable
     def editar_tarea(
         self,
         id_tarea: int,
@@ -507,52 +1006,66 @@ class TaskManager:
                         validaciones de campos, o nueva materia es ajena.
         """
         self._validar_usuario_activo()
+        nuevo_titulo = self._validar_cambios_tarea(
+            nuevo_titulo, nueva_descripcion, nueva_prioridad, nueva_fecha_entrega
+        )
 
-        if nuevo_titulo is not None:
-            nuevo_titulo = self._validar_titulo_tarea(nuevo_titulo)
-
-        if nueva_descripcion is not None and len(nueva_descripcion) > 500:
-            raise ValueError("La descripción es muy larga (máximo 500 caracteres)")
-
-        if nueva_fecha_entrega is not None:
-            if not isinstance(nueva_fecha_entrega, date):
-                raise ValueError("La fecha de entrega es inválida")
-            if nueva_fecha_entrega < date.today():
-                raise ValueError("La fecha de entrega no puede ser en el pasado")
-
-        if nueva_prioridad is not None and not isinstance(nueva_prioridad, Prioridad):
-            raise ValueError("La prioridad debe ser una instancia de Prioridad (Baja, Media o Alta)")
-
-        session = Session()
+        session = self._sesion()
         try:
-            tarea = session.query(Tarea).filter_by(idTarea=id_tarea).first()
-            if not tarea:
-                raise ValueError("La tarea no existe")
-
-            materia_actual = session.query(Materia).filter_by(idMateria=tarea.materia_id).first()
-            if materia_actual.usuario_id != self.usuario_activo.idUsuario:
-                raise ValueError("No puede editar una tarea de otro usuario")
-
-            if nueva_materia_id is not None:
-                nueva_materia = session.query(Materia).filter_by(idMateria=nueva_materia_id).first()
-                if not nueva_materia:
-                    raise ValueError("La nueva materia no existe")
-                if nueva_materia.usuario_id != self.usuario_activo.idUsuario:
-                    raise ValueError("No puede mover una tarea a una materia de otro usuario")
-                tarea.materia_id = nueva_materia_id
-
+            valores = {}
             if nuevo_titulo is not None:
-                tarea.titulo = nuevo_titulo
+                valores["titulo"] = nuevo_titulo
             if nueva_descripcion is not None:
-                tarea.descripcion = nueva_descripcion
+                valores["descripcion"] = nueva_descripcion
             if nueva_prioridad is not None:
-                tarea.prioridad = nueva_prioridad
+                valores["prioridad"] = nueva_prioridad
             if nueva_fecha_entrega is not None:
-                tarea.fechaEntrega = nueva_fecha_entrega
+                valores["fechaEntrega"] = nueva_fecha_entrega
+
+            condiciones = [
+                Tarea.idTarea == id_tarea,
+                Tarea.usuario_id == self.usuario_activo.idUsuario
+            ]
+            if nueva_materia_id is not None:
+                valores["materia_id"] = nueva_materia_id
+                valores["usuario_id"] = (
+                    select(Materia.usuario_id)
+                    .where(Materia.idMateria == nueva_materia_id)
+                    .scalar_subquery()
+                )
+                condiciones.append(
+                    self._materias_del_usuario()
+                    .where(Materia.idMateria == nueva_materia_id)
+                    .exists()
+                )
+
+            if valores:
+                sentencia = (
+                    update(Tarea)
+                    .where(*condiciones)
+                    .values(**valores)
+                    .returning(Tarea)
+                    .execution_options(synchronize_session=False)
+                )
+            else:
+                sentencia = select(Tarea).where(*condiciones)
+            tarea = session.scalars(sentencia).one_or_none()
+
+            if tarea is None:
+                fila = self._buscar_tarea_con_propietario(session, id_tarea)
+                if not fila:
+                    raise ValueError("La tarea no existe")
+                if fila.usuario_id != self.usuario_activo.idUsuario:
+                    raise ValueError("No puede editar una tarea de otro usuario")
+                propietario = session.scalar(
+                    select(Materia.usuario_id).where(Materia.idMateria == nueva_materia_id)
+                )
+                if propietario is None:
+                    raise ValueError("La nueva materia no existe")
+                raise ValueError("No puede mover una tarea a una materia de otro usuario")
 
-            session.commit()
-            session.refresh(tarea)
             session.expunge(tarea)
+            session.commit()
             return tarea
 
         except Exception:
@@ -565,17 +1078,17 @@ class TaskManager:
     # HU-010: Eliminar Materia
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
     def seleccionar_materia(self, materia_id: int) -> Optional[Materia]:
         """Retorna una materia por ID, o None si no existe."""
-        session = Session()
+        session = self._sesion_lectura()
         try:
-            materia = session.query(Materia).filter_by(idMateria=materia_id).first()
-            if materia:
-                session.expunge(materia)
-            return materia
+            return self._obtener_materia(session, materia_id)
         finally:
             session.close()
 
+    @instrumentado
+    @reintentable
     def eliminar_materia(self, materia_id: int) -> bool:
         """
         Elimina una materia del usuario activo (y sus tareas en cascada).
@@ -585,16 +1098,19 @@ class TaskManager:
         """
         self._validar_usuario_activo()
 
-        session = Session()
+        session = self._sesion()
         try:
-            materia = session.query(Materia).filter_by(idMateria=materia_id).first()
-            if not materia:
-                raise ValueError("La materia no existe")
+            # Se lee de la BD y no de la caché: la materia pudo borrarse desde
+            # otro proceso
+            materia = session.get(Materia, materia_id)
+            if materia is None:
+                self._explicar_materia_rechazada(session, materia_id, "eliminar")
             if materia.usuario_id != self.usuario_activo.idUsuario:
                 raise ValueError("No puede eliminar una materia de otro usuario")
 
             # cascade="all, delete-orphan" elimina las tareas automáticamente
             session.delete(materia)
+            self._invalidar_materia(materia)
             session.commit()
             return True
 
@@ -608,9 +1124,10 @@ class TaskManager:
     # HU-011: Eliminar Tarea
     # ──────────────────────────────────────────────────────────────
 
+    @instrumentado
     def seleccionar_tarea(self, tarea_id: int) -> Optional[Tarea]:
         """Retorna una tarea por ID, o None si no existe."""
-        session = Session()
+        session = self._sesion_lectura()
         try:
             tarea = session.query(Tarea).filter_by(idTarea=tarea_id).first()
             if tarea:
@@ -619,6 +1136,8 @@ class TaskManager:
         finally:
             session.close()
 
+    @instrumentado
+    @reintentable
     def eliminar_tarea(self, id_tarea: int) -> bool:
         """
         Elimina una tarea del usuario activo.
@@ -632,17 +1151,23 @@ class TaskManager:
 
         self._validar_usuario_activo()
 
-        session = Session()
+        session = self._sesion()
         try:
-            tarea = session.query(Tarea).filter_by(idTarea=id_tarea).first()
-            if not tarea:
-                raise ValueError(f"La tarea con id {id_tarea} no existe")
+            eliminada = session.execute(
+                delete(Tarea)
+                .where(
+                    Tarea.idTarea == id_tarea,
+                    Tarea.usuario_id == self.usuario_activo.idUsuario
+                )
+                .returning(Tarea.idTarea)
+                .execution_options(synchronize_session=False)
+            ).first()
 
-            materia = session.query(Materia).filter_by(idMateria=tarea.materia_id).first()
-            if materia.usuario_id != self.usuario_activo.idUsuario:
+            if eliminada is None:
+                if not self._buscar_tarea_con_propietario(session, id_tarea):
+                    raise ValueError(f"La tarea con id {id_tarea} no existe")
                 raise ValueError("No puede eliminar una tarea de otro usuario")
 
-            session.delete(tarea)
             session.commit()
             return True
 
@@ -650,4 +1175,437 @@ class TaskManager:
             session.rollback()
             raise
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    # ──────────────────────────────────────────────────────────────
+    # LISTADO DE TAREAS (filtros, orden y paginación por cursor)
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _codificar_cursor(valor, id_tarea: int) -> str:
+        if isinstance(valor, date):
+            valor = valor.isoformat()
+        crudo = json.dumps([valor, id_tarea]).encode()
+        return base64.urlsafe_b64encode(crudo).decode()
+
+    @staticmethod
+    def _decodificar_cursor(cursor: str, campo: str) -> tuple:
+        """
+        (valor, id_tarea) de un cursor de _codificar_cursor. Como viene del
+        cliente, se comprueba que el valor sea del tipo de la columna antes
+        de que llegue a la consulta.
+        """
+        try:
+            if not isinstance(cursor, str):
+                raise ValueError
+            crudo = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(crudo, list) or len(crudo) != 2:
+                raise ValueError
+            valor, id_tarea = crudo
+            if isinstance(id_tarea, bool) or not isinstance(id_tarea, int):
+                raise ValueError
+            if campo == "titulo" and not isinstance(valor, str):
+                raise ValueError
+            if campo == "fechaEntrega" and valor is not None:
+                if not isinstance(valor, str):
+                    raise ValueError
+                valor = date.fromisoformat(valor)
+        except (ValueError, TypeError):
+            raise ValueError("El cursor de paginación es inválido")
+        return valor, id_tarea
+
+    @staticmethod
+    def _condicion_cursor(columna, valor, id_tarea: int, descendente: bool):
+        """
+        Condición keyset "después de (valor, id_tarea)" para el orden dado.
+        SQLite ordena los NULL primero en ASC y al final en DESC.
+        """
+        if columna is Tarea.idTarea:
+            return Tarea.idTarea < id_tarea if descendente else Tarea.idTarea > id_tarea
+
+        # Las comparaciones de fila (col, id) > (?, ?) permiten a SQLite
+        # saltar directamente al punto del índice donde sigue la página.
+        clave = tuple_(columna, Tarea.idTarea)
+        if descendente:
+            if valor is None:
+                return and_(columna.is_(None), Tarea.idTarea < id_tarea)
+            # Los NULL que siguen en orden DESC se piden aparte (ver listar_tareas)
+            return clave < tuple_(valor, id_tarea)
+
+        if valor is None:
+            return or_(
+                columna.is_not(None),
+                and_(columna.is_(None), Tarea.idTarea > id_tarea)
+            )
+        return clave > tuple_(valor, id_tarea)
+
+    @instrumentado
+    def listar_tareas(
+        self,
+        estado: Optional[EstadoTarea] = None,
+        prioridad: Optional[Prioridad] = None,
+        materia_id: Optional[int] = None,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        orden: str = "fechaEntrega",
+        limite: Optional[int] = 50,
+        cursor: Optional[str] = None
+    ) -> tuple:
+        """
+        Lista las tareas del usuario activo filtrando y ordenando en SQL.
+
+        La paginación es por cursor (keyset): cada página continúa después
+        de la última fila de la anterior, así que su costo no depende de
+        cuántas páginas se hayan recorrido. `orden` es "fechaEntrega",
+        "titulo" o "idTarea", con "-" delante para orden descendente;
+        `desde`/`hasta` acotan fechaEntrega (inclusive); limite=None
+        retorna todas las tareas en una sola página.
+
+        Raises:
+            ValueError: Si no hay usuario activo, algún filtro es inválido,
+                        o el cursor no corresponde a un listado válido.
+        Returns:
+            Tupla (tareas, cursor_siguiente); cursor_siguiente es None
+            cuando no hay más páginas.
+        """
+        self._validar_usuario_activo()
+
+        if estado is not None and not isinstance(estado, EstadoTarea):
+            raise ValueError("El estado debe ser una instancia de EstadoTarea")
+        if prioridad is not None and not isinstance(prioridad, Prioridad):
+            raise ValueError("La prioridad debe ser una instancia de Prioridad (Baja, Media o Alta)")
+        if limite is not None:
+            self._validar_limite(limite)
+
+        descendente = orden.startswith("-")
+        campo = orden.lstrip("-")
+        if campo not in _ORDENES_TAREA:
+            raise ValueError(f"Criterio de orden inválido: '{orden}'")
+        columna = _ORDENES_TAREA[campo]
+
+        consulta = select(Tarea).where(Tarea.usuario_id == self.usuario_activo.idUsuario)
+        if estado is not None:
+            consulta = consulta.where(Tarea.estado == estado)
+        if prioridad is not None:
+            consulta = consulta.where(Tarea.prioridad == prioridad)
+        if materia_id is not None:
+            consulta = consulta.where(Tarea.materia_id == materia_id)
+        if desde is not None:
+            consulta = consulta.where(Tarea.fechaEntrega >= desde)
+        if hasta is not None:
+            consulta = consulta.where(Tarea.fechaEntrega <= hasta)
+
+        consulta_nulos = None
+        if cursor is not None:
+            valor, ultimo_id = self._decodificar_cursor(cursor, campo)
+            if descendente and valor is not None and Tarea.__table__.c[campo].nullable:
+                consulta_nulos = (
+                    consulta.where(columna.is_(None)).order_by(Tarea.idTarea.desc())
+                )
+            consulta = consulta.where(
+                self._condicion_cursor(columna, valor, ultimo_id, descendente)
+            )
+
+        if columna is Tarea.idTarea:
+            claves = [columna.desc() if descendente else columna.asc()]
+        elif descendente:
+            claves = [columna.desc(), Tarea.idTarea.desc()]
+        else:
+            claves = [columna.asc(), Tarea.idTarea.asc()]
+        consulta = consulta.order_by(*claves)
+        if limite is not None:
+            consulta = consulta.limit(limite + 1)
+
+        session = self._sesion_lectura()
+        try:
+            tareas = session.scalars(consulta).all()
+            if consulta_nulos is not None and (limite is None or len(tareas) <= limite):
+                if limite is not None:
+                    consulta_nulos = consulta_nulos.limit(limite + 1 - len(tareas))
+                tareas += session.scalars(consulta_nulos).all()
+            for t in tareas:
+                session.expunge(t)
+        finally:
+            session.close()
+
+        siguiente = None
+        if limite is not None and len(tareas) > limite:
+            tareas = tareas[:limite]
+            ultima = tareas[-1]
+            siguiente = self._codificar_cursor(getattr(ultima, campo), ultima.idTarea)
+        return tareas, siguiente
+
+    # ──────────────────────────────────────────────────────────────
+    # BÚSQUEDA DE TEXTO COMPLETO
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _consulta_fts(texto: str) -> str:
+        """
+        Convierte el texto del usuario en una consulta FTS5: cada palabra
+        se busca como prefijo y todas deben aparecer. Las comillas evitan
+        que la sintaxis de FTS5 (AND, OR, NEAR, *, ...) del texto se interprete.
+        """
+        palabras = re.findall(r"\w+", texto or "")
+        if not palabras:
+            raise ValueError("El texto de búsqueda no puede estar vacío")
+        return " ".join(f'"{p}"*' for p in palabras)
+
+    @instrumentado
+    def buscar_tareas(
+        self,
+        texto: str,
+        estado: Optional[EstadoTarea] = None,
+        materia_id: Optional[int] = None,
+        limite: int = 20
+    ) -> list:
+        """
+        Busca tareas del usuario activo por título y descripción.
+
+        Usa el índice FTS5 tareas_fts; los resultados vienen ordenados por
+        relevancia (bm25, con más peso en el título). La búsqueda ignora
+        mayúsculas y tildes y cada palabra coincide como prefijo.
+
+        Raises:
+            ValueError: Si no hay usuario activo, el texto está vacío,
+                        el estado es inválido o el límite no es positivo.
+        """
+        self._validar_usuario_activo()
+        consulta_fts = self._consulta_fts(texto)
+        if estado is not None and not isinstance(estado, EstadoTarea):
+            raise ValueError("El estado debe ser una instancia de EstadoTarea")
+        self._validar_limite(limite)
+
+        rango = func.bm25(literal_column("tareas_fts"), *_PESOS_BUSQUEDA)
+        consulta = (
+            select(Tarea)
+            .join(tareas_fts, tareas_fts.c.rowid == Tarea.idTarea)
+            .where(
+                literal_column("tareas_fts").op("MATCH")(consulta_fts),
+                Tarea.usuario_id == self.usuario_activo.idUsuario
+            )
+            .order_by(rango, Tarea.idTarea)
+            .limit(limite)
+        )
+        if estado is not None:
+            consulta = consulta.where(Tarea.estado == estado)
+        if materia_id is not None:
+            consulta = consulta.where(Tarea.materia_id == materia_id)
+
+        session = self._sesion_lectura()
+        try:
+            tareas = session.scalars(consulta).all()
+            for t in tareas:
+                session.expunge(t)
+            return tareas
+        finally:
+            session.close()
+
+    # ──────────────────────────────────────────────────────────────
+    # RESUMEN DE TAREAS
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _conteos_vacios() -> dict:
+        return {
+            "total": 0,
+            "por_estado": {e.value: 0 for e in EstadoTarea},
+            "por_prioridad": {p.value: 0 for p in Prioridad},
+        }
+
+    @instrumentado
+    def resumen(self, materia_id: Optional[int] = None) -> dict:
+        """
+        Cantidad de tareas del usuario activo por estado y prioridad, en
+        total y por materia.
+
+        Lee la tabla resumen_tareas (mantenida por triggers), así que el
+        costo depende de la cantidad de materias y no de tareas.
+
+        Raises:
+            ValueError: Si no hay usuario activo, o materia_id no existe o es ajena.
+        Returns:
+            Dict con "total", "por_estado", "por_prioridad" y "materias"
+            ({idMateria: {"nombre", "total", "por_estado", "por_prioridad"}}).
+        """
+        self._validar_usuario_activo()
+
+        consulta = (
+            select(
+                Materia.idMateria, Materia.nombre,
+                ResumenTarea.estado, ResumenTarea.prioridad, ResumenTarea.total
+            )
+            .outerjoin(ResumenTarea, ResumenTarea.materia_id == Materia.idMateria)
+            .where(Materia.usuario_id == self.usuario_activo.idUsuario)
+        )
+        if materia_id is not None:
+            consulta = consulta.where(Materia.idMateria == materia_id)
+
+        session = self._sesion_lectura()
+        try:
+            filas = session.execute(consulta).all()
+            if materia_id is not None and not filas:
+                materia = self._obtener_materia(session, materia_id)
+                if not materia:
+                    raise ValueError("La materia no existe")
+                raise ValueError("No puede consultar una materia de otro usuario")
+        finally:
+            session.close()
+
+        resultado = self._conteos_vacios()
+        resultado["materias"] = {}
+        for id_materia, nombre, estado, prioridad, total in filas:
+            materia = resultado["materias"].get(id_materia)
+            if materia is None:
+                materia = resultado["materias"][id_materia] = {
+                    "nombre": nombre, **self._conteos_vacios()
+                }
+            if not total:
+                continue
+            for conteos in (resultado, materia):
+                conteos["total"] += total
+                conteos["por_estado"][estado.value] += total
+                conteos["por_prioridad"][prioridad.value] += total
+        return resultado
+
+    # ──────────────────────────────────────────────────────────────
+    # PRÓXIMAS ENTREGAS Y VENCIDAS
+    # ──────────────────────────────────────────────────────────────
+
+    def _entregas_pendientes(self, desde: Optional[date], hasta: date, incluir_hasta: bool, limite: int) -> list:
+        """
+        Tareas pendientes del usuario activo con fechaEntrega en el rango,
+        ordenadas por fecha y prioridad (Alta primero). El orden coincide
+        con ix_tareas_usuario_estado_fecha_prioridad, así que SQLite
+        recorre solo las primeras `limite` entradas del rango del índice.
+        """
+        self._validar_usuario_activo()
+        self._validar_limite(limite)
+
+        consulta = select(Tarea).where(
+            Tarea.usuario_id == self.usuario_activo.idUsuario,
+            Tarea.estado == EstadoTarea.Pendiente,
+            Tarea.fechaEntrega <= hasta if incluir_hasta else Tarea.fechaEntrega < hasta
+        )
+        if desde is not None:
+            consulta = consulta.where(Tarea.fechaEntrega >= desde)
+        consulta = consulta.order_by(
+            Tarea.fechaEntrega, text(RANGO_PRIORIDAD_SQL), Tarea.idTarea
+        ).limit(limite)
+
+        session = self._sesion_lectura()
+        try:
+            tareas = session.scalars(consulta).all()
+            for t in tareas:
+                session.expunge(t)
+            return tareas
+        finally:
+            session.close()
+
+    @instrumentado
+    def proximas_entregas(self, dias: int = 7, limite: int = 20) -> list:
+        """
+        Tareas pendientes que vencen entre hoy y dentro de `dias` días
+        (inclusive), de la más cercana a la más lejana. Una ventana que
+        pasa del último día representable llega hasta él.
+
+        Raises:
+            ValueError: Si no hay usuario activo, dias es negativo o el
+                        límite no es positivo.
+        """
+        if isinstance(dias, bool) or not isinstance(dias, int) or dias < 0:
+            raise ValueError("Los días deben ser un entero mayor o igual a 0")
+        hoy = date.today()
+        hasta = date.max if dias > (date.max - hoy).days else hoy + timedelta(days=dias)
+        return self._entregas_pendientes(hoy, hasta, True, limite)
+
+    @instrumentado
+    def entregas_vencidas(self, limite: int = 20) -> list:
+        """
+        Tareas pendientes cuya fecha de entrega ya pasó, de la más
+        atrasada a la más reciente.
+
+        Raises:
+            ValueError: Si no hay usuario activo o el límite no es positivo.
+        """
+        return self._entregas_pendientes(None, date.today(), False, limite)
+
+    # ──────────────────────────────────────────────────────────────
+    # EXPORTACIÓN
+    # ──────────────────────────────────────────────────────────────
+
+    @instrumentado
+    def exportar(self, formato: str, destino) -> dict:
+        """
+        Exporta el usuario activo con sus materias y tareas.
+
+        Las filas se leen por bloques y se escriben a medida que llegan
+        (memoria constante). Con formato "csv", `destino` es un directorio
+        donde se escriben usuarios.csv, materias.csv y tareas.csv; con
+        "jsonl" es la ruta de un archivo o un archivo ya abierto, con una
+        línea por fila y un campo "tipo".
+
+        Raises:
+            ValueError: Si no hay usuario activo o el formato es inválido.
+        Returns:
+            Cantidad de filas exportadas por tipo.
+        """
+        self._validar_usuario_activo()
+        if formato not in exportacion.FORMATOS:
+            raise ValueError(f"Formato de exportación inválido: '{formato}'")
+        usuario_id = self.usuario_activo.idUsuario
+
+        session = self._sesion_lectura()
+        try:
+            if formato == "csv":
+                return exportacion.exportar_csv(session, usuario_id, destino)
+            if hasattr(destino, "write"):
+                return exportacion.exportar_jsonl(session, usuario_id, destino)
+            with open(destino, "w", encoding="utf-8") as salida:
+                return exportacion.exportar_jsonl(session, usuario_id, salida)
+        finally:
+            session.close()
+
+    # ──────────────────────────────────────────────────────────────
+    # IMPORTACIÓN
+    # ──────────────────────────────────────────────────────────────
+
+    @instrumentado
+    def importar_tareas(
+        self,
+        ruta: str,
+        formato: Optional[str] = None,
+        tamano_bloque: int = importacion.TAMANO_BLOQUE,
+        rechazos: Optional[str] = None,
+        reanudar: bool = True
+    ) -> dict:
+        """
+        Importa tareas del usuario activo desde un archivo CSV o JSONL.
+
+        Los registros se validan como en crear_tarea, la materia se indica
+        por nombre y se confirma cada `tamano_bloque` registros. Los
+        rechazados se escriben con su motivo en `rechazos` (por defecto,
+        ruta + ".rechazos.jsonl"). Con reanudar=True, una importación
+        interrumpida del mismo archivo continúa desde el último bloque
+        confirmado. Ver src/logic/importacion.py para el formato.
+
+        Raises:
+            ValueError: Si no hay usuario activo, el formato es inválido o
+                        tamano_bloque no es positivo.
+        Returns:
+            Dict con registros, importadas, rechazadas y reanudada_desde.
+        """
+        self._validar_usuario_activo()
+        if formato is not None and formato not in importacion.FORMATOS:
+            raise ValueError(f"Formato de importación inválido: '{formato}'")
+        if tamano_bloque <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+
+        session = self._sesion()
+        try:
+            return importacion.importar_tareas(
+                session, self.usuario_activo.idUsuario, ruta, formato,
+                tamano_bloque, rechazos, reanudar
+            )
+        finally:
+            session.close()
@@ -0,0 +1,132 @@
+import re
+from datetime import date
+from typing import Optional
+from src.model.modelo import Prioridad
+
+
+class Validaciones:
+    """
+    Validaciones de entrada compartidas por TaskManager y AsyncTaskManager.
+    Las subclases deben definir el atributo usuario_activo.
+    """
+
+    # ──────────────────────────────────────────────────────────────
+    # MÉTODOS PRIVADOS DE VALIDACIÓN
+    # ──────────────────────────────────────────────────────────────
+
+    def _validar_usuario_activo(self):
+        if self.usuario_activo is None:
+            raise ValueError("Debe seleccionar un usuario primero")
+
+    @staticmethod
+    def _validar_nombre_usuario(nombre: str) -> str:
+        nombre = nombre.strip()
+        if not nombre:
+            raise ValueError("El nombre no puede estar vacío")
+        if len(nombre) < 3:
+            raise ValueError("El nombre debe tener al menos 3 caracteres")
+        if len(nombre) > 50:
+            raise ValueError("El nombre es muy largo (máximo 50 caracteres)")
+        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$', nombre):
+            raise ValueError(
+                "El nombre solo puede contener letras y espacios, "
+                "sin números ni caracteres especiales"
+            )
+        return nombre
+
+    @staticmethod
+    def _validar_correo(correo: str) -> str:
+        correo = correo.strip().lower()
+        if not correo:
+            raise ValueError("El correo no puede estar vacío")
+        if len(correo) > 100:
+            raise ValueError("El correo es muy largo (máximo 100 caracteres)")
+        if ' ' in correo:
+            raise ValueError("El correo no puede contener espacios")
+        if correo.count('@') != 1:
+            raise ValueError("El correo debe contener exactamente un @")
+        if correo.startswith('@'):
+            raise ValueError("El correo no puede iniciar con @")
+        if correo.endswith('.'):
+            raise ValueError("El correo no puede terminar en punto")
+        if not re.match(r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', correo):
+            raise ValueError("El correo tiene un formato inválido")
+        return correo
+
+    @staticmethod
+    def _validar_nombre_materia(nombre: str) -> str:
+        nombre = nombre.strip()
+        if not nombre:
+            raise ValueError("El nombre de la materia no puede estar vacío")
+        if len(nombre) < 3:
+            raise ValueError("El nombre de la materia debe tener al menos 3 caracteres")
+        if len(nombre) > 50:
+            raise ValueError("El nombre de la materia es muy largo (máximo 50 caracteres)")
+        return nombre
+
+    @staticmethod
+    def _validar_color_hex(color: str):
+        if not re.match(r'^#[0-9A-Fa-f]{6}$', color):
+            raise ValueError("El color debe ser formato HEX (#RRGGBB)")
+
+    @staticmethod
+    def _validar_limite(limite: int):
+        if isinstance(limite, bool) or not isinstance(limite, int) or limite <= 0:
+            raise ValueError("El límite debe ser un entero mayor a 0")
+
+    @staticmethod
+    def _validar_titulo_tarea(titulo: str) -> str:
+        titulo = titulo.strip()
+        if not titulo:
+            raise ValueError("El título de la tarea no puede estar vacío")
+        if len(titulo) < 3:
+            raise ValueError("El título de la tarea debe tener al menos 3 caracteres")
+        if len(titulo) > 100:
+            raise ValueError("El título de la tarea es muy largo (máximo 100 caracteres)")
+        return titulo
+
+    @classmethod
+    def _validar_datos_tarea(
+        cls,
+        titulo: str,
+        descripcion: Optional[str],
+        prioridad: Prioridad,
+        fecha_entrega: date
+    ) -> str:
+        titulo = cls._validar_titulo_tarea(titulo)
+
+        if descripcion and len(descripcion) > 500:
+            raise ValueError("La descripción es muy larga (máximo 500 caracteres)")
+
+        if not isinstance(fecha_entrega, date):
+            raise ValueError("La fecha de entrega es inválida")
+        if fecha_entrega < date.today():
+            raise ValueError("La fecha de entrega no puede ser en el pasado")
+
+        if not isinstance(prioridad, Prioridad):
+            raise ValueError("La prioridad debe ser una instancia de Prioridad (Baja, Media o Alta)")
+        return titulo
+
+    @classmethod
+    def _validar_cambios_tarea(
+        cls,
+        nuevo_titulo: Optional[str],
+        nueva_descripcion: Optional[str],
+        nueva_prioridad: Optional[Prioridad],
+        nueva_fecha_entrega: Optional[date]
+    ) -> Optional[str]:
+        if nuevo_titulo is not None:
+            nuevo_titulo = cls._validar_titulo_tarea(nuevo_titulo)
+
+        if nueva_descripcion is not None and len(nueva_descripcion) > 500:
+            raise ValueError("La descripción es muy larga (máximo 500 caracteres)")
+
+        if nueva_fecha_entrega is not None:
+            if not isinstance(nueva_fecha_entrega, date):
+                raise ValueError("La fecha de entrega es inválida")
+            if nueva_fecha_entrega < date.today():
+                raise ValueError("La fecha de entrega no puede ser en el pasado")
+
+        if nueva_prioridad is not None and not isinstance(nueva_prioridad, Prioridad):
+            raise ValueError("La prioridad debe ser una instancia de Prioridad (Baja, Media o Alta)")
+        return nuevo_titulo
@@ -1,21 +1,221 @@
 import os
-from sqlalchemy import create_engine
+import sqlite3
+import threading
+import uuid
+import weakref
+from typing import Optional
+from urllib.parse import quote
+from sqlalchemy import URL, create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
 # Obtener la ruta del directorio actual (src/modelo)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Crear la ruta de la base de datos en src/modelo
 db_path = os.path.join(current_dir, 'db.sqlite')
-# Configurar base de datos SQLite en el directorio src/modelo
-engine = create_engine(f'sqlite:///{db_path}', echo=False)
-# engine = create_engine(f'sqlite:///data.db', echo=True)
-Session = sessionmaker(bind=engine)
+
+# Ubicación de la BD por defecto: una ruta (p. ej. en un tmpfs como
+# /dev/shm), una URL sqlite:// o MEMORIA para una BD en memoria compartida.
+VARIABLE_BD = "TASKMANAGER_BD"
+MEMORIA = ":memory:"
+
+# Perfiles de rendimiento de SQLite, seleccionables por nombre o con la
+# variable de entorno TASKMANAGER_SQLITE_PERFIL.
+#   durable:  WAL + synchronous=FULL, no pierde commits ni ante un corte de luz.
+#   balanced: WAL + synchronous=NORMAL, un corte de luz puede perder los
+#             últimos commits pero nunca corrompe la BD.
+#   fast:     sin sincronizar a disco; solo para cargas desechables.
+# cache_size negativo está en KiB; mmap_size en bytes; busy_timeout en ms.
+PERFILES_SQLITE = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+PERFIL_POR_DEFECTO = "balanced"
+VARIABLE_PERFIL = "TASKMANAGER_SQLITE_PERFIL"
+
+
+def resolver_perfil(perfil: str = None) -> str:
+    """Retorna el perfil pedido, el de la variable de entorno o el por defecto."""
+    perfil = perfil or os.environ.get(VARIABLE_PERFIL) or PERFIL_POR_DEFECTO
+    if perfil not in PERFILES_SQLITE:
+        raise ValueError(
+            f"Perfil de SQLite desconocido: '{perfil}' "
+            f"(opciones: {', '.join(PERFILES_SQLITE)})"
+        )
+    return perfil
+
+
+def instalar_perfil(engine: Engine, perfil: str = None, solo_lectura: bool = False):
+    """
+    Registra en `engine` un hook que aplica los PRAGMA del perfil a cada
+    conexión nueva. Para engines asyncio se pasa su `sync_engine`.
+
+    Con solo_lectura se omite journal_mode (el modo WAL es del archivo y
+    lo fija el engine de escritura) y se agrega query_only.
+    """
+    pragmas = dict(PERFILES_SQLITE[resolver_perfil(perfil)])
+    if solo_lectura:
+        del pragmas["journal_mode"]
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def aplicar_perfil(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for nombre, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nombre}={valor}")
+        cursor.close()
+
+
+def resolver_bd(ruta: str = None) -> str:
+    """Retorna la BD pedida, la de la variable de entorno o src/model/db.sqlite."""
+    return ruta or os.environ.get(VARIABLE_BD) or db_path
+
+
+def crear_engine(ruta: str = None, perfil: str = None, echo: bool = False, **opciones) -> Engine:
+    """
+    Crea un engine SQLite que aplica los PRAGMA del perfil a cada conexión.
+
+    `ruta` es un archivo, una URL sqlite:// o MEMORIA; por defecto, la de
+    TASKMANAGER_BD o src/model/db.sqlite.
+
+    Para una BD en archivo SQLAlchemy usa un QueuePool: cada hilo toma su
+    propia conexión y la devuelve al cerrar la sesión. `opciones` se pasan
+    a create_engine (p. ej. pool_size y max_overflow para un servidor con
+    más hilos que las 5 + 10 conexiones por defecto).
+    """
+    resolver_perfil(perfil)
+    ruta = resolver_bd(ruta)
+    if ruta == MEMORIA:
+        return _crear_engine_memoria(perfil, echo, **opciones)
+    url = ruta if "://" in ruta else URL.create("sqlite", database=ruta)
+    nuevo = create_engine(url, echo=echo, **opciones)
+    instalar_perfil(nuevo, perfil)
+    _configuracion[nuevo] = (perfil, opciones)
+    return nuevo
+
+
+def _crear_engine_memoria(perfil: str, echo: bool, **opciones) -> Engine:
+    """
+    BD en memoria con caché compartida: todas las conexiones del engine,
+    de cualquier hilo, ven la misma BD, que vive mientras viva el engine.
+
+    En memoria no hay WAL. Las escrituras se serializan con locks de tabla
+    (un choque es un SQLITE_LOCKED inmediato, que TaskManager reintenta) y
+    las lecturas usan read_uncommitted para no esperar a los escritores, a
+    costa de poder ver cambios todavía sin confirmar de otra conexión.
+    """
+    opciones.setdefault("poolclass", QueuePool)
+    nuevo = crear_bd_memoria(create_engine, "sqlite", echo=echo, **opciones)
+    instalar_perfil(nuevo, perfil)
+    return nuevo
+
+
+def crear_bd_memoria(crear, drivername: str, **opciones):
+    """
+    Crea una BD en memoria nueva con caché compartida y retorna el engine
+    que `crear` (create_engine o create_async_engine) arma sobre ella con
+    el driver `drivername`. La BD vive mientras viva el engine.
+    """
+    nombre = f"file:taskmanager-{uuid.uuid4().hex}"
+    consulta = {"mode": "memory", "cache": "shared", "uri": "true"}
+    opciones["connect_args"] = {**opciones.get("connect_args", {}), "check_same_thread": False}
+    nuevo = crear(URL.create(drivername, database=nombre, query=consulta), **opciones)
+    sincronico = getattr(nuevo, "sync_engine", nuevo)
+
+    @event.listens_for(sincronico, "connect")
+    def leer_sin_esperar(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA read_uncommitted=ON")
+
+    # La BD se borra al cerrarse su última conexión; esta la mantiene viva
+    # aunque el pool cierre todas las suyas.
+    _anclas[sincronico] = sqlite3.connect(
+        f"{nombre}?mode=memory&cache=shared", uri=True, check_same_thread=False
+    )
+    return nuevo
+
+
+def crear_engine_lectura(ruta: str, perfil: str = None, echo: bool = False, **opciones) -> Engine:
+    """
+    Crea un engine de solo lectura sobre la BD de `ruta`: abre el archivo
+    con la URI mode=ro y PRAGMA query_only, así que cualquier escritura
+    falla. Con WAL sus lectores leen una instantánea y nunca bloquean al
+    escritor ni esperan por él. La BD tiene que existir (la crea el engine
+    de escritura).
+    """
+    resolver_perfil(perfil)
+    # URL.create no decodifica la ruta: los escapes %XX son para SQLite
+    url = URL.create("sqlite", database=f"file:{quote(ruta)}", query={"mode": "ro", "uri": "true"})
+    nuevo = create_engine(url, echo=echo, **opciones)
+    instalar_perfil(nuevo, perfil, solo_lectura=True)
+    return nuevo
+
+
+# (perfil, opciones) de cada engine creado con crear_engine, el engine de
+# solo lectura que le corresponde y la conexión que mantiene viva una BD en
+# memoria; se liberan junto con el engine.
+_configuracion = weakref.WeakKeyDictionary()
+_engines_lectura = weakref.WeakKeyDictionary()
+_anclas = weakref.WeakKeyDictionary()
+_lock_lectura = threading.Lock()
+
+
+def engine_de_lectura(engine: Engine) -> Optional[Engine]:
+    """
+    Engine de solo lectura sobre la misma BD en archivo que `engine`
+    (con su perfil y opciones si lo creó crear_engine), creado una sola
+    vez por engine. None si la BD no es un archivo SQLite.
+    """
+    ruta = engine.url.database
+    if engine.dialect.name != "sqlite" or not ruta or ruta == ":memory:" or ruta.startswith("file:"):
+        return None
+    with _lock_lectura:
+        lectura = _engines_lectura.get(engine)
+        if lectura is None:
+            perfil, opciones = _configuracion.get(engine, (None, {}))
+            lectura = _engines_lectura[engine] = crear_engine_lectura(
+                ruta, perfil, echo=engine.echo, **opciones
+            )
+        return lectura
+
 
 Base = declarative_base()
-session = Session()
 
-# Crear la base de datos en memoria
-# engine = create_engine('sqlite:///:memory:')
-# Base.metadata.create_all(engine)
-# Session = sessionmaker(bind=engine)
+# El engine y la fábrica de sesiones por defecto se crean en el primer
+# acceso a declarative_base.engine / .Session (no al importar), así que
+# TASKMANAGER_BD puede fijarse hasta ese momento.
+_lock_por_defecto = threading.Lock()
+
+
+def __getattr__(nombre):
+    if nombre not in ("engine", "Session"):
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    with _lock_por_defecto:
+        if "engine" not in globals():
+            por_defecto = crear_engine()
+            globals()["Session"] = sessionmaker(bind=por_defecto)
+            globals()["engine"] = por_defecto
+    return globals()[nombre]
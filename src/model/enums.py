@@ -0,0 +1,15 @@
+import enum
+
+# Sin dependencias de SQLAlchemy: main.py los importa al arrancar sin
+# cargar el ORM. modelo.py los re-exporta.
+
+
+class Prioridad(enum.Enum):
+    Baja = "Baja"
+    Media = "Media"
+    Alta = "Alta"
+
+
+class EstadoTarea(enum.Enum):
+    Pendiente = "Pendiente"
+    Completada = "Completada"
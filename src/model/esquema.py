@@ -0,0 +1,111 @@
+import hashlib
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+from src.model.declarative_base import Base
+from src.model.modelo import DDL_BUSQUEDA_TAREAS, DDL_RESUMEN_TAREAS
+
+
+def crear_indices(engine: Engine):
+    """
+    Crea los índices declarados en los modelos que falten en la BD.
+
+    create_all solo crea los índices junto con su tabla, así que una BD
+    creada antes de declararlos necesita este paso.
+    """
+    # Se consulta sqlite_master en lugar de checkfirst porque la reflexión
+    # de SQLAlchemy no ve los índices sobre expresiones.
+    with engine.begin() as conn:
+        existentes = set(conn.scalars(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )))
+        for tabla in Base.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                if indice.name not in existentes:
+                    indice.create(bind=conn)
+
+
+def migrar_columnas(engine: Engine):
+    """
+    Agrega a una BD existente las columnas nuevas de los modelos.
+
+    - tareas.usuario_id: se rellena con el usuario_id de la materia.
+    """
+    columnas = {c["name"] for c in inspect(engine).get_columns("tareas")}
+    if "usuario_id" not in columnas:
+        with engine.begin() as conn:
+            conn.execute(text(
+                'ALTER TABLE tareas ADD COLUMN usuario_id INTEGER '
+                'REFERENCES usuarios ("idUsuario")'
+            ))
+            conn.execute(text(
+                'UPDATE tareas SET usuario_id = ('
+                'SELECT materias.usuario_id FROM materias '
+                'WHERE materias."idMateria" = tareas.materia_id)'
+            ))
+
+
+def crear_busqueda(engine: Engine):
+    """
+    Crea el índice FTS5 de tareas y sus triggers si faltan.
+
+    create_all solo los crea junto con la tabla tareas; en una BD anterior
+    se crean aquí y se llena el índice con las tareas existentes.
+    """
+    with engine.begin() as conn:
+        existe = conn.scalar(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tareas_fts'"
+        ))
+        for sentencia in DDL_BUSQUEDA_TAREAS:
+            conn.execute(text(sentencia))
+        if not existe:
+            conn.execute(text("INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')"))
+
+
+def huella_esquema(engine: Engine) -> int:
+    """
+    Huella del esquema que declaran los modelos: un hash del DDL de tablas,
+    índices, búsqueda y resumen, reducido a un entero positivo de 31 bits
+    para guardarlo en PRAGMA user_version.
+    """
+    ddl = []
+    for tabla in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(tabla).compile(dialect=engine.dialect)))
+        for indice in sorted(tabla.indexes, key=lambda i: i.name):
+            ddl.append(str(CreateIndex(indice).compile(dialect=engine.dialect)))
+    ddl.extend(DDL_BUSQUEDA_TAREAS)
+    ddl.extend(DDL_RESUMEN_TAREAS)
+    digest = hashlib.sha256("\n".join(ddl).encode()).digest()
+    return int.from_bytes(digest[:4], "big") & 0x7FFFFFFF
+
+
+def _leer_huella(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _olvidar_huella(metadata, conn, **kw):
+    """Tras drop_all la huella guardada ya no describe la BD."""
+    conn.exec_driver_sql("PRAGMA user_version = 0")
+
+
+def inicializar_bd(engine: Engine, forzar: bool = False):
+    """
+    Crea las tablas que falten, migra las existentes y pone al día índices
+    y búsqueda.
+
+    Si la huella guardada en PRAGMA user_version coincide con la de los
+    modelos no hace nada más que leerla. Tras tocar el esquema a mano se
+    usa forzar=True.
+    """
+    huella = huella_esquema(engine)
+    if not forzar:
+        with engine.connect() as conn:
+            if _leer_huella(conn) == huella:
+                return
+    Base.metadata.create_all(engine)
+    migrar_columnas(engine)
+    crear_indices(engine)
+    crear_busqueda(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {huella}")
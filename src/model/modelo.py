@@ -1,18 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Index, DDL, event
+from sqlalchemy import Boolean, PrimaryKeyConstraint
+from sqlalchemy import column, table, text
 from sqlalchemy.orm import relationship
 from src.model.declarative_base import Base
-import enum
+from src.model.enums import Prioridad, EstadoTarea
 
 
-class Prioridad(enum.Enum):
-    Baja = "Baja"
-    Media = "Media"
-    Alta = "Alta"
-
-
-class EstadoTarea(enum.Enum):
-    Pendiente = "Pendiente"
-    Completada = "Completada"
+# Rango de prioridad para ordenar (Alta primero). Es SQL literal para que
+# el ORDER BY de las consultas coincida con la expresión del índice.
+RANGO_PRIORIDAD_SQL = "CASE prioridad WHEN 'Alta' THEN 0 WHEN 'Media' THEN 1 ELSE 2 END"
 
 
 class Usuario(Base):
@@ -35,6 +31,10 @@ class Usuario(Base):
 
 class Materia(Base):
     __tablename__ = 'materias'
+    __table_args__ = (
+        # Materias de un usuario y chequeo de nombre duplicado por usuario
+        Index('ix_materias_usuario_nombre', 'usuario_id', 'nombre'),
+    )
 
     idMateria = Column(Integer, primary_key=True)
     nombre = Column(String, nullable=False)
@@ -60,6 +60,18 @@ class Materia(Base):
 
 class Tarea(Base):
     __tablename__ = 'tareas'
+    __table_args__ = (
+        # Tareas de una materia (cascade, listados) filtradas por estado/fecha
+        Index('ix_tareas_materia_estado_fecha', 'materia_id', 'estado', 'fechaEntrega'),
+        # Listados por usuario ordenados por fecha (el rowid desempata)
+        Index('ix_tareas_usuario_fecha', 'usuario_id', 'fechaEntrega'),
+        Index('ix_tareas_usuario_estado_fecha', 'usuario_id', 'estado', 'fechaEntrega'),
+        # Próximas entregas / vencidas: rango de fechas ya ordenado por prioridad
+        Index(
+            'ix_tareas_usuario_estado_fecha_prioridad',
+            'usuario_id', 'estado', 'fechaEntrega', text(RANGO_PRIORIDAD_SQL)
+        ),
+    )
 
     idTarea = Column(Integer, primary_key=True)
     titulo = Column(String, nullable=False)
@@ -81,7 +93,125 @@ class Tarea(Base):
         nullable=False
     )
 
+    # Copia de materia.usuario_id para chequear propiedad y listar por
+    # usuario sin pasar por materias; TaskManager la mantiene al crear y
+    # al mover la tarea de materia.
+    usuario_id = Column(
+        Integer,
+        ForeignKey('usuarios.idUsuario'),
+        nullable=False
+    )
+
     materia = relationship("Materia", back_populates="tareas")
 
     def __repr__(self):
         return f"<Tarea(id={self.idTarea}, titulo={self.titulo})>"
+
+
+class ResumenTarea(Base):
+    """
+    Cantidad de tareas por (materia, estado, prioridad). La mantienen los
+    triggers de tareas (ver DDL_RESUMEN_TAREAS); no se escribe desde Python.
+    """
+    __tablename__ = 'resumen_tareas'
+    __table_args__ = (
+        PrimaryKeyConstraint('materia_id', 'estado', 'prioridad'),
+    )
+
+    materia_id = Column(Integer, ForeignKey('materias.idMateria'), nullable=False)
+    estado = Column(Enum(EstadoTarea), nullable=False)
+    prioridad = Column(Enum(Prioridad), nullable=False)
+    total = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<ResumenTarea(materia={self.materia_id}, estado={self.estado}, "
+            f"prioridad={self.prioridad}, total={self.total})>"
+        )
+
+
+class Importacion(Base):
+    """
+    Progreso de una importación de tareas desde un archivo. Se actualiza
+    en la misma transacción que cada bloque importado, así que tras una
+    interrupción se puede reanudar después del último bloque confirmado.
+    """
+    __tablename__ = 'importaciones'
+    __table_args__ = (
+        Index('ix_importaciones_usuario_archivo', 'usuario_id', 'archivo'),
+    )
+
+    idImportacion = Column(Integer, primary_key=True)
+    usuario_id = Column(Integer, ForeignKey('usuarios.idUsuario'), nullable=False)
+    archivo = Column(String, nullable=False)
+    registros = Column(Integer, nullable=False, default=0)
+    importadas = Column(Integer, nullable=False, default=0)
+    rechazadas = Column(Integer, nullable=False, default=0)
+    completada = Column(Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return f"<Importacion(id={self.idImportacion}, archivo={self.archivo}, registros={self.registros})>"
+
+
+# ── Búsqueda de texto completo ────────────────────────────────────
+# Índice FTS5 con contenido externo sobre tareas(titulo, descripcion):
+# no duplica el texto, solo guarda el índice invertido, y los triggers lo
+# mantienen al día en la misma transacción que el cambio en tareas.
+tareas_fts = table("tareas_fts", column("rowid"), column("titulo"), column("descripcion"))
+
+DDL_BUSQUEDA_TAREAS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tareas_fts USING fts5("
+    "titulo, descripcion, content='tareas', content_rowid='idTarea', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER IF NOT EXISTS tareas_fts_ai AFTER INSERT ON tareas BEGIN '
+    'INSERT INTO tareas_fts(rowid, titulo, descripcion) '
+    'VALUES (new."idTarea", new.titulo, new.descripcion); END',
+    'CREATE TRIGGER IF NOT EXISTS tareas_fts_ad AFTER DELETE ON tareas BEGIN '
+    "INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion) "
+    "VALUES ('delete', old.\"idTarea\", old.titulo, old.descripcion); END",
+    # Solo cambios de texto: marcar/desmarcar no tocan el índice
+    'CREATE TRIGGER IF NOT EXISTS tareas_fts_au AFTER UPDATE OF titulo, descripcion ON tareas BEGIN '
+    "INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion) "
+    "VALUES ('delete', old.\"idTarea\", old.titulo, old.descripcion); "
+    'INSERT INTO tareas_fts(rowid, titulo, descripcion) '
+    'VALUES (new."idTarea", new.titulo, new.descripcion); END',
+)
+
+for _sentencia in DDL_BUSQUEDA_TAREAS:
+    event.listen(Tarea.__table__, "after_create", DDL(_sentencia))
+event.listen(Tarea.__table__, "before_drop", DDL("DROP TABLE IF EXISTS tareas_fts"))
+
+
+# ── Resumen por materia ───────────────────────────────────────────
+# Los triggers ajustan resumen_tareas en la misma transacción que el
+# cambio en tareas. Al crear la tabla se rellena con las tareas que ya
+# existan, así que una BD anterior queda al día con create_all.
+DDL_RESUMEN_TAREAS = (
+    'CREATE TRIGGER IF NOT EXISTS resumen_tareas_ai AFTER INSERT ON tareas BEGIN '
+    'INSERT INTO resumen_tareas (materia_id, estado, prioridad, total) '
+    'VALUES (new.materia_id, new.estado, new.prioridad, 1) '
+    'ON CONFLICT (materia_id, estado, prioridad) DO UPDATE SET total = total + 1; END',
+    'CREATE TRIGGER IF NOT EXISTS resumen_tareas_ad AFTER DELETE ON tareas BEGIN '
+    'UPDATE resumen_tareas SET total = total - 1 '
+    'WHERE materia_id = old.materia_id AND estado = old.estado AND prioridad = old.prioridad; END',
+    'CREATE TRIGGER IF NOT EXISTS resumen_tareas_au '
+    'AFTER UPDATE OF materia_id, estado, prioridad ON tareas BEGIN '
+    'UPDATE resumen_tareas SET total = total - 1 '
+    'WHERE materia_id = old.materia_id AND estado = old.estado AND prioridad = old.prioridad; '
+    'INSERT INTO resumen_tareas (materia_id, estado, prioridad, total) '
+    'VALUES (new.materia_id, new.estado, new.prioridad, 1) '
+    'ON CONFLICT (materia_id, estado, prioridad) DO UPDATE SET total = total + 1; END',
+    # Las tareas de la materia ya se borraron en cascada; quedan filas en cero
+    'CREATE TRIGGER IF NOT EXISTS resumen_tareas_materia_ad AFTER DELETE ON materias BEGIN '
+    'DELETE FROM resumen_tareas WHERE materia_id = old."idMateria"; END',
+    'INSERT INTO resumen_tareas (materia_id, estado, prioridad, total) '
+    'SELECT materia_id, estado, prioridad, count(*) FROM tareas '
+    'GROUP BY materia_id, estado, prioridad',
+)
+
+# resumen_tareas se crea después de tareas para poder crear los triggers
+ResumenTarea.__table__.add_is_dependent_on(Tarea.__table__)
+for _sentencia in DDL_RESUMEN_TAREAS:
+    event.listen(ResumenTarea.__table__, "after_create", DDL(_sentencia))
+for _trigger in ("resumen_tareas_ai", "resumen_tareas_ad", "resumen_tareas_au", "resumen_tareas_materia_ad"):
+    event.listen(ResumenTarea.__table__, "before_drop", DDL(f"DROP TRIGGER IF EXISTS {_trigger}"))
@@ -0,0 +1,12 @@
+import os
+
+# Las pruebas usan una BD en memoria (y nunca src/model/db.sqlite), salvo
+# que TASKMANAGER_BD indique otra ubicación.
+os.environ.setdefault("TASKMANAGER_BD", ":memory:")
+
+# Con pytest-xdist cada worker es un proceso: en memoria ya tiene su propia
+# BD; si TASKMANAGER_BD es un archivo, cada worker usa uno con su nombre.
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker and os.environ["TASKMANAGER_BD"] != ":memory:" and "://" not in os.environ["TASKMANAGER_BD"]:
+    _raiz, _extension = os.path.splitext(os.environ["TASKMANAGER_BD"])
+    os.environ["TASKMANAGER_BD"] = f"{_raiz}-{_worker}{_extension}"
@@ -0,0 +1,131 @@
+"""
+BD de las pruebas.
+
+Cada proceso que corre pruebas (cada worker, si se reparten) usa su propia
+BD: la de TASKMANAGER_BD, en memoria por defecto (ver tests/__init__.py).
+El esquema no se crea con DROP/CREATE en cada prueba: se construye una
+sola vez en una plantilla (un archivo en el directorio temporal, uno por
+huella del esquema, que comparten todos los workers) y se copia a la BD
+del proceso con la API de backup de SQLite.
+
+- PruebaConBD envuelve cada prueba en una transacción que se deshace al
+  terminar. Los TaskManager creados sin engine escriben en esa
+  transacción (cada commit suyo es un SAVEPOINT), así que nada se
+  confirma y la siguiente prueba encuentra la BD vacía.
+- PruebaConCommits es para las pruebas que necesitan commits de verdad
+  (transaccion() contando commits, hilos, el servidor HTTP, cambios de
+  esquema): restaura la BD desde la plantilla después de cada una.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.logic import task_manager
+from src.model.declarative_base import crear_engine, engine
+from src.model.esquema import huella_esquema, inicializar_bd
+
+# Sentencias de control de las transacciones de PruebaConBD, que no cuentan
+# como SQL de la operación probada.
+_CONTROL = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN")
+
+_lock = threading.Lock()
+_plantilla = None
+_bd_lista = False
+
+
+def plantilla() -> str:
+    """
+    Ruta de la plantilla con el esquema vacío, creada la primera vez. Se
+    escribe en un archivo aparte y se renombra, así que un worker nunca ve
+    la de otro a medio crear.
+    """
+    global _plantilla
+    if _plantilla is None:
+        ruta = os.path.join(tempfile.gettempdir(), f"taskmanager-pruebas-{huella_esquema(engine)}.sqlite")
+        if not os.path.exists(ruta):
+            temporal = f"{ruta}.{os.getpid()}"
+            nuevo = crear_engine(temporal, perfil="fast")
+            inicializar_bd(nuevo)
+            nuevo.dispose()
+            os.replace(temporal, ruta)
+        _plantilla = ruta
+    return _plantilla
+
+
+def restaurar_bd():
+    """Deja la BD de este proceso igual que la plantilla: esquema sin datos."""
+    global _bd_lista
+    with _lock:
+        origen = sqlite3.connect(plantilla())
+        try:
+            with engine.connect() as conn:
+                origen.backup(conn.connection.dbapi_connection)
+        finally:
+            origen.close()
+        _bd_lista = True
+
+
+def preparar_bd():
+    """Copia la plantilla a la BD de este proceso, solo la primera vez."""
+    if not _bd_lista:
+        restaurar_bd()
+
+
+def capturar_sentencias(operacion) -> list:
+    """
+    Ejecuta `operacion` y retorna el SQL emitido por cualquier engine (las
+    lecturas van por el de solo lectura), sin BEGIN/SAVEPOINT/RELEASE/
+    ROLLBACK.
+    """
+    sentencias = []
+
+    def antes(conn, cursor, sentencia, *args):
+        if not sentencia.lstrip().upper().startswith(_CONTROL):
+            sentencias.append(sentencia)
+
+    event.listen(Engine, "before_cursor_execute", antes)
+    try:
+        operacion()
+    finally:
+        event.remove(Engine, "before_cursor_execute", antes)
+    return sentencias
+
+
+class PruebaConBD(unittest.TestCase):
+    """
+    Cada prueba corre dentro de una transacción de `self.conexion` que se
+    deshace al terminar. El SQL directo de la prueba también tiene que ir
+    por `self.conexion`: otra conexión no vería sus cambios (o, en
+    memoria, chocaría con sus locks).
+    """
+
+    def setUp(self):
+        preparar_bd()
+        self.conexion = engine.connect()
+        # Como en TaskManager.transaccion(): sin el manejo de transacciones
+        # de pysqlite, para que los SAVEPOINT no confirmen nada.
+        driver = self.conexion.connection.dbapi_connection
+        nivel_anterior = driver.isolation_level
+        driver.isolation_level = None
+        transaccion = self.conexion.begin()
+        self.conexion.exec_driver_sql("BEGIN")
+        task_manager.Session.configure(bind=self.conexion, join_transaction_mode="create_savepoint")
+
+        def deshacer():
+            task_manager.Session.configure(bind=engine, join_transaction_mode="conditional_savepoint")
+            transaccion.rollback()
+            driver.isolation_level = nivel_anterior
+            self.conexion.close()
+
+        self.addCleanup(deshacer)
+
+
+class PruebaConCommits(unittest.TestCase):
+    """Al terminar cada prueba, la BD vuelve a copiarse de la plantilla."""
+
+    def setUp(self):
+        preparar_bd()
+        self.addCleanup(restaurar_bd)
@@ -0,0 +1,90 @@
+"""
+Corre la suite repartida en varios procesos, cada uno con su propia BD.
+
+Recolecta las pruebas con pytest --collect-only, reparte las clases entre
+N procesos pytest equilibrando la cantidad de pruebas y le da a cada uno
+su BD: en memoria (por defecto) o, con --archivos, un archivo propio en
+un directorio temporal. La plantilla del esquema (tests/bd.py) la
+comparten todos. Reporta el tiempo de cada proceso y el total.
+
+Con pytest-xdist instalado `python -m pytest -n N` también aísla las BD
+(ver tests/__init__.py); este script no lo necesita.
+
+Uso:
+    python -m tests.paralelo [-n N] [--archivos] [rutas de pruebas...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VARIABLE_BD = "TASKMANAGER_BD"
+
+
+def recolectar(rutas: list) -> dict:
+    """{"archivo::Clase": cantidad de pruebas} de las pruebas en `rutas`."""
+    salida = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *rutas],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout
+    clases = defaultdict(int)
+    for linea in salida.splitlines():
+        partes = linea.split("::")
+        if len(partes) >= 2:
+            clases["::".join(partes[:2])] += 1
+    return clases
+
+
+def repartir(clases: dict, procesos: int) -> list:
+    """Asigna cada clase, de la más grande a la más chica, al proceso con menos pruebas."""
+    grupos = [[] for _ in range(procesos)]
+    cargas = [0] * procesos
+    for clase, cantidad in sorted(clases.items(), key=lambda c: -c[1]):
+        menos = cargas.index(min(cargas))
+        grupos[menos].append(clase)
+        cargas[menos] += cantidad
+    return [grupo for grupo in grupos if grupo]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--archivos", action="store_true", help="una BD en archivo por proceso")
+    parser.add_argument("rutas", nargs="*", default=["tests"])
+    args = parser.parse_args(argv)
+
+    grupos = repartir(recolectar(args.rutas), max(1, args.procesos))
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        corriendo = []
+        for i, grupo in enumerate(grupos):
+            entorno = dict(os.environ)
+            entorno[VARIABLE_BD] = os.path.join(tmp, f"pruebas-{i}.sqlite") if args.archivos else ":memory:"
+            salida = open(os.path.join(tmp, f"salida-{i}.txt"), "w+")
+            proceso = subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *grupo],
+                cwd=RAIZ, env=entorno, stdout=salida, stderr=subprocess.STDOUT
+            )
+            corriendo.append((proceso, salida, time.perf_counter()))
+
+        codigo = 0
+        for i, (proceso, salida, desde) in enumerate(corriendo):
+            proceso.wait()
+            duracion = time.perf_counter() - desde
+            salida.seek(0)
+            lineas = salida.read().splitlines()
+            salida.close()
+            if proceso.returncode != 0:
+                codigo = proceso.returncode
+                print("\n".join(lineas))
+            print(f"proceso {i}: {lineas[-1] if lineas else '(sin salida)'} [{duracion:.2f} s]")
+        print(f"total: {len(grupos)} procesos, {time.perf_counter() - inicio:.2f} s")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
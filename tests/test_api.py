@@ -0,0 +1,264 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+from src.api.servidor import CABECERA_USUARIO, MAX_CUERPO, ManejadorAPI, ServidorAPI, crear_servidor
+from src.logic.task_manager import TaskManager
+from tests.bd import PruebaConCommits
+
+
+# ══════════════════════════════════════════════════════════════════
+# SERVICIO HTTP/JSON
+# ══════════════════════════════════════════════════════════════════
+
+class TestServidorAPI(PruebaConCommits):
+
+    def setUp(self):
+        super().setUp()
+        self.servidor = ServidorAPI(("127.0.0.1", 0), TaskManager(), hilos=4)
+        self.hilo = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.hilo.start()
+        self.conexion = http.client.HTTPConnection("127.0.0.1", self.servidor.server_address[1], timeout=10)
+
+        self.usuario = self.pedir("POST", "/usuarios", {"nombre": "Juan Lopez", "correo": "juan@mail.com"})[1]
+        self.id_usuario = self.usuario["idUsuario"]
+        self.materia = self.pedir("POST", "/materias", {"nombre": "Matemáticas", "color": "#FF5733"})[1]
+        self.entrega = date.today() + timedelta(days=2)
+
+    def tearDown(self):
+        self.conexion.close()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.hilo.join()
+
+    def pedir(self, metodo, ruta, cuerpo=None, usuario=None):
+        cabeceras = {CABECERA_USUARIO: str(usuario or getattr(self, "id_usuario", ""))}
+        if not cabeceras[CABECERA_USUARIO]:
+            cabeceras = {}
+        datos = None
+        if cuerpo is not None:
+            datos = json.dumps(cuerpo).encode("utf-8")
+            cabeceras["Content-Type"] = "application/json"
+        self.conexion.request(metodo, ruta, body=datos, headers=cabeceras)
+        respuesta = self.conexion.getresponse()
+        contenido = respuesta.read()
+        return respuesta.status, json.loads(contenido) if contenido else None
+
+    def crear_tarea(self, titulo="Estudiar", prioridad="Alta", dias=2):
+        return self.pedir("POST", "/tareas", {
+            "titulo": titulo,
+            "descripcion": "Capítulo 3",
+            "prioridad": prioridad,
+            "fechaEntrega": (date.today() + timedelta(days=dias)).isoformat(),
+            "materia_id": self.materia["idMateria"],
+        })
+
+    def test_crear_y_ver_tarea(self):
+        estado, tarea = self.crear_tarea()
+        self.assertEqual(estado, 201)
+        self.assertEqual(tarea["prioridad"], "Alta")
+        self.assertEqual(tarea["estado"], "Pendiente")
+        self.assertEqual(tarea["fechaEntrega"], self.entrega.isoformat())
+
+        estado, vista = self.pedir("GET", f"/tareas/{tarea['idTarea']}")
+        self.assertEqual(estado, 200)
+        self.assertEqual(vista, tarea)
+
+    def test_editar_marcar_y_eliminar_tarea(self):
+        tarea = self.crear_tarea()[1]
+        ruta = f"/tareas/{tarea['idTarea']}"
+
+        estado, editada = self.pedir("PATCH", ruta, {"titulo": "Repasar", "prioridad": "Baja"})
+        self.assertEqual(estado, 200)
+        self.assertEqual((editada["titulo"], editada["prioridad"]), ("Repasar", "Baja"))
+
+        self.assertEqual(self.pedir("POST", ruta + "/marcar")[1]["estado"], "Completada")
+        self.assertEqual(self.pedir("POST", ruta + "/desmarcar")[1]["estado"], "Pendiente")
+
+        self.assertEqual(self.pedir("DELETE", ruta), (204, None))
+        self.assertEqual(self.pedir("GET", ruta)[0], 404)
+
+    def test_listar_tareas_pagina_con_cursor(self):
+        for i in range(5):
+            self.crear_tarea(f"Tarea {i}", dias=i + 1)
+
+        estado, pagina = self.pedir("GET", "/tareas?limite=3")
+        self.assertEqual(estado, 200)
+        self.assertEqual([t["titulo"] for t in pagina["tareas"]], ["Tarea 0", "Tarea 1", "Tarea 2"])
+
+        siguiente = self.pedir("GET", f"/tareas?limite=3&cursor={pagina['siguiente']}")[1]
+        self.assertEqual([t["titulo"] for t in siguiente["tareas"]], ["Tarea 3", "Tarea 4"])
+        self.assertIsNone(siguiente["siguiente"])
+
+    def test_listar_tareas_filtra_por_prioridad(self):
+        self.crear_tarea("Alta", prioridad="Alta")
+        self.crear_tarea("Baja", prioridad="Baja")
+        tareas = self.pedir("GET", "/tareas?prioridad=Baja")[1]["tareas"]
+        self.assertEqual([t["titulo"] for t in tareas], ["Baja"])
+
+    def test_materias_crud(self):
+        ruta = f"/materias/{self.materia['idMateria']}"
+        self.assertEqual(self.pedir("PATCH", ruta, {"color": "#000000"})[1]["color"], "#000000")
+        self.assertEqual(self.pedir("GET", "/materias")[1][0]["nombre"], "Matemáticas")
+        self.assertEqual(self.pedir("DELETE", ruta)[0], 204)
+        self.assertEqual(self.pedir("GET", "/materias")[1], [])
+
+    def test_buscar_resumen_y_entregas(self):
+        tarea = self.crear_tarea("Informe de laboratorio")[1]
+
+        encontradas = self.pedir("GET", "/tareas/buscar?q=laborat")[1]
+        self.assertEqual([t["idTarea"] for t in encontradas], [tarea["idTarea"]])
+
+        resumen = self.pedir("GET", "/resumen")[1]
+        self.assertEqual(resumen["total"], 1)
+        self.assertEqual(resumen["por_prioridad"]["Alta"], 1)
+
+        proximas = self.pedir("GET", "/entregas/proximas?dias=7")[1]
+        self.assertEqual([t["idTarea"] for t in proximas], [tarea["idTarea"]])
+        self.assertEqual(self.pedir("GET", "/entregas/vencidas")[1], [])
+
+    def test_sin_cabecera_de_usuario_responde_401(self):
+        del self.id_usuario
+        estado, cuerpo = self.pedir("GET", "/tareas")
+        self.assertEqual(estado, 401)
+        self.assertIn(CABECERA_USUARIO, cuerpo["error"])
+
+    def test_usuario_inexistente_responde_401(self):
+        self.assertEqual(self.pedir("GET", "/tareas", usuario=999)[0], 401)
+
+    def test_tarea_de_otro_usuario_no_se_ve(self):
+        tarea = self.crear_tarea()[1]
+        otro = self.pedir("POST", "/usuarios", {"nombre": "Ana Ruiz", "correo": "ana@mail.com"})[1]
+
+        estado, _ = self.pedir("GET", f"/tareas/{tarea['idTarea']}", usuario=otro["idUsuario"])
+        self.assertEqual(estado, 404)
+        estado, _ = self.pedir("DELETE", f"/tareas/{tarea['idTarea']}", usuario=otro["idUsuario"])
+        self.assertEqual(estado, 403)
+        self.assertEqual(self.pedir("GET", "/tareas", usuario=otro["idUsuario"])[1]["tareas"], [])
+
+    def test_errores_de_validacion_responden_400(self):
+        self.assertEqual(self.crear_tarea(titulo="")[0], 400)
+        self.assertEqual(self.crear_tarea(prioridad="Urgente")[0], 400)
+        self.assertEqual(self.pedir("GET", "/tareas?limite=abc")[0], 400)
+
+    def test_cuerpo_invalido_responde_400(self):
+        self.conexion.request("POST", "/materias", body=b"{no es json",
+                              headers={CABECERA_USUARIO: str(self.id_usuario)})
+        respuesta = self.conexion.getresponse()
+        self.assertEqual(respuesta.status, 400)
+        self.assertIn("JSON", json.loads(respuesta.read())["error"])
+
+    def test_campos_de_otro_tipo_responden_400(self):
+        self.assertEqual(self.pedir("POST", "/usuarios", {"nombre": 123, "correo": "x@mail.com"})[0], 400)
+        self.assertEqual(self.crear_tarea(titulo=["Estudiar"])[0], 400)
+        self.assertEqual(self.crear_tarea(prioridad={"Alta": 1})[0], 400)
+        estado, cuerpo = self.pedir("PATCH", f"/materias/{self.materia['idMateria']}", {"color": 255})
+        self.assertEqual(estado, 400)
+        self.assertIn("color", cuerpo["error"])
+        estado, _ = self.pedir("POST", "/tareas", {
+            "titulo": "Estudiar", "prioridad": "Alta", "fechaEntrega": self.entrega.isoformat(), "materia_id": True
+        })
+        self.assertEqual(estado, 400)
+
+    def test_content_length_negativo_responde_400(self):
+        self.conexion.request("POST", "/materias", headers={
+            CABECERA_USUARIO: str(self.id_usuario), "Content-Length": "-1"
+        })
+        self.assertEqual(self.conexion.getresponse().status, 400)
+
+    def crudo(self, datos: bytes) -> bytes:
+        """Envía bytes por un socket propio y lee hasta que el servidor cierra."""
+        with socket.create_connection(self.servidor.server_address, timeout=10) as s:
+            s.sendall(datos)
+            recibido = b""
+            while True:
+                parte = s.recv(65536)
+                if not parte:
+                    return recibido
+                recibido += parte
+
+    def test_cuerpo_rechazado_sin_leer_cierra_la_conexion(self):
+        """Los bytes del cuerpo no se interpretan como otra petición."""
+        escondida = b"GET /usuarios HTTP/1.1\r\nHost: x\r\n\r\n"
+        for largo in (b"-5", b"cinco", str(MAX_CUERPO + 1).encode()):
+            respuesta = self.crudo(
+                b"POST /materias HTTP/1.1\r\nHost: x\r\nX-Usuario-Id: " + str(self.id_usuario).encode()
+                + b"\r\nContent-Length: " + largo + b"\r\n\r\n" + escondida
+            )
+            self.assertEqual(respuesta.count(b"HTTP/1.1 "), 1, respuesta)
+            self.assertFalse(respuesta.startswith(b"HTTP/1.1 200"))
+
+    def test_cuerpo_leido_mantiene_la_conexion(self):
+        estado, _ = self.pedir("POST", "/materias", {"nombre": 5})
+        self.assertEqual(estado, 400)
+        self.assertEqual(self.pedir("GET", "/materias")[0], 200)
+
+    def test_conexion_inactiva_se_cierra(self):
+        self.assertIsNotNone(ManejadorAPI.timeout)
+        with mock.patch.object(ManejadorAPI, "timeout", 0.2):
+            inicio = time.monotonic()
+            self.assertEqual(self.crudo(b""), b"")
+        self.assertLess(time.monotonic() - inicio, 5)
+
+    def test_cerrar_con_un_cliente_conectado(self):
+        """server_close no espera a que los clientes keep-alive se vayan."""
+        self.assertEqual(self.pedir("GET", "/materias")[0], 200)
+        self.servidor.shutdown()
+        cierre = threading.Thread(target=self.servidor.server_close)
+        cierre.start()
+        cierre.join(5)
+        self.assertFalse(cierre.is_alive())
+
+    def test_crear_servidor_no_cachea(self):
+        """Otros procesos (CLI, lotes, importaciones) escriben la misma BD."""
+        with tempfile.TemporaryDirectory() as tmp:
+            servidor = crear_servidor(puerto=0, hilos=1, ruta_bd=os.path.join(tmp, "api.sqlite"))
+            try:
+                self.assertFalse(servidor.tm.estadisticas_cache()["activa"])
+            finally:
+                servidor.server_close()
+                servidor.tm.engine.dispose()
+
+    def test_ruta_y_metodo_desconocidos(self):
+        self.assertEqual(self.pedir("GET", "/inexistente")[0], 404)
+        self.assertEqual(self.pedir("PUT", "/tareas")[0], 405)
+        self.assertEqual(self.pedir("DELETE", "/tareas")[0], 405)
+
+    def test_peticiones_concurrentes(self):
+        errores = []
+
+        def cliente(n):
+            conexion = http.client.HTTPConnection("127.0.0.1", self.servidor.server_address[1], timeout=10)
+            try:
+                for i in range(5):
+                    cuerpo = json.dumps({
+                        "titulo": f"Tarea {n} {i}", "descripcion": "", "prioridad": "Media",
+                        "fechaEntrega": self.entrega.isoformat(), "materia_id": self.materia["idMateria"],
+                    })
+                    conexion.request("POST", "/tareas", body=cuerpo,
+                                     headers={CABECERA_USUARIO: str(self.id_usuario)})
+                    respuesta = conexion.getresponse()
+                    respuesta.read()
+                    if respuesta.status != 201:
+                        errores.append(respuesta.status)
+            finally:
+                conexion.close()
+
+        hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(self.pedir("GET", "/resumen")[1]["total"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
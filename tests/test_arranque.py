@@ -0,0 +1,51 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de `import main` (acumulado, según python -X importtime).
+# Sin SQLAlchemy ronda los 10-20 ms; cargarlo de nuevo al importar
+# supera los 250 ms.
+PRESUPUESTO_IMPORT_MS = 100
+
+
+def ejecutar(*argumentos) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *argumentos],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+
+
+# ══════════════════════════════════════════════════════════════════
+# ARRANQUE DE main.py
+# ══════════════════════════════════════════════════════════════════
+
+class TestArranque(unittest.TestCase):
+
+    def test_rojo_importar_main_no_carga_el_orm(self):
+        """Importar main.py no carga SQLAlchemy ni los modelos."""
+        resultado = ejecutar(
+            "-c",
+            "import sys, main; "
+            "print(sorted(m for m in ('sqlalchemy', 'src.model.modelo', 'src.logic.task_manager') "
+            "if m in sys.modules))"
+        )
+        self.assertEqual(resultado.stdout.strip(), "[]")
+
+    def test_verde_import_dentro_del_presupuesto(self):
+        """python -X importtime: `import main` cabe en el presupuesto de arranque."""
+        ejecutar("-c", "import main")  # compila los .pyc
+        tiempos = []
+        for _ in range(3):
+            salida = ejecutar("-X", "importtime", "-c", "import main").stderr
+            acumulado = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| main$", salida, re.M)
+            self.assertIsNotNone(acumulado, salida[-500:])
+            tiempos.append(int(acumulado.group(1)) / 1000)
+        self.assertLess(min(tiempos), PRESUPUESTO_IMPORT_MS, f"import main: {tiempos} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
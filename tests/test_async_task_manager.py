@@ -0,0 +1,175 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+from src.logic.async_task_manager import AsyncTaskManager, crear_engine_async
+from src.model.declarative_base import MEMORIA, VARIABLE_BD, Base
+from sqlalchemy import func, select
+from src.model.modelo import Importacion, Prioridad, EstadoTarea
+
+
+class BaseAsyncTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = crear_engine_async(os.path.join(self.tmp.name, "async.sqlite"))
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.tm = AsyncTaskManager(self.engine)
+        usuario = await self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        await self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = await self.tm.crear_materia("Matemáticas", "#FF5733")
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.tmp.cleanup()
+
+    async def crear_tarea(self, titulo="Estudiar capítulo uno", materia_id=None):
+        return await self.tm.crear_tarea(
+            titulo, "Descripción de prueba", Prioridad.Media,
+            date.today(), materia_id or self.materia.idMateria
+        )
+
+
+# ══════════════════════════════════════════════════════════════════
+# ASYNC TASK MANAGER
+# ══════════════════════════════════════════════════════════════════
+
+class TestAsyncTaskManager(BaseAsyncTest):
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    async def test_rojo_validaciones_compartidas(self):
+        """Las validaciones y sus mensajes son los del TaskManager síncrono."""
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.crear_usuario("Ab", "otro@mail.com")
+        self.assertIn("nombre", str(ctx.exception).lower())
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.crear_tarea("x", "", Prioridad.Alta, date.today(), self.materia.idMateria)
+        self.assertIn("título", str(ctx.exception).lower())
+
+    async def test_rojo_sin_usuario_activo(self):
+        """Sin usuario activo las operaciones protegidas fallan."""
+        self.tm.usuario_activo = None
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.crear_materia("Historia", "#123456")
+        self.assertIn("usuario", str(ctx.exception).lower())
+
+    async def test_rojo_tarea_de_otro_usuario(self):
+        """Marcar, editar y eliminar tareas ajenas falla con el mensaje original."""
+        tarea = await self.crear_tarea()
+        otro = await self.tm.crear_usuario("Pedro Garcia", "pedro@mail.com")
+        await self.tm.seleccionar_usuario(otro.idUsuario)
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.marcar_tarea(tarea.idTarea)
+        self.assertEqual(str(ctx.exception), "No puede modificar una tarea de otro usuario")
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.editar_tarea(tarea.idTarea, nuevo_titulo="Robar tarea")
+        self.assertEqual(str(ctx.exception), "No puede editar una tarea de otro usuario")
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.eliminar_tarea(tarea.idTarea)
+        self.assertEqual(str(ctx.exception), "No puede eliminar una tarea de otro usuario")
+
+    async def test_rojo_eliminar_usuario_con_materias(self):
+        with self.assertRaises(ValueError) as ctx:
+            await self.tm.eliminar_usuario(self.tm.usuario_activo.idUsuario)
+        self.assertIn("materias", str(ctx.exception).lower())
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    async def test_verde_ciclo_completo_de_tarea(self):
+        """Crear, marcar, desmarcar, editar y eliminar una tarea."""
+        tarea = await self.crear_tarea()
+        self.assertEqual(tarea.estado, EstadoTarea.Pendiente)
+        self.assertEqual((await self.tm.marcar_tarea(tarea.idTarea)).estado, EstadoTarea.Completada)
+        self.assertEqual((await self.tm.desmarcar_tarea(tarea.idTarea)).estado, EstadoTarea.Pendiente)
+
+        otra = await self.tm.crear_materia("Historia", "#123456")
+        editada = await self.tm.editar_tarea(
+            tarea.idTarea,
+            nuevo_titulo="Repasar tema dos",
+            nueva_fecha_entrega=date.today() + timedelta(days=2),
+            nueva_materia_id=otra.idMateria
+        )
+        self.assertEqual(editada.titulo, "Repasar tema dos")
+        self.assertEqual(editada.materia_id, otra.idMateria)
+
+        self.assertTrue(await self.tm.eliminar_tarea(tarea.idTarea))
+        self.assertIsNone(await self.tm.seleccionar_tarea(tarea.idTarea))
+
+    async def test_verde_eliminar_materia_con_cascade(self):
+        tarea = await self.crear_tarea()
+        self.assertTrue(await self.tm.eliminar_materia(self.materia.idMateria))
+        self.assertIsNone(await self.tm.seleccionar_materia(self.materia.idMateria))
+        self.assertIsNone(await self.tm.seleccionar_tarea(tarea.idTarea))
+
+    async def test_verde_editar_y_eliminar_usuario(self):
+        await self.tm.eliminar_materia(self.materia.idMateria)
+        editado = await self.tm.editar_usuario(
+            self.tm.usuario_activo.idUsuario, nuevo_nombre="Juan Perez"
+        )
+        self.assertEqual(self.tm.usuario_activo.nombre, "Juan Perez")
+        self.assertTrue(await self.tm.eliminar_usuario(editado.idUsuario))
+        self.assertIsNone(self.tm.usuario_activo)
+
+    async def test_verde_eliminar_usuario_borra_sus_importaciones(self):
+        """Como en el TaskManager síncrono, el progreso de sus importaciones se va con él."""
+        await self.tm.eliminar_materia(self.materia.idMateria)
+        id_usuario = self.tm.usuario_activo.idUsuario
+        async with self.engine.begin() as conn:
+            await conn.execute(Importacion.__table__.insert().values(
+                usuario_id=id_usuario, archivo="tareas.csv", registros=0, importadas=0,
+                rechazadas=0, completada=True
+            ))
+        self.assertTrue(await self.tm.eliminar_usuario(id_usuario))
+        async with self.engine.connect() as conn:
+            self.assertEqual(await conn.scalar(select(func.count()).select_from(Importacion)), 0)
+
+    async def test_verde_varios_usuarios_concurrentes(self):
+        """Instancias que comparten engine atienden usuarios en paralelo."""
+        async def sesion_de_usuario(i):
+            tm = AsyncTaskManager(self.engine)
+            usuario = await tm.crear_usuario(f"Usuario {chr(65 + i)}", f"u{i}@mail.com")
+            await tm.seleccionar_usuario(usuario.idUsuario)
+            materia = await tm.crear_materia("Materia propia", "#123456")
+            for n in range(5):
+                await tm.crear_tarea(f"Tarea numero {n}", "", Prioridad.Baja,
+                                     date.today(), materia.idMateria)
+            return materia
+
+        materias = await asyncio.gather(*(sesion_de_usuario(i) for i in range(3)))
+        self.assertEqual(len({m.idMateria for m in materias}), 3)
+        self.assertEqual(len(await self.tm.listar_usuarios()), 4)
+
+
+class TestCrearEngineAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_verde_usa_la_bd_de_la_variable_de_entorno(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "entorno.sqlite")
+            with mock.patch.dict(os.environ, {VARIABLE_BD: ruta}):
+                engine = crear_engine_async()
+            try:
+                self.assertEqual(engine.url.database, ruta)
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                self.assertTrue(os.path.exists(ruta))
+            finally:
+                await engine.dispose()
+
+    async def test_verde_en_memoria_las_sesiones_comparten_la_bd(self):
+        engine = crear_engine_async(MEMORIA)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            usuario = await AsyncTaskManager(engine).crear_usuario("Juan Lopez", "juan@mail.com")
+            tm = AsyncTaskManager(engine)
+            self.assertEqual((await tm.seleccionar_usuario(usuario.idUsuario)).correo, "juan@mail.com")
+        finally:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
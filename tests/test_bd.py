@@ -0,0 +1,55 @@
+import unittest
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import engine
+from src.model.esquema import huella_esquema
+from tests.bd import PruebaConBD, PruebaConCommits
+
+
+def contar_usuarios() -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT count(*) FROM usuarios").scalar()
+
+
+def correr(clase) -> unittest.TestResult:
+    resultado = unittest.TestResult()
+    clase("test_escribe").run(resultado)
+    return resultado
+
+
+# ══════════════════════════════════════════════════════════════════
+# FIXTURES DE BD DE LAS PRUEBAS
+# ══════════════════════════════════════════════════════════════════
+
+class TestFixturesBD(unittest.TestCase):
+    """Las clases de prueba se definen adentro para que pytest no las recolecte."""
+
+    def test_verde_prueba_con_bd_deshace_todo(self):
+        """Ni los commits ni transaccion() de la prueba sobreviven al rollback."""
+        class Escribe(PruebaConBD):
+            def test_escribe(self):
+                tm = TaskManager()
+                tm.crear_usuario("Juan Lopez", "juan@mail.com")
+                with tm.transaccion():
+                    tm.crear_usuario("Pedro Garcia", "pedro@mail.com")
+                self.assertEqual(len(tm.listar_usuarios()), 2)
+
+        resultado = correr(Escribe)
+        self.assertTrue(resultado.wasSuccessful(), resultado.errors + resultado.failures)
+        self.assertEqual(contar_usuarios(), 0)
+
+    def test_verde_prueba_con_commits_restaura_la_plantilla(self):
+        class Escribe(PruebaConCommits):
+            def test_escribe(self):
+                TaskManager().crear_usuario("Juan Lopez", "juan@mail.com")
+                self.assertEqual(contar_usuarios(), 1)
+
+        resultado = correr(Escribe)
+        self.assertTrue(resultado.wasSuccessful(), resultado.errors + resultado.failures)
+        self.assertEqual(contar_usuarios(), 0)
+        with engine.connect() as conn:
+            huella = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        self.assertEqual(huella, huella_esquema(engine))
+
+
+if __name__ == "__main__":
+    unittest.main()
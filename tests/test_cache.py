@@ -0,0 +1,62 @@
+import unittest
+from src.logic.cache import CacheLRU
+
+
+# ══════════════════════════════════════════════════════════════════
+# CACHÉ LRU
+# ══════════════════════════════════════════════════════════════════
+
+class TestCacheLRU(unittest.TestCase):
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_capacidad_invalida(self):
+        """Una capacidad <= 0 debe lanzar ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            CacheLRU(0)
+        self.assertIn("capacidad", str(ctx.exception).lower())
+
+    def test_rojo_cache_desactivada_no_guarda(self):
+        """Con activa=False nada se guarda ni se cuenta."""
+        cache = CacheLRU(activa=False)
+        cache.guardar("a", 1)
+        self.assertIsNone(cache.obtener("a"))
+        self.assertEqual(cache.estadisticas()["tamano"], 0)
+        self.assertEqual(cache.estadisticas()["fallos"], 0)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_aciertos_y_fallos(self):
+        """obtener() cuenta aciertos y fallos."""
+        cache = CacheLRU()
+        cache.guardar("a", 1)
+        self.assertEqual(cache.obtener("a"), 1)
+        self.assertIsNone(cache.obtener("b"))
+        stats = cache.estadisticas()
+        self.assertEqual((stats["aciertos"], stats["fallos"]), (1, 1))
+
+    def test_verde_expulsa_la_menos_usada(self):
+        """Al superar la capacidad sale la clave usada hace más tiempo."""
+        cache = CacheLRU(capacidad=2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        cache.obtener("a")
+        cache.guardar("c", 3)
+        self.assertEqual(cache.obtener("a"), 1)
+        self.assertIsNone(cache.obtener("b"))
+        self.assertEqual(cache.obtener("c"), 3)
+
+    def test_verde_invalidar_y_limpiar(self):
+        """invalidar() quita claves y limpiar() reinicia todo."""
+        cache = CacheLRU()
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        cache.invalidar("a", "inexistente")
+        self.assertIsNone(cache.obtener("a"))
+        cache.limpiar()
+        self.assertEqual(cache.estadisticas()["tamano"], 0)
+        self.assertEqual(cache.estadisticas()["fallos"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
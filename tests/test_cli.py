@@ -0,0 +1,140 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from datetime import date, timedelta
+from src.cli import comandos
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import VARIABLE_BD
+from tests.bd import PruebaConBD
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ══════════════════════════════════════════════════════════════════
+# LÍNEA DE COMANDOS NO INTERACTIVA
+# ══════════════════════════════════════════════════════════════════
+
+class TestCLI(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        self.usuario = self.correr("usuarios", "crear", "--nombre", "Juan Lopez", "--correo", "juan@mail.com")[1]
+        self.id_usuario = str(self.usuario["idUsuario"])
+        self.materia = self.correr(
+            "materias", "crear", "--nombre", "Matemáticas", "--color", "#FF5733", "--usuario", self.id_usuario
+        )[1]
+        self.entrega = (date.today() + timedelta(days=2)).isoformat()
+
+    def correr(self, *argv, formato="json"):
+        """(código de salida, stdout decodificado, stderr) del subcomando."""
+        salida, errores = io.StringIO(), io.StringIO()
+        codigo = comandos.main([*argv, f"--{formato}"], tm=self.tm, salida=salida, errores=errores)
+        texto = salida.getvalue()
+        if formato == "json" and texto:
+            texto = json.loads(texto)
+        return codigo, texto, errores.getvalue()
+
+    def crear_tarea(self, titulo="Estudiar", prioridad="Alta"):
+        return self.correr(
+            "tareas", "crear", "--usuario", self.id_usuario, "--titulo", titulo, "--prioridad", prioridad,
+            "--fecha", self.entrega, "--materia", str(self.materia["idMateria"])
+        )
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_datos_invalidos_salen_con_1(self):
+        codigo, salida, errores = self.crear_tarea(prioridad="Urgente")
+        self.assertEqual(codigo, comandos.SALIDA_INVALIDO)
+        self.assertEqual(salida, "")
+        self.assertIn("prioridad", errores)
+
+    def test_rojo_uso_incorrecto_sale_con_2(self):
+        with redirect_stderr(io.StringIO()):
+            self.assertEqual(self.correr("tareas", "archivar")[0], comandos.SALIDA_USO)
+            self.assertEqual(self.correr("tareas", "marcar", "uno")[0], comandos.SALIDA_USO)
+
+    def test_rojo_inexistente_sale_con_3(self):
+        codigo, _, errores = self.correr("tareas", "marcar", "9999", "--usuario", self.id_usuario)
+        self.assertEqual(codigo, comandos.SALIDA_NO_EXISTE)
+        self.assertIn("no existe", errores)
+
+    def test_rojo_otro_usuario_sale_con_4(self):
+        otro = self.correr("usuarios", "crear", "--nombre", "Pedro Garcia", "--correo", "pedro@mail.com")[1]
+        codigo = self.correr("usuarios", "eliminar", str(otro["idUsuario"]), "--usuario", self.id_usuario)[0]
+        self.assertEqual(codigo, comandos.SALIDA_PROHIBIDO)
+
+    def test_rojo_sin_usuario_sale_con_5(self):
+        self.assertEqual(self.correr("materias", "listar")[0], comandos.SALIDA_SIN_USUARIO)
+        self.assertEqual(self.correr("materias", "listar", "--usuario", "9999")[0], comandos.SALIDA_SIN_USUARIO)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_crear_marcar_y_listar_tareas(self):
+        codigo, tarea, _ = self.crear_tarea()
+        self.assertEqual(codigo, comandos.SALIDA_OK)
+        self.assertEqual((tarea["titulo"], tarea["estado"]), ("Estudiar", "Pendiente"))
+
+        codigo, marcada, _ = self.correr("tareas", "marcar", str(tarea["idTarea"]), "--usuario", self.id_usuario)
+        self.assertEqual((codigo, marcada["estado"]), (comandos.SALIDA_OK, "Completada"))
+
+        _, pagina, _ = self.correr("tareas", "listar", "--usuario", self.id_usuario, "--estado", "Completada")
+        self.assertEqual([t["idTarea"] for t in pagina["tareas"]], [tarea["idTarea"]])
+        self.assertIsNone(pagina["siguiente"])
+
+    def test_verde_salida_tsv(self):
+        self.crear_tarea("Leer\tcapítulo\ncon C:\\notas")
+        self.crear_tarea("Resumir")
+        codigo, salida, _ = self.correr("tareas", "listar", "--usuario", self.id_usuario, "--orden", "titulo", formato="tsv")
+        self.assertEqual(codigo, comandos.SALIDA_OK)
+        lineas = salida.split("\n")
+        self.assertEqual(lineas[-1], "")
+        lineas = lineas[:-1]
+        self.assertEqual(len(lineas), 3)
+        columnas = lineas[0].split("\t")
+        self.assertEqual(columnas[:2], ["idTarea", "titulo"])
+        self.assertEqual([len(l.split("\t")) for l in lineas[1:]], [len(columnas)] * 2)
+        self.assertEqual(lineas[1].split("\t")[1], "Leer\\tcapítulo\\ncon C:\\\\notas")
+
+    def test_verde_tsv_pagina_siguiente_en_stderr(self):
+        for i in range(3):
+            self.crear_tarea(f"Tarea {i}")
+        _, salida, errores = self.correr(
+            "tareas", "listar", "--usuario", self.id_usuario, "--limite", "2", formato="tsv"
+        )
+        self.assertEqual(len(salida.splitlines()), 3)
+        self.assertTrue(errores.startswith("siguiente: "))
+
+    def test_verde_eliminar_no_imprime_nada(self):
+        tarea = self.crear_tarea()[1]
+        self.assertEqual(
+            self.correr("tareas", "eliminar", str(tarea["idTarea"]), "--usuario", self.id_usuario),
+            (comandos.SALIDA_OK, "", "")
+        )
+
+    def test_verde_main_py_con_argumentos_no_es_interactivo(self):
+        """main.py con argumentos corre el subcomando sobre --bd y termina."""
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "cli.sqlite")
+            entorno = {k: v for k, v in os.environ.items() if k != VARIABLE_BD}
+
+            def main_py(*argv):
+                return subprocess.run(
+                    [sys.executable, "main.py", *argv, "--bd", ruta], cwd=RAIZ, env=entorno,
+                    stdin=subprocess.DEVNULL, capture_output=True, text=True
+                )
+
+            creado = main_py("usuarios", "crear", "--nombre", "Ana Perez", "--correo", "ana@mail.com")
+            self.assertEqual(creado.returncode, 0, creado.stderr)
+            listado = main_py("usuarios", "listar", "--tsv")
+            self.assertEqual(listado.stdout.splitlines()[1].split("\t")[1:3], ["Ana Perez", "ana@mail.com"])
+            self.assertEqual(main_py("tareas", "ver", "1", "--usuario", "1").returncode, comandos.SALIDA_NO_EXISTE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from src.model.declarative_base import (
+    MEMORIA,
+    PERFILES_SQLITE,
+    VARIABLE_BD,
+    VARIABLE_PERFIL,
+    crear_engine,
+    crear_engine_lectura,
+    db_path,
+    engine_de_lectura,
+    resolver_bd,
+    resolver_perfil,
+)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def leer_pragma(engine, nombre):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {nombre}").scalar()
+
+
+# ══════════════════════════════════════════════════════════════════
+# PERFILES DE RENDIMIENTO DE SQLITE
+# ══════════════════════════════════════════════════════════════════
+
+class TestPerfilesSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, "perfil.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_perfil_desconocido(self):
+        """Un perfil que no existe debe lanzar ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            crear_engine(self.ruta, perfil="turbo")
+        self.assertIn("perfil", str(ctx.exception).lower())
+
+    def test_rojo_variable_de_entorno_invalida(self):
+        """Un perfil inválido en la variable de entorno también se rechaza."""
+        with mock.patch.dict(os.environ, {VARIABLE_PERFIL: "turbo"}):
+            with self.assertRaises(ValueError):
+                resolver_perfil()
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_cada_perfil_aplica_sus_pragmas(self):
+        """Cada conexión nueva recibe los PRAGMA de su perfil."""
+        sincronia = {"OFF": 0, "NORMAL": 1, "FULL": 2}
+        for nombre, pragmas in PERFILES_SQLITE.items():
+            engine = crear_engine(self.ruta, perfil=nombre)
+            self.assertEqual(leer_pragma(engine, "journal_mode"), "wal", nombre)
+            self.assertEqual(
+                leer_pragma(engine, "synchronous"), sincronia[pragmas["synchronous"]], nombre
+            )
+            self.assertEqual(leer_pragma(engine, "cache_size"), pragmas["cache_size"], nombre)
+            self.assertEqual(leer_pragma(engine, "busy_timeout"), pragmas["busy_timeout"], nombre)
+            engine.dispose()
+
+    def test_verde_perfil_desde_variable_de_entorno(self):
+        """Sin argumento, el perfil se toma de la variable de entorno."""
+        with mock.patch.dict(os.environ, {VARIABLE_PERFIL: "durable"}):
+            self.assertEqual(resolver_perfil(), "durable")
+            engine = crear_engine(self.ruta)
+            self.assertEqual(leer_pragma(engine, "synchronous"), 2)
+            engine.dispose()
+
+    def test_verde_argumento_tiene_prioridad_sobre_entorno(self):
+        """El perfil pasado como argumento gana a la variable de entorno."""
+        with mock.patch.dict(os.environ, {VARIABLE_PERFIL: "durable"}):
+            self.assertEqual(resolver_perfil("fast"), "fast")
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# ENGINE DE SOLO LECTURA
+# ══════════════════════════════════════════════════════════════════
+
+class TestEngineLectura(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, "lectura #1.sqlite")
+        self.engine = crear_engine(self.ruta, perfil="durable")
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+            conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_no_puede_escribir(self):
+        """Una escritura por el engine de solo lectura falla."""
+        lectura = crear_engine_lectura(self.ruta)
+        with self.assertRaises(OperationalError) as ctx:
+            with lectura.begin() as conn:
+                conn.exec_driver_sql("INSERT INTO t VALUES (2)")
+        self.assertIn("readonly", str(ctx.exception))
+        self.assertEqual(leer_pragma(lectura, "query_only"), 1)
+        lectura.dispose()
+
+    def test_rojo_bd_en_memoria_no_tiene_engine_de_lectura(self):
+        self.assertIsNone(engine_de_lectura(create_engine("sqlite://")))
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_lee_lo_confirmado_por_el_escritor(self):
+        lectura = crear_engine_lectura(self.ruta)
+        with lectura.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT count(*) FROM t").scalar(), 1)
+            with self.engine.begin() as escritura:
+                escritura.exec_driver_sql("INSERT INTO t VALUES (2)")
+        with lectura.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT count(*) FROM t").scalar(), 2)
+        lectura.dispose()
+
+    def test_verde_lector_abierto_no_bloquea_al_escritor(self):
+        """Con WAL un lector en medio de una lectura no frena los commits."""
+        lectura = crear_engine_lectura(self.ruta)
+        with lectura.connect() as conn:
+            conn.exec_driver_sql("BEGIN")
+            conn.exec_driver_sql("SELECT count(*) FROM t").scalar()
+            with self.engine.begin() as escritura:
+                escritura.exec_driver_sql("INSERT INTO t VALUES (2)")
+            # La lectura en curso sigue viendo su instantánea
+            self.assertEqual(conn.exec_driver_sql("SELECT count(*) FROM t").scalar(), 1)
+        lectura.dispose()
+
+    def test_verde_engine_de_lectura_hereda_perfil_y_se_reutiliza(self):
+        lectura = engine_de_lectura(self.engine)
+        self.assertIs(engine_de_lectura(self.engine), lectura)
+        self.assertEqual(leer_pragma(lectura, "synchronous"), 2)
+        self.assertEqual(leer_pragma(lectura, "journal_mode"), "wal")
+        lectura.dispose()
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# UBICACIÓN DE LA BD Y MODO EN MEMORIA
+# ══════════════════════════════════════════════════════════════════
+
+class TestUbicacionBD(unittest.TestCase):
+
+    def ejecutar(self, codigo: str, **entorno) -> str:
+        """Corre `codigo` en un intérprete nuevo y retorna su salida."""
+        variables = {k: v for k, v in os.environ.items() if k != VARIABLE_BD}
+        variables.update(entorno)
+        resultado = subprocess.run(
+            [sys.executable, "-c", codigo], cwd=RAIZ, env=variables,
+            capture_output=True, text=True, check=True
+        )
+        return resultado.stdout.strip()
+
+    def contar(self, engine) -> int:
+        with engine.connect() as conn:
+            return conn.exec_driver_sql("SELECT count(*) FROM t").scalar()
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_importar_no_crea_el_engine(self):
+        salida = self.ejecutar(
+            "import src.model.declarative_base as d, src.logic.task_manager as t;"
+            "print('engine' in vars(d), t.Session.kw.get('bind'))"
+        )
+        self.assertEqual(salida, "False None")
+
+    def test_rojo_engine_inyectado_no_crea_el_por_defecto(self):
+        salida = self.ejecutar(
+            "import src.model.declarative_base as d;"
+            "from src.logic.task_manager import TaskManager;"
+            "from src.model.esquema import inicializar_bd;"
+            "tm = TaskManager(engine=d.crear_engine(d.MEMORIA)); inicializar_bd(tm.engine);"
+            "tm.crear_usuario('Juan Lopez', 'juan@mail.com');"
+            "print(len(tm.listar_usuarios()), 'engine' in vars(d))"
+        )
+        self.assertEqual(salida, "1 False")
+
+    def test_rojo_bds_en_memoria_independientes(self):
+        una, otra = crear_engine(MEMORIA), crear_engine(MEMORIA)
+        with una.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        with self.assertRaises(OperationalError):
+            self.contar(otra)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_ubicacion_por_argumento_entorno_o_defecto(self):
+        with mock.patch.dict(os.environ, {VARIABLE_BD: "/tmp/otra.sqlite"}):
+            self.assertEqual(resolver_bd(), "/tmp/otra.sqlite")
+            self.assertEqual(resolver_bd("/tmp/pedida.sqlite"), "/tmp/pedida.sqlite")
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(resolver_bd(), db_path)
+
+    def test_verde_engine_por_defecto_desde_variable_de_entorno(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "desde entorno.sqlite")
+            salida = self.ejecutar(
+                "import src.model.declarative_base as d; print(d.engine.url.database)",
+                **{VARIABLE_BD: ruta}
+            )
+            self.assertEqual(salida, ruta)
+
+    def test_verde_memoria_compartida_entre_conexiones_e_hilos(self):
+        memoria = crear_engine(MEMORIA)
+        with memoria.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+            conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        en_hilo = []
+        hilo = threading.Thread(target=lambda: en_hilo.append(self.contar(memoria)))
+        hilo.start()
+        hilo.join()
+        self.assertEqual(en_hilo, [1])
+        self.assertIsNone(engine_de_lectura(memoria))
+
+    def test_verde_memoria_sobrevive_a_cerrar_el_pool(self):
+        memoria = crear_engine(MEMORIA)
+        with memoria.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        memoria.dispose()
+        self.assertEqual(self.contar(memoria), 0)
+
+    def test_verde_lector_no_espera_al_escritor_en_memoria(self):
+        memoria = crear_engine(MEMORIA)
+        with memoria.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        with memoria.connect() as escritura:
+            escritura.exec_driver_sql("INSERT INTO t VALUES (1)")
+            # Sin confirmar: read_uncommitted evita el "table is locked"
+            self.assertEqual(self.contar(memoria), 1)
+            escritura.rollback()
+        self.assertEqual(self.contar(memoria), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,307 @@
+from datetime import date, timedelta
+import os
+import re
+import tempfile
+import unittest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import Base, engine
+from src.model.esquema import huella_esquema, inicializar_bd
+from src.model.modelo import Prioridad, EstadoTarea
+from tests.bd import PruebaConCommits
+
+
+# Esquema anterior a tareas.usuario_id y a los índices compuestos
+ESQUEMA_ANTERIOR = (
+    'CREATE TABLE usuarios ("idUsuario" INTEGER NOT NULL, nombre VARCHAR NOT NULL, '
+    'correo VARCHAR NOT NULL, fecha_creacion DATE, PRIMARY KEY ("idUsuario"), UNIQUE (correo))',
+    'CREATE TABLE materias ("idMateria" INTEGER NOT NULL, nombre VARCHAR NOT NULL, '
+    'color VARCHAR NOT NULL, usuario_id INTEGER NOT NULL, PRIMARY KEY ("idMateria"), '
+    'FOREIGN KEY(usuario_id) REFERENCES usuarios ("idUsuario"))',
+    'CREATE TABLE tareas ("idTarea" INTEGER NOT NULL, titulo VARCHAR NOT NULL, '
+    'descripcion VARCHAR, prioridad VARCHAR(5) NOT NULL, "fechaEntrega" DATE, '
+    'estado VARCHAR(10) NOT NULL, materia_id INTEGER NOT NULL, PRIMARY KEY ("idTarea"), '
+    'FOREIGN KEY(materia_id) REFERENCES materias ("idMateria"))',
+)
+
+
+def capturar_consultas(operacion) -> list:
+    """
+    Ejecuta `operacion` y retorna los SELECT/UPDATE/DELETE emitidos con sus
+    parámetros (las sentencias executemany se omiten), por cualquier engine:
+    las lecturas van por el de solo lectura.
+    """
+    consultas = []
+
+    def antes(conn, cursor, sentencia, parametros, context, executemany):
+        verbo = sentencia.lstrip().split(None, 1)[0].upper()
+        if verbo in ("SELECT", "UPDATE", "DELETE") and not executemany:
+            consultas.append((sentencia, parametros))
+
+    event.listen(Engine, "before_cursor_execute", antes)
+    try:
+        operacion()
+    finally:
+        event.remove(Engine, "before_cursor_execute", antes)
+    return consultas
+
+
+def plan(sentencia: str, parametros) -> list:
+    with engine.connect() as conn:
+        filas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sentencia}", parametros).all()
+    return [fila[-1] for fila in filas]
+
+
+# ══════════════════════════════════════════════════════════════════
+# ÍNDICES Y PLANES DE CONSULTA
+# ══════════════════════════════════════════════════════════════════
+
+class TestIndices(PruebaConCommits):
+
+    TABLAS_VIGILADAS = ("tareas", "materias")
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.tarea = self.tm.crear_tarea(
+            "Estudiar capítulo uno", "", Prioridad.Media,
+            date.today() + timedelta(days=1), self.materia.idMateria
+        )
+
+    def assertSinEscaneoCompleto(self, operacion):
+        consultas = capturar_consultas(operacion)
+        self.assertTrue(consultas)
+        for sentencia, parametros in consultas:
+            for paso in plan(sentencia, parametros):
+                for tabla in self.TABLAS_VIGILADAS:
+                    self.assertIsNone(
+                        re.match(rf"SCAN {tabla}\b", paso),
+                        f"Escaneo completo de {tabla}: {paso}\n{sentencia}"
+                    )
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_bd_existente_sin_indices_los_recibe(self):
+        """inicializar_bd crea los índices que falten en una BD existente."""
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_tareas_materia_estado_fecha"))
+            conn.execute(text("DROP INDEX ix_materias_usuario_nombre"))
+            # Una BD anterior a la huella del esquema
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+
+        inicializar_bd(engine)
+
+        inspector = inspect(engine)
+        self.assertIn(
+            "ix_tareas_materia_estado_fecha",
+            [i["name"] for i in inspector.get_indexes("tareas")]
+        )
+        self.assertIn(
+            "ix_materias_usuario_nombre",
+            [i["name"] for i in inspector.get_indexes("materias")]
+        )
+
+    def test_rojo_bd_sin_usuario_id_en_tareas_se_migra(self):
+        """inicializar_bd agrega tareas.usuario_id y lo rellena desde materias."""
+        with tempfile.TemporaryDirectory() as tmp:
+            antigua = create_engine(f"sqlite:///{os.path.join(tmp, 'antigua.sqlite')}")
+            with antigua.begin() as conn:
+                for ddl in ESQUEMA_ANTERIOR:
+                    conn.execute(text(ddl))
+                conn.execute(text(
+                    "INSERT INTO usuarios VALUES (7, 'Ana Ruiz', 'ana@mail.com', NULL)"
+                ))
+                conn.execute(text("INSERT INTO materias VALUES (3, 'Física', '#FF5733', 7)"))
+                conn.execute(text(
+                    "INSERT INTO tareas VALUES (1, 'Informe', NULL, 'Alta', NULL, 'Pendiente', 3)"
+                ))
+
+            inicializar_bd(antigua)
+
+            with antigua.connect() as conn:
+                self.assertEqual(
+                    conn.execute(text('SELECT usuario_id FROM tareas WHERE "idTarea" = 1')).scalar(),
+                    7
+                )
+            self.assertIn(
+                "ix_tareas_usuario_estado_fecha",
+                [i["name"] for i in inspect(antigua).get_indexes("tareas")]
+            )
+            antigua.dispose()
+
+    def test_rojo_bd_sin_busqueda_se_indexa(self):
+        """inicializar_bd crea tareas_fts en una BD anterior e indexa sus tareas."""
+        with tempfile.TemporaryDirectory() as tmp:
+            antigua = create_engine(f"sqlite:///{os.path.join(tmp, 'antigua.sqlite')}")
+            with antigua.begin() as conn:
+                for ddl in ESQUEMA_ANTERIOR:
+                    conn.execute(text(ddl))
+                conn.execute(text(
+                    "INSERT INTO usuarios VALUES (7, 'Ana Ruiz', 'ana@mail.com', NULL)"
+                ))
+                conn.execute(text("INSERT INTO materias VALUES (3, 'Física', '#FF5733', 7)"))
+                conn.execute(text(
+                    "INSERT INTO tareas VALUES (1, 'Informe', NULL, 'Alta', NULL, 'Pendiente', 3)"
+                ))
+
+            inicializar_bd(antigua)
+            inicializar_bd(antigua)
+
+            with antigua.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO tareas VALUES (2, 'Informe final', NULL, 'Baja', NULL, 'Pendiente', 3, 7)"
+                ))
+                encontradas = conn.execute(text(
+                    "SELECT rowid FROM tareas_fts WHERE tareas_fts MATCH 'informe' ORDER BY rowid"
+                )).scalars().all()
+            self.assertEqual(encontradas, [1, 2])
+            antigua.dispose()
+
+    def test_rojo_bd_sin_resumen_se_rellena(self):
+        """inicializar_bd crea resumen_tareas con los conteos de las tareas existentes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            antigua = create_engine(f"sqlite:///{os.path.join(tmp, 'antigua.sqlite')}")
+            with antigua.begin() as conn:
+                for ddl in ESQUEMA_ANTERIOR:
+                    conn.execute(text(ddl))
+                conn.execute(text(
+                    "INSERT INTO usuarios VALUES (7, 'Ana Ruiz', 'ana@mail.com', NULL)"
+                ))
+                conn.execute(text("INSERT INTO materias VALUES (3, 'Física', '#FF5733', 7)"))
+                conn.execute(text(
+                    "INSERT INTO tareas VALUES (1, 'Informe', NULL, 'Alta', NULL, 'Pendiente', 3), "
+                    "(2, 'Ensayo', NULL, 'Alta', NULL, 'Pendiente', 3)"
+                ))
+
+            inicializar_bd(antigua)
+
+            with antigua.begin() as conn:
+                conn.execute(text(
+                    "UPDATE tareas SET estado = 'Completada' WHERE \"idTarea\" = 2"
+                ))
+                filas = conn.execute(text(
+                    "SELECT estado, total FROM resumen_tareas WHERE materia_id = 3 ORDER BY estado"
+                )).all()
+            self.assertEqual([tuple(f) for f in filas], [("Completada", 1), ("Pendiente", 1)])
+            antigua.dispose()
+
+    # ── CASOS VERDES: CONSULTAS CALIENTES USAN ÍNDICE ─────────────
+
+    def test_verde_crear_materia_busca_duplicado_por_indice(self):
+        self.assertSinEscaneoCompleto(
+            lambda: self.tm.crear_materia("Historia", "#123456")
+        )
+
+    def test_verde_editar_materia_usa_indice(self):
+        self.assertSinEscaneoCompleto(
+            lambda: self.tm.editar_materia(self.materia.idMateria, nuevo_nombre="Álgebra")
+        )
+
+    def test_verde_listar_tareas_usa_indice(self):
+        self.assertSinEscaneoCompleto(lambda: self.tm.listar_tareas())
+        self.assertSinEscaneoCompleto(
+            lambda: self.tm.listar_tareas(estado=EstadoTarea.Pendiente, orden="-titulo")
+        )
+
+    def test_verde_eliminar_materia_cascade_usa_indice(self):
+        self.assertSinEscaneoCompleto(
+            lambda: self.tm.eliminar_materia(self.materia.idMateria)
+        )
+
+    def test_verde_marcar_y_editar_tarea_usan_indice(self):
+        self.assertSinEscaneoCompleto(lambda: self.tm.marcar_tarea(self.tarea.idTarea))
+        self.assertSinEscaneoCompleto(
+            lambda: self.tm.editar_tarea(
+                self.tarea.idTarea,
+                nuevo_titulo="Repasar tema dos",
+                nueva_materia_id=self.materia.idMateria
+            )
+        )
+
+    def test_verde_buscar_tareas_usa_fts(self):
+        self.assertSinEscaneoCompleto(lambda: self.tm.buscar_tareas("estudiar"))
+
+    def test_verde_resumen_no_recorre_tareas(self):
+        self.assertSinEscaneoCompleto(lambda: self.tm.resumen())
+
+    def test_verde_entregas_recorren_el_indice_ya_ordenado(self):
+        """Las entregas salen del índice en orden: sin escaneo ni ordenamiento aparte."""
+        for operacion in (self.tm.proximas_entregas, self.tm.entregas_vencidas):
+            self.assertSinEscaneoCompleto(operacion)
+            for sentencia, parametros in capturar_consultas(operacion):
+                pasos = plan(sentencia, parametros)
+                self.assertIn("ix_tareas_usuario_estado_fecha_prioridad", " ".join(pasos))
+                self.assertFalse([p for p in pasos if "TEMP B-TREE" in p], pasos)
+
+    def test_verde_eliminar_tarea_usa_indice(self):
+        self.assertSinEscaneoCompleto(lambda: self.tm.eliminar_tarea(self.tarea.idTarea))
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# HUELLA DEL ESQUEMA (PRAGMA user_version)
+# ══════════════════════════════════════════════════════════════════
+
+class TestHuellaEsquema(PruebaConCommits):
+
+    def setUp(self):
+        super().setUp()
+        Base.metadata.drop_all(engine)
+
+    def huella_guardada(self):
+        with engine.connect() as conn:
+            return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+    def sentencias(self, operacion) -> list:
+        emitidas = []
+
+        def antes(conn, cursor, sentencia, parametros, context, executemany):
+            emitidas.append(sentencia)
+
+        event.listen(engine, "before_cursor_execute", antes)
+        try:
+            operacion()
+        finally:
+            event.remove(engine, "before_cursor_execute", antes)
+        return emitidas
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_drop_all_olvida_la_huella(self):
+        inicializar_bd(engine)
+        Base.metadata.drop_all(engine)
+        self.assertEqual(self.huella_guardada(), 0)
+        inicializar_bd(engine)
+        self.assertIn("tareas", inspect(engine).get_table_names())
+
+    def test_rojo_forzar_repara_un_esquema_tocado_a_mano(self):
+        inicializar_bd(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_tareas_usuario_fecha"))
+        inicializar_bd(engine, forzar=True)
+        self.assertIn(
+            "ix_tareas_usuario_fecha",
+            [i["name"] for i in inspect(engine).get_indexes("tareas")]
+        )
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_guarda_la_huella_de_los_modelos(self):
+        inicializar_bd(engine)
+        self.assertEqual(self.huella_guardada(), huella_esquema(engine))
+        self.assertGreater(huella_esquema(engine), 0)
+
+    def test_verde_con_la_huella_al_dia_solo_la_lee(self):
+        inicializar_bd(engine)
+        self.assertEqual(
+            self.sentencias(lambda: inicializar_bd(engine)),
+            ["PRAGMA user_version"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from datetime import date, timedelta
+from src.logic import exportacion
+from src.logic.task_manager import TaskManager
+from src.model.modelo import Prioridad
+from tests.bd import PruebaConBD
+
+
+# ══════════════════════════════════════════════════════════════════
+# EXPORTACIÓN A CSV Y JSON LINES
+# ══════════════════════════════════════════════════════════════════
+
+class TestExportacion(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        ajena = self.tm.crear_materia("Química", "#00FF00")
+        self.tm.crear_tarea("Tarea ajena", "", Prioridad.Baja, date.today(), ajena.idMateria)
+
+        self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(self.usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.entrega = date.today() + timedelta(days=2)
+        self.tarea = self.tm.crear_tarea(
+            "Estudiar, repasar \"todo\"", "Línea uno\nlínea dos", Prioridad.Alta,
+            self.entrega, self.materia.idMateria
+        )
+        self.tm.marcar_tarea(self.tarea.idTarea)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        with self.assertRaises(ValueError):
+            TaskManager().exportar("jsonl", io.StringIO())
+
+    def test_rojo_formato_invalido(self):
+        with self.assertRaises(ValueError):
+            self.tm.exportar("xml", io.StringIO())
+
+    def test_rojo_cli_usuario_inexistente(self):
+        with redirect_stderr(io.StringIO()):
+            codigo = exportacion.main(["--usuario", "9999", "--destino", "-"])
+        self.assertEqual(codigo, 1)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_jsonl_solo_datos_del_usuario(self):
+        salida = io.StringIO()
+        conteos = self.tm.exportar("jsonl", salida)
+        self.assertEqual(conteos, {"usuario": 1, "materia": 1, "tarea": 1})
+
+        registros = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([r["tipo"] for r in registros], ["usuario", "materia", "tarea"])
+        tarea = registros[2]
+        self.assertEqual(tarea["titulo"], "Estudiar, repasar \"todo\"")
+        self.assertEqual(tarea["prioridad"], "Alta")
+        self.assertEqual(tarea["estado"], "Completada")
+        self.assertEqual(tarea["fechaEntrega"], self.entrega.isoformat())
+
+    def test_verde_csv_un_archivo_por_entidad(self):
+        directorio = os.path.join(self.tmp.name, "export")
+        self.tm.exportar("csv", directorio)
+
+        with open(os.path.join(directorio, "tareas.csv"), newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        self.assertEqual(len(filas), 1)
+        self.assertEqual(filas[0]["descripcion"], "Línea uno\nlínea dos")
+        self.assertEqual(int(filas[0]["materia_id"]), self.materia.idMateria)
+        with open(os.path.join(directorio, "usuarios.csv"), encoding="utf-8") as f:
+            self.assertIn("juan@mail.com", f.read())
+
+    def test_verde_cli_escribe_archivo(self):
+        ruta = os.path.join(self.tmp.name, "datos.jsonl")
+        with redirect_stderr(io.StringIO()):
+            codigo = exportacion.main([
+                "--usuario", str(self.usuario.idUsuario), "--formato", "jsonl", "--destino", ruta
+            ])
+        self.assertEqual(codigo, 0)
+        with open(ruta, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from datetime import date, timedelta
+from unittest import mock
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.logic import importacion
+from src.logic.task_manager import TaskManager
+from src.model.modelo import Prioridad, EstadoTarea
+from tests.bd import PruebaConBD
+
+
+# ══════════════════════════════════════════════════════════════════
+# IMPORTACIÓN DESDE CSV Y JSON LINES
+# ══════════════════════════════════════════════════════════════════
+
+class TestImportacion(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        self.tm.crear_materia("Química", "#00FF00")
+
+        self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(self.usuario.idUsuario)
+        self.matematicas = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.historia = self.tm.crear_materia("Historia", "#123456")
+        self.entrega = (date.today() + timedelta(days=3)).isoformat()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def escribir_csv(self, filas, nombre="tareas.csv"):
+        ruta = os.path.join(self.tmp.name, nombre)
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(
+                f, ["titulo", "descripcion", "prioridad", "fechaEntrega", "materia", "estado"]
+            )
+            escritor.writeheader()
+            escritor.writerows(filas)
+        return ruta
+
+    def fila(self, i, materia="Matemáticas", **cambios):
+        fila = {
+            "titulo": f"Tarea importada {i}", "descripcion": "", "prioridad": "Media",
+            "fechaEntrega": self.entrega, "materia": materia, "estado": ""
+        }
+        fila.update(cambios)
+        return fila
+
+    def rechazos(self, ruta):
+        with open(ruta + ".rechazos.jsonl", encoding="utf-8") as f:
+            return [json.loads(linea) for linea in f]
+
+    def titulos(self):
+        tareas, _ = self.tm.listar_tareas(orden="idTarea", limite=None)
+        return [t.titulo for t in tareas]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        ruta = self.escribir_csv([self.fila(0)])
+        with self.assertRaises(ValueError):
+            TaskManager().importar_tareas(ruta)
+
+    def test_rojo_parametros_invalidos(self):
+        ruta = self.escribir_csv([self.fila(0)])
+        with self.assertRaises(ValueError):
+            self.tm.importar_tareas(ruta, formato="xml")
+        with self.assertRaises(ValueError):
+            self.tm.importar_tareas(ruta, tamano_bloque=0)
+        with self.assertRaises(ValueError):
+            self.tm.importar_tareas(os.path.join(self.tmp.name, "tareas.txt"))
+
+    def test_rojo_rechazos_con_motivo(self):
+        """Los registros inválidos van al archivo de rechazos y no se insertan."""
+        ruta = self.escribir_csv([
+            self.fila(0),
+            self.fila(1, titulo="ab"),
+            self.fila(2, prioridad="Urgente"),
+            self.fila(3, fechaEntrega="2001-01-01"),
+            self.fila(4, fechaEntrega="mañana"),
+            self.fila(5, materia="Química"),
+            self.fila(6, materia=""),
+            self.fila(7, estado="Archivada"),
+        ])
+        resultado = self.tm.importar_tareas(ruta)
+
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 7))
+        self.assertEqual(self.titulos(), ["Tarea importada 0"])
+        motivos = {r["registro"]: r["error"] for r in self.rechazos(ruta)}
+        self.assertEqual(sorted(motivos), [2, 3, 4, 5, 6, 7, 8])
+        self.assertIn("al menos 3 caracteres", motivos[2])
+        self.assertIn("Baja, Media o Alta", motivos[3])
+        self.assertIn("pasado", motivos[4])
+        self.assertIn("inválida", motivos[5])
+        self.assertEqual(motivos[6], "La materia 'Química' no existe")
+        self.assertIn("materia", motivos[7])
+        self.assertIn("Pendiente o Completada", motivos[8])
+
+    def test_rojo_jsonl_linea_invalida(self):
+        ruta = os.path.join(self.tmp.name, "tareas.jsonl")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("{no es json\n")
+            f.write(json.dumps(self.fila(0)) + "\n")
+        resultado = self.tm.importar_tareas(ruta)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 1))
+        self.assertIn("JSON", self.rechazos(ruta)[0]["error"])
+
+    def test_rojo_jsonl_campos_de_otro_tipo(self):
+        """Un valor que no es texto se rechaza con su motivo y no corta la importación."""
+        ruta = os.path.join(self.tmp.name, "tareas.jsonl")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.fila(0, titulo=12345)) + "\n")
+            f.write(json.dumps(self.fila(1, materia=["Historia"])) + "\n")
+            f.write(json.dumps(self.fila(2, fechaEntrega=20301231)) + "\n")
+            f.write(json.dumps(self.fila(3)) + "\n")
+        resultado = self.tm.importar_tareas(ruta)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 3))
+        self.assertEqual(self.titulos(), ["Tarea importada 3"])
+        self.assertEqual([r["error"] for r in self.rechazos(ruta)], [
+            "El campo 'titulo' debe ser texto",
+            "El campo 'materia' debe ser texto",
+            "El campo 'fechaEntrega' debe ser texto",
+        ])
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_csv_por_bloques(self):
+        """Cada bloque se confirma por separado y las materias se resuelven por nombre."""
+        filas = [self.fila(i, materia=("Matemáticas", "Historia")[i % 2]) for i in range(7)]
+        filas[0]["estado"] = "Completada"
+        ruta = self.escribir_csv(filas)
+
+        commits = []
+
+        def contar(session):
+            commits.append(session)
+
+        # Commits de sesión: en las pruebas cada uno libera un SAVEPOINT
+        event.listen(Session, "after_commit", contar)
+        try:
+            resultado = self.tm.importar_tareas(ruta, tamano_bloque=3)
+        finally:
+            event.remove(Session, "after_commit", contar)
+
+        self.assertEqual(resultado, {
+            "registros": 7, "importadas": 7, "rechazadas": 0, "reanudada_desde": 0
+        })
+        # Alta del progreso + 3 bloques + cierre
+        self.assertEqual(len(commits), 5)
+        tareas, _ = self.tm.listar_tareas(orden="idTarea", limite=None)
+        self.assertEqual(len(tareas), 7)
+        self.assertEqual(tareas[0].estado, EstadoTarea.Completada)
+        self.assertEqual(tareas[1].materia_id, self.historia.idMateria)
+        self.assertEqual(tareas[2].prioridad, Prioridad.Media)
+        self.assertEqual(self.tm.resumen()["total"], 7)
+
+    def test_verde_jsonl_ignora_otros_tipos(self):
+        """Un JSONL con usuarios y materias solo importa las líneas de tareas."""
+        ruta = os.path.join(self.tmp.name, "datos.jsonl")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"tipo": "usuario", "nombre": "Juan"}) + "\n")
+            f.write(json.dumps({"tipo": "tarea", **self.fila(0)}) + "\n")
+            f.write("\n")
+            f.write(json.dumps(self.fila(1, fecha_entrega=self.entrega, fechaEntrega=None)) + "\n")
+        resultado = self.tm.importar_tareas(ruta)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (2, 0))
+
+    def test_verde_reanuda_despues_del_ultimo_bloque(self):
+        """Tras una interrupción, la siguiente corrida no repite bloques confirmados."""
+        ruta = self.escribir_csv([self.fila(i) for i in range(1, 8)] + [self.fila(8, titulo="ab")])
+        original = importacion._validar_registro
+        llamadas = []
+
+        def interrumpir_en_el_quinto(registro):
+            llamadas.append(registro)
+            if len(llamadas) == 5:
+                raise KeyboardInterrupt
+            return original(registro)
+
+        with mock.patch.object(importacion, "_validar_registro", interrumpir_en_el_quinto):
+            with self.assertRaises(KeyboardInterrupt):
+                self.tm.importar_tareas(ruta, tamano_bloque=2)
+        self.assertEqual(len(self.titulos()), 4)
+
+        resultado = self.tm.importar_tareas(ruta, tamano_bloque=2)
+        self.assertEqual(resultado["reanudada_desde"], 4)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (7, 1))
+        self.assertEqual(self.titulos(), [f"Tarea importada {i}" for i in range(1, 8)])
+        self.assertEqual([r["registro"] for r in self.rechazos(ruta)], [8])
+
+        # Terminada, una nueva corrida empieza desde cero
+        self.assertEqual(self.tm.importar_tareas(ruta)["reanudada_desde"], 0)
+        self.assertEqual(len(self.titulos()), 14)
+
+    def test_verde_cli(self):
+        ruta = self.escribir_csv([self.fila(0), self.fila(1)])
+        with redirect_stderr(io.StringIO()) as err:
+            codigo = importacion.main(["--usuario", str(self.usuario.idUsuario), ruta])
+        self.assertEqual(codigo, 0)
+        self.assertEqual(json.loads(err.getvalue())["importadas"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.logic.task_manager import TaskManager
+from tests.bd import PruebaConCommits
+from tests.test_task_manager import crear_tarea_helper
+
+
+# ══════════════════════════════════════════════════════════════════
+# INSTRUMENTACIÓN DE TASK MANAGER
+# ══════════════════════════════════════════════════════════════════
+
+class TestInstrumentacion(PruebaConCommits):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager(instrumentar=True)
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.tarea = crear_tarea_helper(self.tm, self.materia.idMateria)
+        self.tm.reiniciar_stats()
+
+    def tearDown(self):
+        self.tm.desactivar_instrumentacion()
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_desactivada_no_registra_ni_escucha(self):
+        """Sin instrumentación no se acumulan datos ni quedan listeners."""
+        self.tm.desactivar_instrumentacion()
+        self.tm.marcar_tarea(self.tarea.idTarea)
+        self.assertEqual(self.tm.stats(), {})
+        self.assertFalse(event.contains(
+            Engine, "before_cursor_execute", self.tm._instrumentacion._antes_de_ejecutar
+        ))
+
+    def test_rojo_errores_se_cuentan(self):
+        """Una llamada que lanza excepción cuenta como error."""
+        with self.assertRaises(ValueError):
+            self.tm.marcar_tarea(9999)
+        datos = self.tm.stats()["marcar_tarea"]
+        self.assertEqual((datos["llamadas"], datos["errores"]), (1, 1))
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_cuenta_llamadas_y_sentencias(self):
+        """Se registran llamadas y sentencias por llamada de cada método."""
+        self.tm.marcar_tarea(self.tarea.idTarea)
+        self.tm.desmarcar_tarea(self.tarea.idTarea)
+        self.tm.editar_tarea(self.tarea.idTarea, nuevo_titulo="Repasar tema dos")
+
+        stats = self.tm.stats()
+        self.assertEqual(stats["marcar_tarea"]["llamadas"], 1)
+        self.assertEqual(stats["marcar_tarea"]["sentencias_por_llamada"], 1)
+        self.assertEqual(stats["editar_tarea"]["sentencias"], 1)
+        self.assertGreaterEqual(stats["marcar_tarea"]["tiempo_total_ms"],
+                                stats["marcar_tarea"]["tiempo_sql_ms"])
+        self.assertEqual(sum(stats["desmarcar_tarea"]["histograma_ms"].values()), 1)
+
+    def test_verde_eliminar_materia_cuenta_la_cascada(self):
+        """Las sentencias del cascade se atribuyen a eliminar_materia."""
+        self.tm.eliminar_materia(self.materia.idMateria)
+        self.assertGreaterEqual(self.tm.stats()["eliminar_materia"]["sentencias"], 3)
+
+    def test_verde_reiniciar_stats(self):
+        """reiniciar_stats() deja los contadores vacíos."""
+        self.tm.listar_tareas()
+        self.assertIn("listar_tareas", self.tm.stats())
+        self.tm.reiniciar_stats()
+        self.assertEqual(self.tm.stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import io
+import json
+import os
+import select
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+from sqlalchemy import event
+from src.cli import comandos, lote
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import VARIABLE_BD, engine
+from tests.bd import PruebaConBD, PruebaConCommits
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTREGA = (date.today() + timedelta(days=2)).isoformat()
+
+
+def linea(comando: str, **campos) -> str:
+    return json.dumps({"comando": comando, **campos}) + "\n"
+
+
+def crear_tarea(titulo: str, usuario=1, materia_id=1, **campos) -> str:
+    return linea("tareas crear", usuario=usuario, datos={
+        "titulo": titulo, "prioridad": "Alta", "fechaEntrega": ENTREGA, "materia_id": materia_id
+    }, **campos)
+
+
+INICIO = [
+    linea("usuarios crear", datos={"nombre": "Juan Lopez", "correo": "juan@mail.com"}),
+    linea("materias crear", usuario=1, datos={"nombre": "Matemáticas", "color": "#FF5733"}),
+]
+
+
+# ══════════════════════════════════════════════════════════════════
+# MODO POR LOTES (main.py --batch)
+# ══════════════════════════════════════════════════════════════════
+
+class TestLote(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+
+    def procesar(self, lineas, tamano=lote.LOTE_POR_DEFECTO):
+        salida = io.StringIO()
+        fallidos = lote.procesar(self.tm, io.StringIO("".join(lineas)), salida, tamano)
+        return fallidos, [json.loads(l) for l in salida.getvalue().splitlines()]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_un_comando_fallido_no_deshace_su_grupo(self):
+        fallidos, resultados = self.procesar([
+            *INICIO,
+            crear_tarea("Primera"),
+            linea("tareas marcar", usuario=1, id=9999),
+            crear_tarea("Segunda"),
+            linea("tareas crear", usuario=1, datos={"titulo": "Sin fecha", "prioridad": "Urgente"}),
+        ])
+        self.assertEqual(fallidos, 2)
+        self.assertEqual([r["ok"] for r in resultados], [True, True, True, False, True, False])
+        self.assertEqual(resultados[3]["codigo"], comandos.SALIDA_NO_EXISTE)
+        self.assertEqual(resultados[5]["codigo"], comandos.SALIDA_INVALIDO)
+        with self.tm.como_usuario(1):
+            self.assertEqual(len(self.tm.listar_tareas()[0]), 2)
+
+    def test_rojo_lineas_mal_formadas(self):
+        fallidos, resultados = self.procesar([
+            "no es json\n",
+            "[1, 2]\n",
+            linea("tareas archivar", usuario=1),
+            linea("tareas marcar", usuario=1),
+            linea("tareas marcar", usuario="1", id=1),
+            linea("materias crear", usuario=1, datos=["Física"]),
+        ])
+        self.assertEqual(fallidos, 6)
+        self.assertEqual({r["codigo"] for r in resultados}, {comandos.SALIDA_USO})
+
+    def test_rojo_campos_de_otro_tipo(self):
+        fallidos, resultados = self.procesar([
+            linea("usuarios crear", datos={"nombre": 123, "correo": "juan@mail.com"}),
+            *INICIO,
+            crear_tarea("Leer", materia_id="uno"),
+        ])
+        self.assertEqual(fallidos, 2)
+        self.assertEqual([r["ok"] for r in resultados], [False, True, True, False])
+        self.assertEqual({resultados[0]["codigo"], resultados[3]["codigo"]}, {comandos.SALIDA_INVALIDO})
+
+    def test_rojo_error_inesperado_solo_falla_su_linea(self):
+        with mock.patch.object(self.tm, "listar_materias", side_effect=RuntimeError("falla")):
+            fallidos, resultados = self.procesar([
+                *INICIO, linea("materias listar", usuario=1), crear_tarea("Leer")
+            ])
+        self.assertEqual(fallidos, 1)
+        self.assertEqual([r["ok"] for r in resultados], [True, True, False, True])
+        self.assertEqual(resultados[2]["codigo"], comandos.SALIDA_INVALIDO)
+        self.assertIn("falla", resultados[2]["error"])
+        with self.tm.como_usuario(1):
+            self.assertEqual(len(self.tm.listar_tareas()[0]), 1)
+
+    def test_rojo_sin_usuario(self):
+        _, resultados = self.procesar([*INICIO, linea("materias listar"), linea("materias listar", usuario=9)])
+        self.assertEqual([r["codigo"] for r in resultados[2:]], [comandos.SALIDA_SIN_USUARIO] * 2)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_un_resultado_por_linea_en_orden(self):
+        fallidos, resultados = self.procesar(
+            [*INICIO, "\n", crear_tarea("Leer", ref="a-1"), linea("tareas marcar", usuario=1, id=1)], tamano=2
+        )
+        self.assertEqual(fallidos, 0)
+        self.assertEqual([r["n"] for r in resultados], [1, 2, 4, 5])
+        self.assertEqual(resultados[2]["ref"], "a-1")
+        self.assertEqual(resultados[3]["datos"]["estado"], "Completada")
+
+    def test_verde_lecturas_ven_lo_escrito_en_el_mismo_grupo(self):
+        _, resultados = self.procesar([
+            *INICIO, crear_tarea("Leer"), linea("tareas listar", usuario=1, datos={"estado": "Pendiente"})
+        ])
+        self.assertEqual([t["titulo"] for t in resultados[3]["datos"]["tareas"]], ["Leer"])
+
+
+class TestLoteCommits(PruebaConCommits):
+
+    def test_verde_un_commit_por_grupo(self):
+        commits = []
+
+        def contar(conn):
+            commits.append(conn)
+
+        event.listen(engine, "commit", contar)
+        try:
+            salida = io.StringIO()
+            entrada = io.StringIO("".join([*INICIO, *(crear_tarea(f"Tarea {i}") for i in range(8))]))
+            self.assertEqual(lote.main(["--lote", "4"], tm=TaskManager(), entrada=entrada, salida=salida), 0)
+        finally:
+            event.remove(engine, "commit", contar)
+        self.assertEqual(len(salida.getvalue().splitlines()), 10)
+        self.assertEqual(len(commits), 3)
+
+    def test_verde_main_py_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            entorno = {k: v for k, v in os.environ.items() if k != VARIABLE_BD}
+            resultado = subprocess.run(
+                [sys.executable, "main.py", "--batch", "--bd", os.path.join(tmp, "lote.sqlite")],
+                input="".join([*INICIO, crear_tarea("Leer"), linea("tareas marcar", usuario=1, id=7)]),
+                cwd=RAIZ, env=entorno, capture_output=True, text=True
+            )
+        self.assertEqual(resultado.returncode, comandos.SALIDA_INVALIDO, resultado.stderr)
+        resultados = [json.loads(l) for l in resultado.stdout.splitlines()]
+        self.assertEqual([r["ok"] for r in resultados], [True, True, True, False])
+
+    def test_verde_main_crea_el_task_manager_sin_cache(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(lote, "TaskManager", wraps=TaskManager) as clase:
+            lote.main(
+                ["--bd", os.path.join(tmp, "lote.sqlite")], entrada=io.StringIO(""), salida=io.StringIO()
+            )
+            clase.assert_called_once()
+            self.assertIs(clase.call_args.kwargs["cache"], False)
+            clase.call_args.kwargs["engine"].dispose()
+
+    @unittest.skipIf(sys.platform == "win32", "select no admite tuberías en Windows")
+    def test_verde_tuberia_cierra_el_grupo_sin_mas_entrada(self):
+        leer, escribir = os.pipe()
+        with os.fdopen(leer, encoding="utf-8") as entrada:
+            with os.fdopen(escribir, "w", encoding="utf-8") as productor:
+                productor.write("uno\ndos\ntres")
+            grupos = list(lote._grupos(entrada, 2))
+        self.assertEqual(grupos, [[(1, "uno\n"), (2, "dos\n")], [(3, "tres")]])
+
+    @unittest.skipIf(sys.platform == "win32", "select no admite tuberías en Windows")
+    def test_verde_responde_cada_comando_sin_esperar_el_lote(self):
+        """Un productor que espera cada resultado antes de mandar el siguiente."""
+        with tempfile.TemporaryDirectory() as tmp:
+            entorno = {k: v for k, v in os.environ.items() if k != VARIABLE_BD}
+            proceso = subprocess.Popen(
+                [sys.executable, "main.py", "--batch", "--bd", os.path.join(tmp, "lote.sqlite")],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=RAIZ, env=entorno, text=True
+            )
+            try:
+                for n, comando in enumerate([*INICIO, crear_tarea("Leer")], 1):
+                    proceso.stdin.write(comando)
+                    proceso.stdin.flush()
+                    listo, _, _ = select.select([proceso.stdout], [], [], 30)
+                    self.assertTrue(listo, f"sin respuesta al comando {n}")
+                    resultado = json.loads(proceso.stdout.readline())
+                    self.assertEqual((resultado["n"], resultado["ok"]), (n, True))
+            finally:
+                proceso.stdin.close()
+                proceso.wait(timeout=30)
+                proceso.stdout.close()
+        self.assertEqual(proceso.returncode, comandos.SALIDA_OK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from src.logic.reintentos import PoliticaReintentos, es_bloqueo
+from src.logic.task_manager import TaskManager
+from src.model.declarative_base import crear_engine
+from src.model.esquema import inicializar_bd
+from src.model.modelo import EstadoTarea, Prioridad, Tarea
+
+
+def _bloqueo():
+    return OperationalError("INSERT ...", {}, sqlite3.OperationalError("database is locked"))
+
+
+def _engine_sin_espera(ruta: str):
+    """Engine cuyas conexiones no esperan el lock (busy_timeout de 1 ms)."""
+    nuevo = crear_engine(ruta)
+
+    @event.listens_for(nuevo, "connect")
+    def sin_espera(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA busy_timeout=1")
+
+    return nuevo
+
+
+def _escritor(ruta, usuario_id, materia_id, n, cola):
+    """Proceso de la prueba de estrés: crea y marca n tareas."""
+    tm = TaskManager(
+        cache=False, engine=_engine_sin_espera(ruta),
+        reintentos=PoliticaReintentos(intentos=50, espera_inicial=0.005)
+    )
+    tm.seleccionar_usuario(usuario_id)
+    errores = []
+    for i in range(n):
+        try:
+            tarea = tm.crear_tarea(
+                f"Tarea {os.getpid()} {i}", "", Prioridad.Media,
+                date.today() + timedelta(days=1), materia_id
+            )
+            tm.marcar_tarea(tarea.idTarea)
+        except Exception as e:
+            errores.append(repr(e))
+    cola.put((errores, tm.estadisticas_reintentos()))
+
+
+# ══════════════════════════════════════════════════════════════════
+# POLÍTICA DE REINTENTOS
+# ══════════════════════════════════════════════════════════════════
+
+class TestPoliticaReintentos(unittest.TestCase):
+
+    def setUp(self):
+        self.esperas = []
+        self.politica = PoliticaReintentos(
+            intentos=4, espera_inicial=0.01, espera_maxima=0.03, semilla=1, dormir=self.esperas.append
+        )
+
+    def fallar(self, veces, error=_bloqueo):
+        llamadas = []
+
+        def operacion():
+            llamadas.append(1)
+            if len(llamadas) <= veces:
+                raise error()
+            return "ok"
+
+        return operacion, llamadas
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_agota_los_intentos_y_propaga(self):
+        operacion, llamadas = self.fallar(10)
+        with self.assertRaises(OperationalError):
+            self.politica.ejecutar("crear_tarea", operacion)
+        self.assertEqual(len(llamadas), 4)
+        estadisticas = self.politica.estadisticas()
+        self.assertEqual((estadisticas["reintentos"], estadisticas["agotados"]), (3, 1))
+
+    def test_rojo_otros_errores_no_se_reintentan(self):
+        operacion, llamadas = self.fallar(1, lambda: IntegrityError("INSERT ...", {}, Exception()))
+        with self.assertRaises(IntegrityError):
+            self.politica.ejecutar("crear_tarea", operacion)
+        self.assertEqual(len(llamadas), 1)
+
+        operacion, llamadas = self.fallar(
+            1, lambda: OperationalError("SELECT ...", {}, sqlite3.OperationalError("no such table: x"))
+        )
+        with self.assertRaises(OperationalError):
+            self.politica.ejecutar("crear_tarea", operacion)
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(self.esperas, [])
+
+    def test_rojo_intentos_menor_a_uno(self):
+        with self.assertRaises(ValueError):
+            PoliticaReintentos(intentos=0)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_reintenta_hasta_que_funciona(self):
+        operacion, llamadas = self.fallar(2)
+        self.assertEqual(self.politica.ejecutar("crear_tarea", operacion), "ok")
+        self.assertEqual(len(llamadas), 3)
+        estadisticas = self.politica.estadisticas()
+        self.assertEqual(estadisticas["operaciones"]["crear_tarea"]["reintentos"], 2)
+        self.assertAlmostEqual(estadisticas["espera_ms"], sum(self.esperas) * 1000)
+
+    def test_verde_espera_exponencial_con_tope(self):
+        for intento in range(10):
+            tope = min(0.03, 0.01 * 2 ** intento)
+            self.assertTrue(0 <= self.politica.espera(intento) <= tope)
+
+    def test_verde_reconoce_bloqueos_del_driver_y_de_sqlalchemy(self):
+        self.assertTrue(es_bloqueo(_bloqueo()))
+        self.assertTrue(es_bloqueo(sqlite3.OperationalError("database is locked")))
+        self.assertFalse(es_bloqueo(sqlite3.OperationalError("no such table: x")))
+        self.assertFalse(es_bloqueo(ValueError("database is locked")))
+
+    def test_verde_reiniciar(self):
+        operacion, _ = self.fallar(1)
+        self.politica.ejecutar("crear_tarea", operacion)
+        self.politica.reiniciar()
+        self.assertEqual(self.politica.estadisticas()["reintentos"], 0)
+
+
+# ══════════════════════════════════════════════════════════════════
+# REINTENTOS EN TASK MANAGER
+# ══════════════════════════════════════════════════════════════════
+
+class TestReintentosTaskManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, "reintentos.sqlite")
+        self.engine = _engine_sin_espera(self.ruta)
+        inicializar_bd(self.engine)
+
+        # Otro "proceso" retiene el lock de escritura hasta el primer reintento
+        self.bloqueador = sqlite3.connect(self.ruta, isolation_level=None)
+        self.esperas = []
+
+        def dormir(segundos):
+            self.esperas.append(segundos)
+            if self.bloqueador.in_transaction:
+                self.bloqueador.execute("ROLLBACK")
+
+        self.tm = TaskManager(engine=self.engine, reintentos=PoliticaReintentos(semilla=1, dormir=dormir))
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.tm.reiniciar_reintentos()
+
+    def tearDown(self):
+        self.bloqueador.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def bloquear(self):
+        self.bloqueador.execute("BEGIN IMMEDIATE")
+
+    def test_verde_escritura_bloqueada_se_reintenta(self):
+        self.bloquear()
+        tarea = self.tm.crear_tarea(
+            "Estudiar", "", Prioridad.Alta, date.today() + timedelta(days=1), self.materia.idMateria
+        )
+        self.assertIsNotNone(tarea.idTarea)
+        self.assertEqual(len(self.esperas), 1)
+        estadisticas = self.tm.estadisticas_reintentos()
+        self.assertEqual(estadisticas["operaciones"]["crear_tarea"]["reintentos"], 1)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.scalar(select(func.count()).select_from(Tarea)), 1)
+
+    def test_verde_lote_desde_un_generador_se_reintenta_completo(self):
+        self.bloquear()
+        entrega = date.today() + timedelta(days=1)
+        resultados = self.tm.crear_tareas_lote(
+            {"titulo": f"Tarea {i}", "descripcion": "", "prioridad": Prioridad.Media,
+             "fecha_entrega": entrega, "materia_id": self.materia.idMateria}
+            for i in range(3)
+        )
+        self.assertEqual([r["ok"] for r in resultados], [True] * 3)
+        self.assertEqual(self.tm.estadisticas_reintentos()["reintentos"], 1)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.scalar(select(func.count()).select_from(Tarea)), 3)
+
+    def test_verde_transaccion_reintenta_el_begin(self):
+        self.bloquear()
+        with self.tm.transaccion():
+            self.tm.crear_materia("Física", "#00FF00")
+        self.assertEqual(self.tm.estadisticas_reintentos()["operaciones"]["transaccion"]["reintentos"], 1)
+        self.assertEqual(len(self.tm.listar_materias()), 2)
+
+    def test_verde_dentro_de_transaccion_no_reintenta(self):
+        with self.tm.transaccion():
+            self.tm.crear_materia("Física", "#00FF00")
+        self.assertEqual(self.tm.estadisticas_reintentos()["reintentos"], 0)
+
+    def test_verde_ninguna_escritura_perdida_entre_procesos(self):
+        """Varios procesos escribiendo a la vez con busy_timeout mínimo."""
+        procesos, por_proceso = 4, 25
+        contexto = multiprocessing.get_context("spawn")
+        cola = contexto.Queue()
+        trabajadores = [
+            contexto.Process(target=_escritor, args=(
+                self.ruta, self.tm.usuario_activo.idUsuario, self.materia.idMateria, por_proceso, cola
+            ))
+            for _ in range(procesos)
+        ]
+        for proceso in trabajadores:
+            proceso.start()
+        resultados = [cola.get(timeout=120) for _ in trabajadores]
+        for proceso in trabajadores:
+            proceso.join()
+
+        self.assertEqual([errores for errores, _ in resultados], [[]] * procesos)
+        self.assertTrue(all(e["agotados"] == 0 for _, e in resultados))
+        with self.engine.connect() as conn:
+            completadas = conn.scalar(
+                select(func.count()).select_from(Tarea).where(Tarea.estado == EstadoTarea.Completada)
+            )
+        self.assertEqual(completadas, procesos * por_proceso)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,21 @@
+import base64
+import contextvars
+import gc
+import json
 from datetime import date, timedelta
+import os
+import tempfile
+import threading
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.engine import Engine
 from src.logic.task_manager import TaskManager
-from src.model.declarative_base import Base, engine
+from src.model.declarative_base import crear_engine, engine, engine_de_lectura
+from src.model.esquema import inicializar_bd
 from src.model.modelo import Prioridad, EstadoTarea, Usuario, Materia, Tarea
+from tests.bd import PruebaConBD, PruebaConCommits, capturar_sentencias
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -35,11 +48,10 @@ def crear_tarea_helper(tm: TaskManager, materia_id: int, titulo="Estudiar capít
 # HU-001: CREAR USUARIO
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU001CrearUsuario(unittest.TestCase):
+class TestHU001CrearUsuario(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
 
     # ── CASOS ROJOS ───────────────────────────────────────────────
@@ -160,11 +172,10 @@ class TestHU001CrearUsuario(unittest.TestCase):
 # HU-002: SELECCIONAR USUARIO
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU002SeleccionarUsuario(unittest.TestCase):
+class TestHU002SeleccionarUsuario(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
 
     # ── CASOS ROJOS ───────────────────────────────────────────────
@@ -211,11 +222,10 @@ class TestHU002SeleccionarUsuario(unittest.TestCase):
 # HU-003: CREAR MATERIA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU003CrearMateria(unittest.TestCase):
+class TestHU003CrearMateria(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -290,16 +300,28 @@ class TestHU003CrearMateria(unittest.TestCase):
         materia2 = self.tm.crear_materia("Matemáticas", "#00FF00")
         self.assertIsNotNone(materia2)
 
+    def test_verde_listar_materias_solo_del_usuario_activo(self):
+        """listar_materias retorna solo las materias propias, por nombre."""
+        usuario2 = self.tm.crear_usuario("Pedro Garcia", "pedro@mail.com")
+        self.tm.crear_materia("Física", "#FF5733")
+        self.tm.crear_materia("Biología", "#00FF00")
+        propio = self.tm.usuario_activo.idUsuario
+
+        self.tm.seleccionar_usuario(usuario2.idUsuario)
+        self.tm.crear_materia("Historia", "#0000FF")
+
+        self.tm.seleccionar_usuario(propio)
+        self.assertEqual([m.nombre for m in self.tm.listar_materias()], ["Biología", "Física"])
+
 
 # ══════════════════════════════════════════════════════════════════
 # HU-004: CREAR TAREA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU004CrearTarea(unittest.TestCase):
+class TestHU004CrearTarea(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -410,17 +432,17 @@ class TestHU004CrearTarea(unittest.TestCase):
         self.assertIsNotNone(tarea)
         self.assertEqual(tarea.estado, EstadoTarea.Pendiente)
         self.assertEqual(tarea.prioridad, Prioridad.Media)
+        self.assertEqual(tarea.usuario_id, self.materia.usuario_id)
 
 
 # ══════════════════════════════════════════════════════════════════
 # HU-005: MARCAR / DESMARCAR TAREA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU005MarcarDesmarcar(unittest.TestCase):
+class TestHU005MarcarDesmarcar(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -481,11 +503,10 @@ class TestHU005MarcarDesmarcar(unittest.TestCase):
 # HU-006: EDITAR USUARIO
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU006EditarUsuario(unittest.TestCase):
+class TestHU006EditarUsuario(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(self.usuario.idUsuario)
@@ -550,11 +571,10 @@ class TestHU006EditarUsuario(unittest.TestCase):
 # HU-007: ELIMINAR USUARIO
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU007EliminarUsuario(unittest.TestCase):
+class TestHU007EliminarUsuario(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(self.usuario.idUsuario)
@@ -621,11 +641,10 @@ class TestHU007EliminarUsuario(unittest.TestCase):
 # HU-008: EDITAR MATERIA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU008EditarMateria(unittest.TestCase):
+class TestHU008EditarMateria(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -690,11 +709,10 @@ class TestHU008EditarMateria(unittest.TestCase):
 # HU-009: EDITAR TAREA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU009EditarTarea(unittest.TestCase):
+class TestHU009EditarTarea(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(self.usuario.idUsuario)
@@ -782,11 +800,10 @@ class TestHU009EditarTarea(unittest.TestCase):
 # HU-010: ELIMINAR MATERIA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU010EliminarMateria(unittest.TestCase):
+class TestHU010EliminarMateria(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -836,11 +853,10 @@ class TestHU010EliminarMateria(unittest.TestCase):
 # HU-011: ELIMINAR TAREA
 # ══════════════════════════════════════════════════════════════════
 
-class TestHU011EliminarTarea(unittest.TestCase):
+class TestHU011EliminarTarea(PruebaConBD):
 
     def setUp(self):
-        Base.metadata.drop_all(engine)
-        Base.metadata.create_all(engine)
+        super().setUp()
         self.tm = TaskManager()
         usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
         self.tm.seleccionar_usuario(usuario.idUsuario)
@@ -893,5 +909,930 @@ class TestHU011EliminarTarea(unittest.TestCase):
         self.assertIsNone(self.tm.seleccionar_tarea(id_tarea))
 
 
+# ══════════════════════════════════════════════════════════════════
+# CREACIÓN DE TAREAS EN LOTE
+# ══════════════════════════════════════════════════════════════════
+
+class TestCrearTareasLote(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+
+    def fila(self, titulo="Estudiar capítulo uno", materia_id=None, **extra):
+        datos = {
+            "titulo": titulo,
+            "descripcion": "Descripción de prueba",
+            "prioridad": Prioridad.Media,
+            "fecha_entrega": date.today(),
+            "materia_id": materia_id or self.materia.idMateria
+        }
+        datos.update(extra)
+        return datos
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        """Crear lote sin usuario activo debe lanzar ValueError."""
+        self.tm.usuario_activo = None
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.crear_tareas_lote([self.fila()])
+        self.assertIn("usuario", str(ctx.exception).lower())
+
+    def test_rojo_filas_invalidas_se_reportan_sin_insertar(self):
+        """Las filas inválidas devuelven su error y no se insertan."""
+        otro = self.tm.crear_usuario("Pedro Garcia", "pedro@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        ajena = self.tm.crear_materia("Historia", "#123456")
+        self.tm.seleccionar_usuario(self.materia.usuario_id)
+
+        resultados = self.tm.crear_tareas_lote([
+            self.fila(titulo="ab"),
+            self.fila(materia_id=9999),
+            self.fila(materia_id=ajena.idMateria),
+            self.fila(fecha_entrega=date.today() - timedelta(days=1)),
+        ])
+
+        self.assertEqual([r["fila"] for r in resultados], [0, 1, 2, 3])
+        self.assertFalse(any(r["ok"] for r in resultados))
+        self.assertIn("título", resultados[0]["error"].lower())
+        self.assertIn("no existe", resultados[1]["error"].lower())
+        self.assertIn("otro usuario", resultados[2]["error"].lower())
+        self.assertIn("pasado", resultados[3]["error"].lower())
+
+    def test_rojo_filas_de_otro_tipo(self):
+        """Una fila mal formada se informa en su resultado y no corta el lote."""
+        resultados = self.tm.crear_tareas_lote([
+            self.fila(titulo=123),
+            self.fila(descripcion=["Capítulo 3"]),
+            ["Tarea", "", Prioridad.Alta],
+            self.fila(materia_id=[self.materia.idMateria]),
+            self.fila(materia_id=True),
+            self.fila(titulo="Tarea válida"),
+        ])
+        self.assertEqual([r["ok"] for r in resultados], [False] * 5 + [True])
+        self.assertEqual([r["error"] for r in resultados[:5]], [
+            "El campo 'titulo' debe ser texto",
+            "El campo 'descripcion' debe ser texto",
+            "La fila debe ser un diccionario",
+            "El campo 'materia_id' debe ser un número entero",
+            "El campo 'materia_id' debe ser un número entero",
+        ])
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_lote_mixto_inserta_solo_validas(self):
+        """Las filas válidas se insertan y reciben su ID en orden."""
+        resultados = self.tm.crear_tareas_lote([
+            self.fila(titulo="Tarea uno"),
+            self.fila(titulo="x"),
+            self.fila(titulo="Tarea tres"),
+        ])
+        self.assertTrue(resultados[0]["ok"])
+        self.assertFalse(resultados[1]["ok"])
+        self.assertTrue(resultados[2]["ok"])
+
+        primera = self.tm.seleccionar_tarea(resultados[0]["idTarea"])
+        tercera = self.tm.seleccionar_tarea(resultados[2]["idTarea"])
+        self.assertEqual(primera.titulo, "Tarea uno")
+        self.assertEqual(tercera.titulo, "Tarea tres")
+        self.assertEqual(tercera.estado, EstadoTarea.Pendiente)
+
+    def test_verde_lote_vacio(self):
+        """Un lote vacío retorna una lista vacía."""
+        self.assertEqual(self.tm.crear_tareas_lote([]), [])
+
+
+# ══════════════════════════════════════════════════════════════════
+# LISTADO DE TAREAS CON FILTROS Y CURSOR
+# ══════════════════════════════════════════════════════════════════
+
+class TestListarTareas(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.otra_materia = self.tm.crear_materia("Historia", "#123456")
+        hoy = date.today()
+        self.tareas = [
+            self.tm.crear_tarea(f"Tarea numero {i}", "", prioridad, hoy + timedelta(days=dias), materia)
+            for i, (prioridad, dias, materia) in enumerate([
+                (Prioridad.Alta, 3, self.materia.idMateria),
+                (Prioridad.Baja, 1, self.materia.idMateria),
+                (Prioridad.Media, 1, self.otra_materia.idMateria),
+                (Prioridad.Alta, 5, self.otra_materia.idMateria),
+                (Prioridad.Media, 2, self.materia.idMateria),
+            ])
+        ]
+        self.tm.marcar_tarea(self.tareas[3].idTarea)
+
+    def ids(self, tareas):
+        return [t.idTarea for t in tareas]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        """Listar sin usuario activo debe lanzar ValueError."""
+        self.tm.usuario_activo = None
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.listar_tareas()
+        self.assertIn("usuario", str(ctx.exception).lower())
+
+    def test_rojo_orden_invalido(self):
+        """Un criterio de orden desconocido debe lanzar ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.listar_tareas(orden="color")
+        self.assertIn("orden", str(ctx.exception).lower())
+
+    def test_rojo_cursor_invalido(self):
+        """Un cursor corrupto debe lanzar ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.listar_tareas(cursor="no-es-un-cursor")
+        self.assertIn("cursor", str(ctx.exception).lower())
+
+    def test_rojo_cursor_con_valor_de_otro_tipo(self):
+        """Un cursor armado a mano con un valor de otro tipo no llega a la consulta."""
+        def cursor(crudo):
+            return base64.urlsafe_b64encode(json.dumps(crudo).encode()).decode()
+
+        for orden, crudo in [
+            ("titulo", [[1, 2], 5]),
+            ("titulo", [{"a": 1}, 5]),
+            ("titulo", [None, 5]),
+            ("fechaEntrega", [20301231, 5]),
+            ("fechaEntrega", ["2030-01-01", True]),
+            ("idTarea", {"a": 1, "b": 2}),
+        ]:
+            with self.assertRaises(ValueError, msg=(orden, crudo)) as ctx:
+                self.tm.listar_tareas(orden=orden, cursor=cursor(crudo))
+            self.assertIn("cursor", str(ctx.exception).lower())
+        # Con orden por idTarea el valor no se usa
+        self.assertEqual(
+            [t.idTarea for t in self.tm.listar_tareas(orden="idTarea", cursor=cursor([[1], 0]))[0]],
+            [t.idTarea for t in self.tm.listar_tareas(orden="idTarea")[0]]
+        )
+
+    def test_rojo_limite_que_no_es_entero(self):
+        for limite in ("5", 2.5, True, 0):
+            with self.assertRaises(ValueError, msg=limite):
+                self.tm.listar_tareas(limite=limite)
+            with self.assertRaises(ValueError, msg=limite):
+                self.tm.buscar_tareas("tarea", limite=limite)
+
+    def test_rojo_no_lista_tareas_de_otro_usuario(self):
+        """Otro usuario no debe ver las tareas ajenas."""
+        otro = self.tm.crear_usuario("Pedro Garcia", "pedro@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        tareas, cursor = self.tm.listar_tareas()
+        self.assertEqual(tareas, [])
+        self.assertIsNone(cursor)
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_orden_por_fecha_y_desempate_por_id(self):
+        """Sin filtros ordena por fecha de entrega y luego por ID."""
+        tareas, cursor = self.tm.listar_tareas()
+        t = self.tareas
+        self.assertEqual(self.ids(tareas), self.ids([t[1], t[2], t[4], t[0], t[3]]))
+        self.assertIsNone(cursor)
+
+    def test_verde_filtros_en_sql(self):
+        """Los filtros de estado, prioridad, materia y fechas se combinan."""
+        hoy = date.today()
+        pendientes, _ = self.tm.listar_tareas(estado=EstadoTarea.Pendiente)
+        self.assertNotIn(self.tareas[3].idTarea, self.ids(pendientes))
+
+        medias, _ = self.tm.listar_tareas(
+            prioridad=Prioridad.Media, materia_id=self.materia.idMateria
+        )
+        self.assertEqual(self.ids(medias), [self.tareas[4].idTarea])
+
+        rango, _ = self.tm.listar_tareas(
+            desde=hoy + timedelta(days=2), hasta=hoy + timedelta(days=3)
+        )
+        self.assertEqual(self.ids(rango), self.ids([self.tareas[4], self.tareas[0]]))
+
+    def test_verde_paginacion_por_cursor_recorre_todo(self):
+        """Recorrer páginas con el cursor devuelve cada tarea una sola vez."""
+        for orden in ("fechaEntrega", "-fechaEntrega", "titulo", "-idTarea"):
+            vistos = []
+            cursor = None
+            while True:
+                pagina, cursor = self.tm.listar_tareas(orden=orden, limite=2, cursor=cursor)
+                self.assertLessEqual(len(pagina), 2)
+                vistos.extend(self.ids(pagina))
+                if cursor is None:
+                    break
+            completo, _ = self.tm.listar_tareas(orden=orden, limite=None)
+            self.assertEqual(vistos, self.ids(completo), orden)
+            self.assertEqual(len(vistos), len(self.tareas))
+
+    def test_verde_paginacion_con_fechas_nulas(self):
+        """Las tareas sin fecha (datos antiguos) también se paginan bien."""
+        self.conexion.execute(
+            Tarea.__table__.update()
+            .where(Tarea.idTarea.in_([self.tareas[0].idTarea, self.tareas[2].idTarea]))
+            .values(fechaEntrega=None)
+        )
+        for orden in ("fechaEntrega", "-fechaEntrega"):
+            vistos = []
+            cursor = None
+            while True:
+                pagina, cursor = self.tm.listar_tareas(orden=orden, limite=2, cursor=cursor)
+                vistos.extend(self.ids(pagina))
+                if cursor is None:
+                    break
+            completo, _ = self.tm.listar_tareas(orden=orden, limite=None)
+            self.assertEqual(vistos, self.ids(completo), orden)
+            self.assertEqual(len(vistos), len(self.tareas))
+
+
+# ══════════════════════════════════════════════════════════════════
+# MUTACIONES PROTEGIDAS EN UNA SOLA SENTENCIA
+# ══════════════════════════════════════════════════════════════════
+
+class TestMutacionesUnaSentencia(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.tarea = crear_tarea_helper(self.tm, self.materia.idMateria)
+
+    def contar_sentencias(self, operacion) -> int:
+        return len(capturar_sentencias(operacion))
+
+    def test_verde_marcar_y_desmarcar_en_una_sentencia(self):
+        """Marcar y desmarcar con éxito emiten una sola sentencia."""
+        self.assertEqual(self.contar_sentencias(lambda: self.tm.marcar_tarea(self.tarea.idTarea)), 1)
+        self.assertEqual(self.contar_sentencias(lambda: self.tm.desmarcar_tarea(self.tarea.idTarea)), 1)
+
+    def test_verde_editar_y_eliminar_en_una_sentencia(self):
+        """Editar (incluso moviendo de materia) y eliminar emiten una sola sentencia."""
+        otra = self.tm.crear_materia("Historia", "#123456")
+        self.assertEqual(self.contar_sentencias(
+            lambda: self.tm.editar_tarea(self.tarea.idTarea, nuevo_titulo="Nuevo título",
+                                         nueva_materia_id=otra.idMateria)
+        ), 1)
+        movida = self.tm.seleccionar_tarea(self.tarea.idTarea)
+        self.assertEqual(movida.materia_id, otra.idMateria)
+        self.assertEqual(movida.usuario_id, otra.usuario_id)
+        self.assertEqual(self.contar_sentencias(lambda: self.tm.eliminar_tarea(self.tarea.idTarea)), 1)
+
+    def test_verde_editar_sin_cambios_retorna_la_tarea(self):
+        """Editar sin campos retorna la tarea intacta."""
+        tarea = self.tm.editar_tarea(self.tarea.idTarea)
+        self.assertEqual(tarea.titulo, self.tarea.titulo)
+
+    def test_rojo_mover_a_materia_inexistente(self):
+        """Mover a una materia inexistente conserva el mensaje original."""
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.editar_tarea(self.tarea.idTarea, nueva_materia_id=9999)
+        self.assertEqual(str(ctx.exception), "La nueva materia no existe")
+        self.assertEqual(self.tm.seleccionar_tarea(self.tarea.idTarea).materia_id, self.materia.idMateria)
+
+
+# ══════════════════════════════════════════════════════════════════
+# CACHÉ DE USUARIOS Y MATERIAS
+# ══════════════════════════════════════════════════════════════════
+
+class TestCacheTaskManager(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        self.usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(self.usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+
+    def contar_sentencias(self, operacion) -> int:
+        return len(capturar_sentencias(operacion))
+
+    def test_verde_lecturas_repetidas_no_tocan_la_bd(self):
+        """Seleccionar usuario y materia ya conocidos no emite SQL."""
+        self.assertEqual(self.contar_sentencias(
+            lambda: self.tm.seleccionar_usuario(self.usuario.idUsuario)
+        ), 0)
+        self.assertEqual(self.contar_sentencias(
+            lambda: self.tm.seleccionar_materia(self.materia.idMateria)
+        ), 0)
+        self.assertGreater(self.tm.estadisticas_cache()["aciertos"], 0)
+
+    def test_verde_crear_tarea_chequea_propiedad_en_el_insert(self):
+        """crear_tarea comprueba la materia en el mismo INSERT, sin consulta previa."""
+        sentencias = capturar_sentencias(
+            lambda: crear_tarea_helper(self.tm, self.materia.idMateria)
+        )
+        self.assertEqual(len(sentencias), 1)
+        self.assertIn("FROM materias", sentencias[0])
+
+    def test_rojo_materia_borrada_por_otro_proceso(self):
+        """Las escrituras no confían en una materia que sigue en la caché."""
+        self.tm.seleccionar_materia(self.materia.idMateria)
+        self.conexion.execute(delete(Materia).where(Materia.idMateria == self.materia.idMateria))
+
+        for escritura in (
+            lambda: crear_tarea_helper(self.tm, self.materia.idMateria),
+            lambda: self.tm.editar_materia(self.materia.idMateria, nuevo_color="#000000"),
+            lambda: self.tm.eliminar_materia(self.materia.idMateria),
+        ):
+            with self.assertRaises(ValueError) as ctx:
+                escritura()
+            self.assertEqual(str(ctx.exception), "La materia no existe")
+        self.assertIsNone(self.tm.seleccionar_materia(self.materia.idMateria))
+        self.assertEqual(self.conexion.scalar(select(func.count()).select_from(Tarea)), 0)
+
+    def test_verde_editar_materia_invalida_la_cache(self):
+        """Tras editar, la caché refleja el nuevo nombre y libera el anterior."""
+        self.tm.editar_materia(self.materia.idMateria, nuevo_nombre="Álgebra")
+        self.assertEqual(self.tm.seleccionar_materia(self.materia.idMateria).nombre, "Álgebra")
+        otra = self.tm.crear_materia("Matemáticas", "#123456")
+        self.assertNotEqual(otra.idMateria, self.materia.idMateria)
+        with self.assertRaises(ValueError):
+            self.tm.crear_materia("Álgebra", "#123456")
+
+    def test_verde_eliminar_materia_invalida_la_cache(self):
+        """Una materia eliminada deja de encontrarse."""
+        self.tm.eliminar_materia(self.materia.idMateria)
+        self.assertIsNone(self.tm.seleccionar_materia(self.materia.idMateria))
+        with self.assertRaises(ValueError) as ctx:
+            crear_tarea_helper(self.tm, self.materia.idMateria)
+        self.assertIn("no existe", str(ctx.exception).lower())
+
+    def test_verde_editar_usuario_libera_el_correo_anterior(self):
+        """Tras cambiar el correo, el anterior vuelve a estar disponible."""
+        self.tm.editar_usuario(self.usuario.idUsuario, nuevo_correo="nuevo@mail.com")
+        self.assertEqual(self.tm.buscar_usuario_por_correo("nuevo@mail.com").idUsuario,
+                         self.usuario.idUsuario)
+        otro = self.tm.crear_usuario("Pedro Garcia", "juan@mail.com")
+        self.assertNotEqual(otro.idUsuario, self.usuario.idUsuario)
+
+    def test_verde_cache_desactivable(self):
+        """Con cache=False cada lectura consulta la BD."""
+        tm = TaskManager(cache=False)
+        tm.seleccionar_usuario(self.usuario.idUsuario)
+        self.assertGreater(self.contar_sentencias(
+            lambda: tm.seleccionar_materia(self.materia.idMateria)
+        ), 0)
+        self.assertEqual(tm.estadisticas_cache()["aciertos"], 0)
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# BÚSQUEDA DE TEXTO COMPLETO
+# ══════════════════════════════════════════════════════════════════
+
+class TestBuscarTareas(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Física", "#FF5733")
+        hoy = date.today()
+        self.informe = self.tm.crear_tarea(
+            "Informe de laboratorio", "Óptica geométrica", Prioridad.Alta, hoy, self.materia.idMateria
+        )
+        self.repaso = self.tm.crear_tarea(
+            "Repasar óptica", "Releer el informe anterior", Prioridad.Baja, hoy, self.materia.idMateria
+        )
+
+    def ids(self, tareas):
+        return [t.idTarea for t in tareas]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        """Buscar sin usuario activo debe lanzar ValueError."""
+        tm = TaskManager()
+        with self.assertRaises(ValueError):
+            tm.buscar_tareas("informe")
+
+    def test_rojo_texto_vacio(self):
+        """Un texto sin palabras debe lanzar ValueError."""
+        for texto in ["", "   ", "*()"]:
+            with self.assertRaises(ValueError):
+                self.tm.buscar_tareas(texto)
+
+    def test_rojo_no_ve_tareas_de_otro_usuario(self):
+        """Las tareas de otro usuario no aparecen en la búsqueda."""
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        self.assertEqual(self.tm.buscar_tareas("informe"), [])
+
+    def test_rojo_sintaxis_fts_no_se_interpreta(self):
+        """Operadores y comillas del texto se buscan como palabras."""
+        self.assertEqual(self.tm.buscar_tareas('informe NOT "óptica'), [])
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_ordena_por_relevancia(self):
+        """Un acierto en el título pesa más que uno en la descripción."""
+        self.assertEqual(
+            self.ids(self.tm.buscar_tareas("informe")),
+            [self.informe.idTarea, self.repaso.idTarea]
+        )
+        self.assertEqual(
+            self.ids(self.tm.buscar_tareas("optica")),
+            [self.repaso.idTarea, self.informe.idTarea]
+        )
+
+    def test_verde_prefijos_mayusculas_y_tildes(self):
+        """Cada palabra coincide como prefijo, sin distinguir mayúsculas ni tildes."""
+        self.assertEqual(self.ids(self.tm.buscar_tareas("LABORAT geometr")), [self.informe.idTarea])
+
+    def test_verde_filtros_y_limite(self):
+        """estado, materia_id y limite acotan los resultados."""
+        self.tm.marcar_tarea(self.repaso.idTarea)
+        self.assertEqual(
+            self.ids(self.tm.buscar_tareas("informe", estado=EstadoTarea.Completada)),
+            [self.repaso.idTarea]
+        )
+        self.assertEqual(self.tm.buscar_tareas("informe", materia_id=9999), [])
+        self.assertEqual(len(self.tm.buscar_tareas("informe", limite=1)), 1)
+
+    def test_verde_indice_sigue_a_ediciones_y_borrados(self):
+        """Los triggers mantienen el índice al editar, crear en lote y eliminar."""
+        self.tm.editar_tarea(self.informe.idTarea, nuevo_titulo="Ensayo final")
+        self.assertEqual(self.ids(self.tm.buscar_tareas("ensayo")), [self.informe.idTarea])
+        self.assertEqual(self.ids(self.tm.buscar_tareas("laboratorio")), [])
+
+        resultado = self.tm.crear_tareas_lote([{
+            "titulo": "Problemas de cinemática", "descripcion": "", "prioridad": Prioridad.Media,
+            "fecha_entrega": date.today(), "materia_id": self.materia.idMateria
+        }])
+        self.assertEqual(
+            self.ids(self.tm.buscar_tareas("cinematica")), [resultado[0]["idTarea"]]
+        )
+
+        self.tm.eliminar_tarea(self.repaso.idTarea)
+        self.assertEqual(self.tm.buscar_tareas("repasar"), [])
+        self.tm.eliminar_materia(self.materia.idMateria)
+        self.assertEqual(self.tm.buscar_tareas("ensayo"), [])
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# RESUMEN DE TAREAS
+# ══════════════════════════════════════════════════════════════════
+
+class TestResumen(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        self.otra_materia = self.tm.crear_materia("Historia", "#123456")
+        hoy = date.today()
+        self.tareas = [
+            self.tm.crear_tarea(f"Tarea numero {i}", "", prioridad, hoy, materia)
+            for i, (prioridad, materia) in enumerate([
+                (Prioridad.Alta, self.materia.idMateria),
+                (Prioridad.Alta, self.materia.idMateria),
+                (Prioridad.Baja, self.materia.idMateria),
+                (Prioridad.Media, self.otra_materia.idMateria),
+            ])
+        ]
+        self.tm.marcar_tarea(self.tareas[0].idTarea)
+
+    def assertCoincideConTareas(self):
+        """El resumen coincide con contar las tareas directamente."""
+        resumen = self.tm.resumen()
+        tareas, _ = self.tm.listar_tareas(limite=None)
+        self.assertEqual(resumen["total"], len(tareas))
+        for estado in EstadoTarea:
+            self.assertEqual(
+                resumen["por_estado"][estado.value],
+                sum(t.estado == estado for t in tareas)
+            )
+        for id_materia, conteos in resumen["materias"].items():
+            self.assertEqual(conteos["total"], sum(t.materia_id == id_materia for t in tareas))
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        """Pedir el resumen sin usuario activo debe lanzar ValueError."""
+        with self.assertRaises(ValueError):
+            TaskManager().resumen()
+
+    def test_rojo_materia_inexistente(self):
+        """Una materia que no existe debe lanzar ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.resumen(materia_id=9999)
+        self.assertIn("no existe", str(ctx.exception))
+
+    def test_rojo_materia_de_otro_usuario(self):
+        """Una materia ajena debe lanzar ValueError."""
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        with self.assertRaises(ValueError) as ctx:
+            self.tm.resumen(materia_id=self.materia.idMateria)
+        self.assertIn("otro usuario", str(ctx.exception))
+
+    def test_rojo_no_cuenta_tareas_de_otro_usuario(self):
+        """El resumen de un usuario nuevo está vacío."""
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        resumen = self.tm.resumen()
+        self.assertEqual((resumen["total"], resumen["materias"]), (0, {}))
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_conteos_por_estado_prioridad_y_materia(self):
+        resumen = self.tm.resumen()
+        self.assertEqual(resumen["total"], 4)
+        self.assertEqual(resumen["por_estado"], {"Pendiente": 3, "Completada": 1})
+        self.assertEqual(resumen["por_prioridad"], {"Baja": 1, "Media": 1, "Alta": 2})
+        matematicas = resumen["materias"][self.materia.idMateria]
+        self.assertEqual(matematicas["nombre"], "Matemáticas")
+        self.assertEqual(matematicas["total"], 3)
+        self.assertEqual(matematicas["por_estado"]["Completada"], 1)
+
+    def test_verde_resumen_de_una_materia(self):
+        resumen = self.tm.resumen(materia_id=self.otra_materia.idMateria)
+        self.assertEqual(list(resumen["materias"]), [self.otra_materia.idMateria])
+        self.assertEqual(resumen["por_prioridad"]["Media"], 1)
+
+    def test_verde_materia_sin_tareas_aparece_en_cero(self):
+        vacia = self.tm.crear_materia("Química", "#00FF00")
+        self.assertEqual(self.tm.resumen()["materias"][vacia.idMateria]["total"], 0)
+
+    def test_verde_se_mantiene_con_cada_escritura(self):
+        """Marcar, editar, mover, crear en lote y eliminar actualizan el resumen."""
+        self.tm.desmarcar_tarea(self.tareas[0].idTarea)
+        self.tm.marcar_tarea(self.tareas[3].idTarea)
+        self.tm.editar_tarea(self.tareas[1].idTarea, nueva_prioridad=Prioridad.Baja)
+        self.tm.editar_tarea(self.tareas[2].idTarea, nueva_materia_id=self.otra_materia.idMateria)
+        self.tm.crear_tareas_lote([{
+            "titulo": "Tarea en lote", "descripcion": "", "prioridad": Prioridad.Alta,
+            "fecha_entrega": date.today(), "materia_id": self.materia.idMateria
+        }])
+        self.tm.eliminar_tarea(self.tareas[0].idTarea)
+        self.assertCoincideConTareas()
+        self.assertEqual(self.tm.resumen()["por_prioridad"], {"Baja": 2, "Media": 1, "Alta": 1})
+
+        self.tm.eliminar_materia(self.otra_materia.idMateria)
+        self.assertCoincideConTareas()
+        self.assertNotIn(self.otra_materia.idMateria, self.tm.resumen()["materias"])
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# PRÓXIMAS ENTREGAS Y VENCIDAS
+# ══════════════════════════════════════════════════════════════════
+
+class TestEntregas(PruebaConBD):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        usuario = self.tm.crear_usuario("Juan Lopez", "juan@mail.com")
+        self.tm.seleccionar_usuario(usuario.idUsuario)
+        self.materia = self.tm.crear_materia("Matemáticas", "#FF5733")
+        hoy = date.today()
+        crear = lambda titulo, prioridad, dias: self.tm.crear_tarea(
+            titulo, "", prioridad, hoy + timedelta(days=dias), self.materia.idMateria
+        )
+        self.hoy_baja = crear("Entrega hoy baja", Prioridad.Baja, 0)
+        self.hoy_alta = crear("Entrega hoy alta", Prioridad.Alta, 0)
+        self.en_tres = crear("Entrega en tres", Prioridad.Media, 3)
+        self.en_siete = crear("Entrega en siete", Prioridad.Media, 7)
+        self.en_ocho = crear("Entrega en ocho", Prioridad.Alta, 8)
+        self.completada = crear("Entrega completada", Prioridad.Alta, 1)
+        self.tm.marcar_tarea(self.completada.idTarea)
+
+    def vencer(self, tarea, dias):
+        """Mueve la fecha al pasado por SQL (crear/editar no aceptan fechas pasadas)."""
+        self.conexion.execute(
+            Tarea.__table__.update()
+            .where(Tarea.idTarea == tarea.idTarea)
+            .values(fechaEntrega=date.today() - timedelta(days=dias))
+        )
+
+    def ids(self, tareas):
+        return [t.idTarea for t in tareas]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_sin_usuario_activo(self):
+        tm = TaskManager()
+        with self.assertRaises(ValueError):
+            tm.proximas_entregas()
+        with self.assertRaises(ValueError):
+            tm.entregas_vencidas()
+
+    def test_rojo_parametros_invalidos(self):
+        for dias in (-1, 1.5, "7", True):
+            with self.assertRaises(ValueError):
+                self.tm.proximas_entregas(dias=dias)
+        with self.assertRaises(ValueError):
+            self.tm.proximas_entregas(limite=0)
+        with self.assertRaises(ValueError):
+            self.tm.entregas_vencidas(limite=0)
+
+    def test_rojo_no_incluye_tareas_de_otro_usuario(self):
+        otro = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+        self.tm.seleccionar_usuario(otro.idUsuario)
+        self.assertEqual(self.tm.proximas_entregas(), [])
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_proximas_por_fecha_y_prioridad(self):
+        """Pendientes de hoy a hoy+dias, por fecha y con Alta primero."""
+        self.assertEqual(
+            self.ids(self.tm.proximas_entregas()),
+            [self.hoy_alta.idTarea, self.hoy_baja.idTarea, self.en_tres.idTarea, self.en_siete.idTarea]
+        )
+        self.assertEqual(
+            self.ids(self.tm.proximas_entregas(dias=0)),
+            [self.hoy_alta.idTarea, self.hoy_baja.idTarea]
+        )
+        self.assertEqual(self.ids(self.tm.proximas_entregas(limite=1)), [self.hoy_alta.idTarea])
+
+    def test_verde_proximas_con_una_ventana_enorme(self):
+        """Más días que los que caben hasta date.max no desborda: llega hasta el final."""
+        self.assertIn(self.en_ocho.idTarea, self.ids(self.tm.proximas_entregas(dias=99999999)))
+
+    def test_verde_vencidas_de_la_mas_atrasada(self):
+        """Solo pendientes con fecha pasada, la más atrasada primero."""
+        self.vencer(self.en_tres, 1)
+        self.vencer(self.en_siete, 5)
+        self.vencer(self.completada, 2)
+        self.assertEqual(
+            self.ids(self.tm.entregas_vencidas()),
+            [self.en_siete.idTarea, self.en_tres.idTarea]
+        )
+        self.assertNotIn(self.en_tres.idTarea, self.ids(self.tm.proximas_entregas()))
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# TRANSACCIONES (tm.transaccion())
+# ══════════════════════════════════════════════════════════════════
+
+class TestTransaccion(PruebaConCommits):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        crear_usuario_helper(self.tm)
+        self.tm.seleccionar_usuario(1)
+        self.commits = []
+        event.listen(engine, "commit", self.contar_commit)
+
+    def tearDown(self):
+        event.remove(engine, "commit", self.contar_commit)
+
+    def contar_commit(self, conn):
+        self.commits.append(conn)
+
+    def titulos(self):
+        tareas, _ = self.tm.listar_tareas(orden="idTarea", limite=None)
+        return [t.titulo for t in tareas]
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_excepcion_deshace_todo_el_bloque(self):
+        with self.assertRaises(RuntimeError):
+            with self.tm.transaccion():
+                materia = crear_materia_helper(self.tm)
+                crear_tarea_helper(self.tm, materia.idMateria)
+                raise RuntimeError("falla a mitad del bloque")
+        self.assertEqual(self.titulos(), [])
+        self.assertEqual(self.tm.resumen()["materias"], {})
+        self.assertEqual(self.commits, [])
+
+    def test_rojo_error_capturado_deshace_solo_esa_operacion(self):
+        with self.tm.transaccion():
+            materia = crear_materia_helper(self.tm)
+            crear_tarea_helper(self.tm, materia.idMateria, titulo="Primera tarea")
+            with self.assertRaises(ValueError):
+                crear_tarea_helper(self.tm, 9999, titulo="Materia inexistente")
+            crear_tarea_helper(self.tm, materia.idMateria, titulo="Segunda tarea")
+        self.assertEqual(self.titulos(), ["Primera tarea", "Segunda tarea"])
+
+    def test_rojo_rollback_vacia_la_cache(self):
+        """Un usuario creado en un bloque deshecho no queda en la caché."""
+        with self.assertRaises(RuntimeError):
+            with self.tm.transaccion():
+                usuario = self.tm.crear_usuario("Ana Ruiz", "ana@mail.com")
+                self.assertIsNotNone(self.tm.seleccionar_usuario(usuario.idUsuario))
+                raise RuntimeError
+        self.assertIsNone(self.tm.seleccionar_usuario(usuario.idUsuario))
+        self.assertIsNone(self.tm.buscar_usuario_por_correo("ana@mail.com"))
+
+    def test_rojo_bloque_anidado_deshecho(self):
+        """Un bloque anidado que falla deshace solo lo suyo."""
+        with self.tm.transaccion():
+            materia = crear_materia_helper(self.tm)
+            with self.assertRaises(RuntimeError):
+                with self.tm.transaccion():
+                    crear_tarea_helper(self.tm, materia.idMateria, titulo="Se deshace")
+                    raise RuntimeError
+            crear_tarea_helper(self.tm, materia.idMateria, titulo="Se conserva")
+        self.assertEqual(self.titulos(), ["Se conserva"])
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_un_solo_commit_para_el_bloque(self):
+        """Crear una materia y 20 tareas dentro del bloque confirma una sola vez."""
+        with self.tm.transaccion():
+            materia = crear_materia_helper(self.tm)
+            for i in range(20):
+                crear_tarea_helper(self.tm, materia.idMateria, titulo=f"Tarea numero {i}")
+            self.tm.marcar_tarea(1)
+        self.assertEqual(len(self.commits), 1)
+        self.assertEqual(len(self.titulos()), 20)
+        self.assertEqual(self.tm.resumen()["por_estado"]["Completada"], 1)
+
+    def test_verde_fuera_del_bloque_sigue_autocommit(self):
+        materia = crear_materia_helper(self.tm)
+        crear_tarea_helper(self.tm, materia.idMateria)
+        self.assertEqual(len(self.commits), 2)
+
+    def test_verde_lecturas_ven_lo_escrito_en_el_bloque(self):
+        with self.tm.transaccion():
+            materia = crear_materia_helper(self.tm)
+            tarea = crear_tarea_helper(self.tm, materia.idMateria)
+            self.assertEqual(self.tm.seleccionar_tarea(tarea.idTarea).titulo, tarea.titulo)
+            self.assertEqual(self.tm.resumen()["total"], 1)
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# USUARIO POR CONTEXTO E HILOS
+# ══════════════════════════════════════════════════════════════════
+
+class TestComoUsuario(PruebaConCommits):
+
+    def setUp(self):
+        super().setUp()
+        self.tm = TaskManager()
+        self.juan = crear_usuario_helper(self.tm)
+        self.ana = crear_usuario_helper(self.tm, "Ana Ruiz", "ana@mail.com")
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_usuario_inexistente(self):
+        with self.assertRaises(ValueError):
+            with self.tm.como_usuario(9999):
+                pass
+
+    def test_rojo_no_cambia_el_usuario_activo_fuera_del_bloque(self):
+        self.tm.seleccionar_usuario(self.juan.idUsuario)
+        with self.tm.como_usuario(self.ana.idUsuario):
+            self.assertEqual(self.tm.usuario_activo.idUsuario, self.ana.idUsuario)
+        self.assertEqual(self.tm.usuario_activo.idUsuario, self.juan.idUsuario)
+
+    def test_rojo_usuario_activo_no_se_comparte_entre_hilos(self):
+        self.tm.seleccionar_usuario(self.juan.idUsuario)
+        en_otro_hilo = []
+        hilo = threading.Thread(target=lambda: en_otro_hilo.append(self.tm.usuario_activo))
+        hilo.start()
+        hilo.join()
+        self.assertEqual(en_otro_hilo, [None])
+
+    def test_rojo_usuario_activo_no_se_comparte_entre_instancias(self):
+        otro = TaskManager()
+        with self.tm.como_usuario(self.juan.idUsuario):
+            with otro.como_usuario(self.ana.idUsuario):
+                self.assertEqual(self.tm.usuario_activo.idUsuario, self.juan.idUsuario)
+                self.assertEqual(otro.usuario_activo.idUsuario, self.ana.idUsuario)
+            self.assertIsNone(otro.usuario_activo)
+        self.assertIsNone(self.tm.usuario_activo)
+
+    def test_rojo_las_instancias_no_agregan_variables_al_contexto(self):
+        """Crear instancias no deja ContextVar nuevas ni las retiene."""
+        with self.tm.como_usuario(self.juan.idUsuario), self.tm.transaccion():
+            pass
+        variables = len(contextvars.copy_context())
+        for _ in range(10):
+            tm = TaskManager()
+            tm.seleccionar_usuario(self.juan.idUsuario)
+            with tm.transaccion():
+                pass
+        self.assertEqual(len(contextvars.copy_context()), variables)
+        referencia = weakref.ref(tm)
+        del tm
+        gc.collect()
+        self.assertIsNone(referencia())
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_opera_como_el_usuario_del_bloque(self):
+        with self.tm.como_usuario(self.ana.idUsuario):
+            materia = crear_materia_helper(self.tm)
+        self.assertEqual(materia.usuario_id, self.ana.idUsuario)
+        self.assertIsNone(self.tm.usuario_activo)
+
+    def test_verde_hilos_concurrentes_con_una_instancia(self):
+        """Varios hilos comparten un TaskManager, cada uno con su usuario."""
+        usuarios = [self.juan, self.ana] + [
+            crear_usuario_helper(self.tm, f"Usuario {nombre}", f"{nombre.lower()}@mail.com")
+            for nombre in ("Uno", "Dos", "Tres")
+        ]
+        barrera = threading.Barrier(len(usuarios))
+
+        def trabajar(usuario):
+            with self.tm.como_usuario(usuario.idUsuario):
+                barrera.wait()
+                materia = crear_materia_helper(self.tm)
+                for i in range(5):
+                    tarea = crear_tarea_helper(self.tm, materia.idMateria, titulo=f"Tarea {i}")
+                    if i % 2:
+                        self.tm.marcar_tarea(tarea.idTarea)
+                with self.tm.transaccion():
+                    crear_tarea_helper(self.tm, materia.idMateria, titulo="Tarea en bloque")
+                tareas, _ = self.tm.listar_tareas(limite=None)
+                return {t.usuario_id for t in tareas}, len(tareas), self.tm.resumen()["total"]
+
+        with ThreadPoolExecutor(max_workers=len(usuarios)) as pool:
+            resultados = list(pool.map(trabajar, usuarios))
+
+        for usuario, (propietarios, cantidad, total) in zip(usuarios, resultados):
+            self.assertEqual(propietarios, {usuario.idUsuario})
+            self.assertEqual((cantidad, total), (6, 6))
+
+
+
+# ══════════════════════════════════════════════════════════════════
+# LECTURAS POR EL ENGINE DE SOLO LECTURA
+# ══════════════════════════════════════════════════════════════════
+
+class TestLecturasSoloLectura(unittest.TestCase):
+    """Con una BD en archivo (la de las pruebas está en memoria)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = crear_engine(os.path.join(self.tmp.name, "lecturas.sqlite"))
+        inicializar_bd(self.engine)
+        self.tm = TaskManager(cache=False, engine=self.engine)
+        self.usuario = crear_usuario_helper(self.tm)
+        self.tm.seleccionar_usuario(self.usuario.idUsuario)
+        self.materia = crear_materia_helper(self.tm)
+        self.tarea = crear_tarea_helper(self.tm, self.materia.idMateria)
+
+    def tearDown(self):
+        engine_de_lectura(self.engine).dispose()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def engines_usados(self, operacion) -> set:
+        usados = set()
+
+        def antes(conn, cursor, sentencia, *args):
+            usados.add(conn.engine)
+
+        event.listen(Engine, "before_cursor_execute", antes)
+        try:
+            operacion()
+        finally:
+            event.remove(Engine, "before_cursor_execute", antes)
+        return usados
+
+    # ── CASOS ROJOS ───────────────────────────────────────────────
+
+    def test_rojo_escrituras_no_usan_el_engine_de_lectura(self):
+        self.assertEqual(
+            self.engines_usados(lambda: self.tm.marcar_tarea(self.tarea.idTarea)), {self.engine}
+        )
+
+    # ── CASOS VERDES ──────────────────────────────────────────────
+
+    def test_verde_lecturas_usan_el_engine_de_lectura(self):
+        lectura = engine_de_lectura(self.engine)
+        lecturas = [
+            self.tm.listar_usuarios,
+            lambda: self.tm.seleccionar_usuario(self.usuario.idUsuario),
+            self.tm.listar_materias,
+            lambda: self.tm.seleccionar_materia(self.materia.idMateria),
+            lambda: self.tm.seleccionar_tarea(self.tarea.idTarea),
+            self.tm.listar_tareas,
+            lambda: self.tm.buscar_tareas("tarea"),
+            self.tm.resumen,
+            self.tm.proximas_entregas,
+            self.tm.entregas_vencidas,
+        ]
+        for operacion in lecturas:
+            self.assertEqual(self.engines_usados(operacion), {lectura})
+
+    def test_verde_dentro_de_transaccion_lee_lo_no_confirmado(self):
+        with self.tm.transaccion():
+            nueva = crear_tarea_helper(self.tm, self.materia.idMateria, titulo="Sin confirmar")
+            self.assertIsNotNone(self.tm.seleccionar_tarea(nueva.idTarea))
+            self.assertEqual(self.tm.resumen()["total"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file